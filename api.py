@@ -1,5 +1,9 @@
 import asyncio
+import atexit
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 try:
     import hypixel
@@ -19,226 +23,719 @@ except ImportError:
     sys.exit(1)
 
 
-# Global client instance (will be initialized with API key)
-_client = None
-
-
-def init_client(api_key, loop=None):
-    """Initialize the hypixel.py client with the API key."""
-    global _client
-    _client = hypixel.Client(api_key, loop=loop)
-
-
-async def _get_player_async(username):
+from config.settings import (
+    MOJANG_API_URL,
+    FETCH_CONCURRENCY,
+    CACHE_TTL,
+    CACHE_STALE_TTL,
+    CACHE_MAX_ENTRIES,
+    CACHE_MAX_BYTES,
+    STORE_PATH,
+    HISTORY_PATH,
+    HISTORY_KEYFRAME_INTERVAL,
+    RESOLVER_TTL,
+    RESOLVER_NEGATIVE_TTL,
+    WATCHLIST_INTERVAL,
+    WATCHLIST_BATCH_SIZE,
+    WATCHLIST_BUDGET_PERCENT,
+    LEADERBOARDS,
+    EXPORT_BATCH_SIZE,
+    RESULT_TTL,
+)
+from config.stat_schema import extract_game_stats
+from services import (
+    HypixelService,
+    PlayerCache,
+    SnapshotStore,
+    HistoryStore,
+    NameResolver,
+    SingleFlight,
+    RefreshScheduler,
+    Leaderboard,
+    LoopCallbackManager,
+    MetricsRegistry,
+)
+from services.leaderboard_metrics import LEADERBOARD_METRICS
+from services.cache import normalize_key
+from services.metrics import instrument
+from services.export import (
+    iter_record_batches,
+    require_pyarrow,
+    stream_export,
+    validate_columns,
+    validate_modes,
+    EXPORT_FORMATS,
+)
+from services.resolver import NOT_FOUND
+
+
+# Prometheus metrics of this process, served on /metrics (see get_metrics_registry)
+_metrics = MetricsRegistry()
+_fetch_duration = _metrics.histogram(
+    'hypixel_fetch_duration_seconds',
+    'Time to answer a batch of usernames from the caches, the store or the API',
+    ('operation',),
+)
+_fetch_in_flight = _metrics.gauge(
+    'hypixel_fetch_in_flight',
+    'Batches of usernames being answered',
+    ('operation',),
+)
+_fetch_exceptions = _metrics.counter(
+    'hypixel_fetch_exceptions_total',
+    'Batches that raised, by exception type (cancellations excluded)',
+    ('operation', 'type'),
+)
+_fetched_players = _metrics.counter(
+    'hypixel_fetch_players_total',
+    'Usernames answered, by source: local (cache or store), api, not_found or error',
+    ('source',),
+)
+_fetch_errors = _metrics.counter(
+    'hypixel_fetch_errors_total',
+    'Failed player requests, by exception type',
+    ('type',),
+)
+
+# Shared client service: one background loop and one HTTP session per API key
+_service = HypixelService(metrics=_metrics)
+atexit.register(_service.close)
+
+# Disk work (snapshot store and history) runs on this thread, in submission
+# order, so the client loop only waits on the network
+_io = ThreadPoolExecutor(max_workers=1, thread_name_prefix='hypixel-io')
+
+# Leaderboard index updates get their own thread, so indexing the whole store
+# on first use (_load_leaderboard) never holds up the disk work above
+_leaderboard_io = ThreadPoolExecutor(max_workers=1, thread_name_prefix='hypixel-leaderboard')
+atexit.register(_leaderboard_io.shutdown)
+atexit.register(_io.shutdown)
+
+# Extracted player data shared by every Dash session of this process
+_cache = PlayerCache(
+    ttl=CACHE_TTL,
+    max_entries=CACHE_MAX_ENTRIES,
+    max_bytes=CACHE_MAX_BYTES,
+    stale_ttl=CACHE_STALE_TTL,
+)
+
+# Latest snapshot of every fetched player, kept on disk across restarts
+_store = SnapshotStore(STORE_PATH)
+
+# Time series of every fetched snapshot, backing get_player_history
+_history = HistoryStore(HISTORY_PATH, keyframe_interval=HISTORY_KEYFRAME_INTERVAL)
+
+# get_player_history stat_type -> game key in player_data['stats']
+HISTORY_GAMES = {
+    'BEDWARS': 'Bedwars',
+    'SKYWARS': 'SkyWars',
+    'DUELS': 'Duels',
+}
+
+# Username -> UUID cache, including short-lived "not found" answers
+_resolver = NameResolver(ttl=RESOLVER_TTL, negative_ttl=RESOLVER_NEGATIVE_TTL)
+
+# In-flight deduplication of identical lookups from concurrent sessions
+_flights = SingleFlight()
+
+# Mojang endpoint resolving up to MOJANG_BULK_SIZE usernames per request
+MOJANG_BULK_URL = f'{MOJANG_API_URL}/profiles/minecraft'
+MOJANG_BULK_SIZE = 10
+
+# Background refresh of the tracked-player watchlist (see start_watchlist)
+_scheduler = None
+
+# UUIDs of the players currently being refreshed in the background
+_refreshing = set()
+
+# Dash background callbacks (player fetches) run on the client loop (see get_background_manager)
+_background_manager = None
+
+# Live top-K indexes over every stored player, loaded from the store on first use
+_leaderboard = Leaderboard()
+_leaderboard_lock = threading.Lock()
+_leaderboard_loaded = False
+
+
+async def _get_player_async(api_key, username):
     """Internal async function to get player data."""
-    if _client is None:
-        raise ValueError("Client not initialized. Call init_client() first.")
+    client = await _service.get_client(api_key)
 
-    async with _client:
-        try:
-            player = await _client.player(username)
-            return player, None
-        except Exception as e:
-            return None, str(e)
+    try:
+        player = await client.player(username)
+        return player, None
+    except Exception as e:
+        _fetch_errors.labels(type(e).__name__).inc()
+        return None, str(e)
 
 
 def _extract_bedwars_stats(player):
     """Extract all Bedwars stats including all game modes."""
-    bedwars = player.bedwars
-
-    return {
-        # Overall stats
-        'wins_bedwars': bedwars.wins,
-        'games_played_bedwars': bedwars.games,
-        'kills_bedwars': bedwars.kills,
-        'deaths_bedwars': bedwars.deaths,
-        'beds_broken_bedwars': bedwars.beds_broken,
-        'final_kills_bedwars': bedwars.final_kills,
-        'final_deaths_bedwars': bedwars.final_deaths,
-        'winstreak': bedwars.winstreak if bedwars.winstreak is not None else 0,
-
-        # Solo (8v8 -> 1v1v1v1v1v1v1v1)
-        'eight_one_wins_bedwars': bedwars.solo.wins,
-        'eight_one_games_played_bedwars': bedwars.solo.games,
-        'eight_one_kills_bedwars': bedwars.solo.kills,
-        'eight_one_deaths_bedwars': bedwars.solo.deaths,
-        'eight_one_beds_broken_bedwars': bedwars.solo.beds_broken,
-
-        # Doubles (8v8 -> 2v2v2v2)
-        'eight_two_wins_bedwars': bedwars.doubles.wins,
-        'eight_two_games_played_bedwars': bedwars.doubles.games,
-        'eight_two_kills_bedwars': bedwars.doubles.kills,
-        'eight_two_deaths_bedwars': bedwars.doubles.deaths,
-        'eight_two_beds_broken_bedwars': bedwars.doubles.beds_broken,
-
-        # 3v3v3v3 (4 teams of 3)
-        'four_three_wins_bedwars': bedwars.threes.wins,
-        'four_three_games_played_bedwars': bedwars.threes.games,
-        'four_three_kills_bedwars': bedwars.threes.kills,
-        'four_three_deaths_bedwars': bedwars.threes.deaths,
-        'four_three_beds_broken_bedwars': bedwars.threes.beds_broken,
-
-        # 4v4v4v4 (4 teams of 4)
-        'four_four_wins_bedwars': bedwars.fours.wins,
-        'four_four_games_played_bedwars': bedwars.fours.games,
-        'four_four_kills_bedwars': bedwars.fours.kills,
-        'four_four_deaths_bedwars': bedwars.fours.deaths,
-        'four_four_beds_broken_bedwars': bedwars.fours.beds_broken,
-
-        # 4v4 (2 teams of 4)
-        'two_four_wins_bedwars': bedwars.teams.wins,
-        'two_four_games_played_bedwars': bedwars.teams.games,
-        'two_four_kills_bedwars': bedwars.teams.kills,
-        'two_four_deaths_bedwars': bedwars.teams.deaths,
-        'two_four_beds_broken_bedwars': bedwars.teams.beds_broken,
-    }
+    return extract_game_stats(player, 'Bedwars')
 
 
 def _extract_skywars_stats(player):
     """Extract all Skywars stats including all game modes."""
-    skywars = player.skywars
-
-    return {
-        # Overall stats
-        'wins': skywars.wins,
-        'games_played_skywars': skywars.games,
-        'kills': skywars.kills,
-        'deaths': skywars.deaths,
-        'winstreak': skywars.winstreak if skywars.winstreak is not None else 0,
-
-        # Ranked
-        'ranked_wins': skywars.ranked.wins,
-        'ranked_games': skywars.ranked.wins + skywars.ranked.losses,
-        'ranked_kills': skywars.ranked.kills,
-        'ranked_deaths': skywars.ranked.deaths,
-
-        # Solo Normal
-        'solo_normal_wins': skywars.solo_normal.wins,
-        'solo_normal_games': skywars.solo_normal.wins + skywars.solo_normal.losses,
-        'solo_normal_kills': skywars.solo_normal.kills,
-        'solo_normal_deaths': skywars.solo_normal.deaths,
-
-        # Solo Insane
-        'solo_insane_wins': skywars.solo_insane.wins,
-        'solo_insane_games': skywars.solo_insane.wins + skywars.solo_insane.losses,
-        'solo_insane_kills': skywars.solo_insane.kills,
-        'solo_insane_deaths': skywars.solo_insane.deaths,
-
-        # Team Normal
-        'team_normal_wins': skywars.team_normal.wins,
-        'team_normal_games': skywars.team_normal.wins + skywars.team_normal.losses,
-        'team_normal_kills': skywars.team_normal.kills,
-        'team_normal_deaths': skywars.team_normal.deaths,
-
-        # Team Insane
-        'team_insane_wins': skywars.team_insane.wins,
-        'team_insane_games': skywars.team_insane.wins + skywars.team_insane.losses,
-        'team_insane_kills': skywars.team_insane.kills,
-        'team_insane_deaths': skywars.team_insane.deaths,
-
-        # Mega (combining mega_normal and mega_doubles)
-        'mega_wins': skywars.mega_normal.wins + skywars.mega_doubles.wins,
-        'mega_games': (skywars.mega_normal.wins + skywars.mega_normal.losses) + (skywars.mega_doubles.wins + skywars.mega_doubles.losses),
-        'mega_kills': skywars.mega_normal.kills + skywars.mega_doubles.kills,
-        'mega_deaths': skywars.mega_normal.deaths + skywars.mega_doubles.deaths,
-    }
+    return extract_game_stats(player, 'SkyWars')
 
 
 def _extract_duels_stats(player):
     """Extract all Duels stats including all duel types."""
-    duels = player.duels
+    return extract_game_stats(player, 'Duels')
 
-    # List of all duel types to extract
-    duel_types = [
-        'classic', 'bow', 'bowspleef', 'boxing', 'bridge', 'combo',
-        'mega_walls', 'nodebuff', 'op', 'potion', 'skywars', 'sumo', 'uhc'
-    ]
 
-    stats = {
-        # Overall stats
-        'wins': duels.wins,
-        'rounds_played': duels.wins + duels.losses,
-        'kills': duels.kills,
-        'deaths': duels.deaths,
+def _build_player_data(player):
+    """Convert a hypixel.py player object to the dictionary format used by the app."""
+    return {
+        'uuid': player.uuid,
+        'displayname': player.name,
+        'stats': {
+            'Bedwars': _extract_bedwars_stats(player),
+            'SkyWars': _extract_skywars_stats(player),
+            'Duels': _extract_duels_stats(player),
+        },
+        # Store the raw player object for future use
+        '_raw_player': player,
     }
 
-    # Extract stats for each duel type
-    for duel_type in duel_types:
-        prefix = f'{duel_type}_duel'
-        stats[f'{prefix}_wins'] = duels._data.get(f'{prefix}_wins', 0)
-        stats[f'{prefix}_losses'] = duels._data.get(f'{prefix}_losses', 0)
-        stats[f'{prefix}_rounds_played'] = (
-            duels._data.get(f'{prefix}_wins', 0) +
-            duels._data.get(f'{prefix}_losses', 0)
+
+async def _lookup_uuids_async(api_key, names):
+    """
+    Resolve usernames with Mojang's bulk profile endpoint.
+
+    Returns {normalized_name: uuid}, with None for names that do not exist.
+    Chunks the bulk endpoint rejects fall back to one lookup per name; names
+    whose lookup failed are left out so they are not cached as missing.
+    """
+    client = await _service.get_client(api_key)
+
+    async def lookup_chunk(chunk):
+        found = {}
+        try:
+            async with client._session.post(MOJANG_BULK_URL, json=chunk) as response:
+                if response.status == 200:
+                    found = {normalize_key(name): None for name in chunk}
+                    for profile in await response.json():
+                        found[normalize_key(profile['name'])] = profile['id']
+                    return found
+        except Exception:
+            pass
+
+        for name in chunk:
+            try:
+                found[normalize_key(name)] = await client.get_uuid(name)
+            except hypixel.PlayerNotFound:
+                found[normalize_key(name)] = None
+            except Exception:
+                pass
+        return found
+
+    chunks = [names[i:i + MOJANG_BULK_SIZE] for i in range(0, len(names), MOJANG_BULK_SIZE)]
+    found = {}
+    for result in await asyncio.gather(*(lookup_chunk(chunk) for chunk in chunks)):
+        found.update(result)
+    return found
+
+
+async def _fetch_hypixel_stats_async(api_key, player_id, username, *aliases):
+    """Fetch one player (by UUID or name) from the API, convert it and cache it."""
+    player, error = await _get_player_async(api_key, player_id)
+
+    if error:
+        return None, f"Erreur API: {error}"
+
+    if not player:
+        return None, f"Joueur non trouvé: {username}"
+
+    player_data = _build_player_data(player)
+    _cache.put(player_data, username, *aliases)
+    return player_data, None
+
+
+async def _run_io(func, *args):
+    """
+    Run blocking disk work on the I/O thread from the client loop. The work
+    is shielded: a cancelled caller stops waiting but the work still runs.
+    """
+    loop = asyncio.get_running_loop()
+    return await asyncio.shield(loop.run_in_executor(_io, func, *args))
+
+
+def _persist(snapshots):
+    """
+    Save freshly fetched players: latest snapshot store and history time
+    series, then queue their leaderboard update. Blocking: called on the
+    I/O thread (see _run_io).
+    """
+    if not snapshots:
+        return
+    fetched_at = time.time()
+    _store.put_many(snapshots, fetched_at=fetched_at)
+    _history.append_many([player_data for player_data, aliases in snapshots], fetched_at=fetched_at)
+    _leaderboard_io.submit(_leaderboard.update_many, [player_data for player_data, aliases in snapshots])
+
+
+async def _refresh_async(api_key, uuid, player_id):
+    """Background refresh of a stale cache entry."""
+    try:
+        # Shares the request of any fetch of the same player already in flight
+        player_data, error = await _flights.do(
+            ('player', api_key, uuid),
+            lambda: _fetch_hypixel_stats_async(api_key, uuid, player_id),
         )
-        stats[f'{prefix}_kills'] = duels._data.get(f'{prefix}_kills', 0)
-        stats[f'{prefix}_deaths'] = duels._data.get(f'{prefix}_deaths', 0)
-        stats[f'best_{duel_type}_winstreak'] = duels._data.get(f'best_{duel_type}_winstreak', 0)
+        if player_data:
+            await _run_io(_persist, [(player_data, (player_id,))])
+    finally:
+        _refreshing.discard(uuid)
+
+
+def _schedule_refresh(api_key, player_data, player_id):
+    """Stale-while-revalidate: refresh a player on the loop for the next caller."""
+    uuid = normalize_key(player_data['uuid'])
+    if uuid in _refreshing:
+        return
+    _refreshing.add(uuid)
+    asyncio.ensure_future(_refresh_async(api_key, uuid, player_id))
+
+
+def _from_cache(api_key, player_id, count=True):
+    """Return a player from the in-memory cache, or None on a miss."""
+    cached = _cache.get(player_id, count)
+    if cached is None:
+        return None
+
+    player_data, is_fresh = cached
+    if not is_fresh:
+        _schedule_refresh(api_key, player_data, player_id)
+    return player_data
+
+
+async def _from_store(api_key, player_ids):
+    """Load players from the snapshot store into the cache; returns {player_id: player_data}."""
+    stored = await _run_io(_store.get_many, player_ids)
+    max_age = _cache.ttl + _cache.stale_ttl
+    now = time.time()
+    found = {}
+
+    for player_id, (player_data, fetched_at) in stored.items():
+        age = max(0, now - fetched_at)
+        if age >= max_age:
+            continue
+        _cache.put(player_data, player_id, age=age)
+        if age >= _cache.ttl:
+            _schedule_refresh(api_key, player_data, player_id)
+        found[player_id] = player_data
 
-    return stats
+    return found
+
+
+async def _from_local(api_key, player_ids, count=True):
+    """
+    Answer what we can from memory, then from the snapshot store. count=False
+    for a second lookup of the same players (see PlayerCache.get).
+    """
+    found = {}
+    for player_id in player_ids:
+        player_data = _from_cache(api_key, player_id, count)
+        if player_data is not None:
+            found[player_id] = player_data
+
+    missing = [p for p in player_ids if p not in found]
+    if missing:
+        found.update(await _from_store(api_key, missing))
+    return found
+
+
+@instrument('fetch', _fetch_duration, _fetch_in_flight, _fetch_exceptions)
+async def _get_hypixel_stats_many_async(api_key, usernames, max_concurrency, on_result=None):
+    """
+    Resolve players from memory, then the snapshot store, then the API.
+
+    Unknown names are resolved to UUIDs in bulk first, so case variants and
+    renamed players map to the same cached entry and each UUID is fetched
+    only once. Network fetches run concurrently with at most max_concurrency
+    in flight and are written back to the store in one transaction.
+    on_result(username, player_data, error), if given, is called on the
+    client loop as each requested name settles.
+    """
+    unique = list(dict.fromkeys(usernames))
+    results = {}
+
+    def settle(username, player_data, error, source):
+        results[username] = (player_data, error)
+        _fetched_players.labels(source).inc()
+        if on_result is not None:
+            on_result(username, player_data, error)
+
+    for username, player_data in (await _from_local(api_key, unique)).items():
+        settle(username, player_data, None, 'local')
+
+    missing = [u for u in unique if u not in results]
+    if missing:
+        resolved = await _resolver.resolve_many(
+            missing,
+            lambda names: _flights.do(
+                ('uuids', api_key, tuple(sorted(normalize_key(n) for n in names))),
+                lambda: _lookup_uuids_async(api_key, names),
+            ),
+        )
+
+        # Names the resolver could not reach are fetched by name so the
+        # caller still gets the API error
+        player_ids = {}
+        for username in missing:
+            uuid = resolved[username]
+            if uuid is NOT_FOUND:
+                settle(username, None, f"Joueur non trouvé: {username}", 'not_found')
+            else:
+                player_ids[username] = uuid or username
+
+        # Cache hits and misses were counted by name above
+        local = await _from_local(api_key, list(set(player_ids.values())), count=False)
+        to_fetch = {}
+        for username, player_id in player_ids.items():
+            if player_id in local:
+                settle(username, local[player_id], None, 'local')
+            else:
+                to_fetch.setdefault(player_id, []).append(username)
+
+        if to_fetch:
+            semaphore = asyncio.Semaphore(max(1, max_concurrency))
+            snapshots = []
+
+            async def fetch(player_id, names):
+                async with semaphore:
+                    # Sessions asking for the same player at once share one request
+                    player_data, error = await _flights.do(
+                        ('player', api_key, normalize_key(player_id)),
+                        lambda: _fetch_hypixel_stats_async(api_key, player_id, *names),
+                    )
+                if player_data:
+                    snapshots.append((player_data, names))
+                for username in names:
+                    settle(username, player_data, error, 'api' if player_data else 'error')
+
+            try:
+                await asyncio.gather(
+                    *(fetch(player_id, names) for player_id, names in to_fetch.items())
+                )
+            finally:
+                # Players fetched before a cancellation are kept too
+                await _run_io(_persist, snapshots)
+
+    # Keep results in input order
+    return [results[username] for username in usernames]
+
+
+@instrument('refresh', _fetch_duration, _fetch_in_flight, _fetch_exceptions)
+async def _refresh_many_async(api_key, player_ids):
+    """Fetch several players from the API regardless of the caches and persist them."""
+    async def fetch(player_id):
+        return await _flights.do(
+            ('player', api_key, normalize_key(player_id)),
+            lambda: _fetch_hypixel_stats_async(api_key, player_id, player_id),
+        )
+
+    fetched = await asyncio.gather(*(fetch(player_id) for player_id in player_ids))
+    await _run_io(_persist, [
+        (player_data, (player_id,))
+        for player_id, (player_data, error) in zip(player_ids, fetched)
+        if player_data
+    ])
+    return fetched
+
+
+async def _watch_async(scheduler, api_key, usernames):
+    """Resolve watchlist names to UUIDs and queue them by staleness."""
+    resolved = await _resolver.resolve_many(
+        usernames,
+        lambda names: _lookup_uuids_async(api_key, names),
+    )
+    player_ids = [
+        uuid or username
+        for username, uuid in resolved.items()
+        if uuid is not NOT_FOUND
+    ]
+    stored = await _run_io(_store.get_many, player_ids)
+    last_fetched = {
+        player_id: fetched_at
+        for player_id, (player_data, fetched_at) in stored.items()
+    }
+    scheduler.add(player_ids, last_fetched)
+
+
+async def _get_hypixel_stats_async(api_key, username):
+    """Return a player from the caches or the API, as (player_data_dict, error_message)."""
+    results = await _get_hypixel_stats_many_async(api_key, [username], 1)
+    return results[0]
 
 
 def get_hypixel_stats(api_key, username):
     """
     Fetch Hypixel stats for the given username using the provided API key.
 
-    This is a synchronous wrapper around the async hypixel.py library.
+    This is a synchronous wrapper around the async hypixel.py library: the
+    request runs on the shared client loop, so it can be called from any
+    Flask/Dash worker thread. Recently fetched players are answered from the
+    in-memory cache or the on-disk snapshot store (such entries do not carry
+    '_raw_player').
     Returns (player_data_dict, error_message).
     """
-    # Create a new event loop for this thread (needed for Flask/Dash threads)
-    try:
-        loop = asyncio.get_event_loop()
-        if loop.is_closed():
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-    except RuntimeError:
-        # No event loop in this thread, create a new one
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-
-    # Initialize client with API key and the event loop
-    init_client(api_key, loop=loop)
-
-    # Run async function
-    try:
-        player, error = loop.run_until_complete(_get_player_async(username))
-    finally:
-        # Clean up the loop
-        loop.close()
+    return _service.run(_get_hypixel_stats_async(api_key, username))
 
-    if error:
-        return None, f"Erreur API: {error}"
 
-    if not player:
-        return None, f"Joueur non trouvé: {username}"
+def get_hypixel_stats_many(api_key, usernames, max_concurrency=FETCH_CONCURRENCY):
+    """
+    Fetch Hypixel stats for several usernames concurrently.
 
-    # Convert player object to a dictionary format compatible with existing code
-    player_data = {
-        'uuid': player.uuid,
-        'displayname': player.name,
-        'stats': {
-            'Bedwars': _extract_bedwars_stats(player),
-            'SkyWars': _extract_skywars_stats(player),
-            'Duels': _extract_duels_stats(player),
-        },
-        # Store the raw player object for future use
-        '_raw_player': player,
+    Returns a list of (player_data_dict, error_message) tuples in the same
+    order as usernames, so a batch takes about as long as its slowest player.
+    """
+    usernames = list(usernames)
+    if not usernames:
+        return []
+
+    return _service.run(_get_hypixel_stats_many_async(api_key, usernames, max_concurrency))
+
+
+async def get_hypixel_stats_many_async(api_key, usernames, on_result=None, max_concurrency=FETCH_CONCURRENCY):
+    """
+    Coroutine version of get_hypixel_stats_many, for code already running on
+    the shared client loop (background fetch callbacks).
+
+    on_result(username, player_data, error) is called as each username
+    settles, so callers can report progress; cancelling the coroutine
+    cancels the requests still pending.
+    """
+    usernames = list(usernames)
+    if not usernames:
+        return []
+
+    return await _get_hypixel_stats_many_async(api_key, usernames, max_concurrency, on_result)
+
+
+def get_background_manager():
+    """Dash background callback manager running jobs on the shared client loop."""
+    global _background_manager
+    if _background_manager is None:
+        _background_manager = LoopCallbackManager(_service, expire=RESULT_TTL)
+    return _background_manager
+
+
+def start_watchlist(api_key, usernames, interval=WATCHLIST_INTERVAL):
+    """
+    Keep a list of players fresh in the background.
+
+    Players are refreshed on the shared client loop, stalest first, using at
+    most WATCHLIST_BUDGET_PERCENT of the key's rate budget. Results go to the
+    same cache, snapshot store and history as interactive lookups. Calling
+    it again adds players to the running watchlist.
+    """
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = RefreshScheduler(
+            lambda player_ids: _refresh_many_async(api_key, player_ids),
+            interval=interval,
+            batch_size=WATCHLIST_BATCH_SIZE,
+            limiter=_service.rate_limiter(api_key),
+            budget_share=WATCHLIST_BUDGET_PERCENT / 100,
+        )
+        _scheduler.start(_service.loop)
+
+    _service.run(_watch_async(_scheduler, api_key, list(usernames)))
+    return _scheduler
+
+
+def get_scheduler_stats():
+    """Return queue depth, lag and throughput of the watchlist refresh, or None."""
+    if _scheduler is None:
+        return None
+    return _scheduler.stats()
+
+
+def get_cache_stats():
+    """Return hit, miss and eviction counters of the in-memory player cache."""
+    return _cache.stats()
+
+
+def get_resolver_stats():
+    """Return hit and miss counters of the username -> UUID resolver."""
+    return _resolver.stats()
+
+
+def get_rate_limit_stats():
+    """Return the remaining budget and current wait time of each API key, by opaque label."""
+    return _service.rate_limit_stats()
+
+
+def get_coalescing_stats():
+    """Return how many lookups were coalesced into an identical in-flight request."""
+    return _flights.stats()
+
+
+def _load_leaderboard(metric_id):
+    """Index the stored players on the default metrics, then on metric_id, once each."""
+    global _leaderboard_loaded
+    with _leaderboard_lock:
+        if not _leaderboard_loaded:
+            for default_metric in LEADERBOARDS:
+                if default_metric in LEADERBOARD_METRICS:
+                    _leaderboard.add_metric(default_metric)
+            _leaderboard.update_many(_store.iter_players())
+            _leaderboard_loaded = True
+        if metric_id not in _leaderboard.metrics():
+            _leaderboard.add_metric(metric_id, _store.iter_players())
+
+
+def get_leaderboard(metric_id, count=50):
+    """
+    Top players on a metric among every player fetched so far.
+
+    metric_id is '<mode_id>.<stat>' (see services.leaderboard_metrics), e.g.
+    'bedwars_overall.fkdr' or 'duel_sumo.winstreak'. Returns a list of
+    {'rank', 'uuid', 'displayname', 'value'}, best first, or None for an
+    unknown metric.
+    """
+    if metric_id not in LEADERBOARD_METRICS:
+        return None
+    _load_leaderboard(metric_id)
+    return _leaderboard.top(metric_id, count)
+
+
+def get_player_rank(metric_id, player):
+    """
+    Rank (1 = best) and leaderboard size of a stored player (username or
+    UUID) on a metric: {'rank', 'of'}, or None if the player is not ranked.
+    """
+    if metric_id not in LEADERBOARD_METRICS:
+        return None
+    _load_leaderboard(metric_id)
+
+    stored = _store.get(player)
+    if stored is None:
+        return None
+    rank = _leaderboard.rank(metric_id, stored[0]['uuid'])
+    if rank is None:
+        return None
+    return {'rank': rank, 'of': _leaderboard.size(metric_id)}
+
+
+def get_leaderboard_stats():
+    """Return the number of active metrics, ranked players and index updates."""
+    return _leaderboard.stats()
+
+
+def get_metrics_registry():
+    """
+    Metrics registry of this process: API request and fetch metrics, plus
+    the cache, resolver, coalescing, rate limiter, watchlist and leaderboard
+    stats. Add metrics to it and render it with render().
+    """
+    return _metrics
+
+
+_metrics.add_stats(
+    'hypixel_cache', 'In-memory player cache', get_cache_stats,
+    counters=('hits', 'stale_hits', 'misses', 'evictions', 'expirations'),
+)
+_metrics.add_stats(
+    'hypixel_resolver', 'Username to UUID resolver', get_resolver_stats,
+    counters=('hits', 'negative_hits', 'misses'),
+)
+_metrics.add_stats(
+    'hypixel_coalescing', 'Identical in-flight lookups', get_coalescing_stats,
+    counters=('calls', 'coalesced'),
+)
+_metrics.add_stats(
+    'hypixel_rate_limit', 'Rate limiter of each API key (key1, key2... in order of first use)', get_rate_limit_stats,
+    counters=('acquired', 'throttled'), label='key',
+)
+_metrics.add_stats(
+    'hypixel_watchlist', 'Background refresh of the watchlist', get_scheduler_stats,
+    counters=('cycles', 'refreshed', 'errors'),
+)
+_metrics.add_stats(
+    'hypixel_leaderboard', 'Live leaderboards', get_leaderboard_stats,
+    counters=('updates', 'moves'),
+)
+_metrics.add_stats(
+    'hypixel_background_jobs', 'Background fetch callbacks',
+    lambda: _background_manager.stats() if _background_manager else None,
+)
+
+
+def _lookup_names(uuids):
+    """{uuid: displayname} of stored players."""
+    return {
+        uuid: player_data.get('displayname')
+        for uuid, (player_data, fetched_at) in _store.get_many(uuids).items()
     }
 
-    return player_data, None
+
+def _latest_snapshots(start, end):
+    for player_data, fetched_at in _store.iter_rows(start, end):
+        for game, stats in player_data['stats'].items():
+            yield player_data['uuid'], game, fetched_at, stats
+
+
+def export_stats(fmt='parquet', source='latest', columns=None, start=None, end=None, modes=None):
+    """
+    Stream stored stats as a Parquet file or an Arrow IPC stream.
+
+    One row per snapshot and mode, with raw counters and derived stats (see
+    services.export.COLUMNS). source is 'latest' (the newest snapshot of
+    each player) or 'history' (every recorded snapshot). start/end filter on
+    fetch time (Unix seconds), columns projects the output and modes keeps
+    only the given mode ids. Returns an iterator of bytes; arguments are
+    validated before anything is read, raising ValueError.
+    """
+    require_pyarrow()
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f'Unknown export format: {fmt}')
+    if source == 'latest':
+        snapshots = _latest_snapshots(start, end)
+    elif source == 'history':
+        snapshots = _history.iter_snapshots(start, end)
+    else:
+        raise ValueError(f'Unknown export source: {source}')
+    columns = validate_columns(columns)
+    modes = validate_modes(modes)
+
+    batches = iter_record_batches(
+        snapshots, _lookup_names, columns=columns, modes=modes, batch_size=EXPORT_BATCH_SIZE,
+    )
+    return stream_export(batches, columns, fmt)
 
 
 def get_player_history(api_key, uuid, stat_type, time_period):
     """
     Retrieve historical statistics for a player over a given time period.
 
-    Note: hypixel.py doesn't provide historical data endpoint.
-    This function is kept for compatibility but returns None.
-    Historical data would need to be tracked separately.
+    The Hypixel API has no historical endpoint, so history is read from the
+    local time series recorded on every successful fetch. stat_type is a
+    game ('BEDWARS', 'SKYWARS' or 'DUELS') and time_period a number of days.
+    Returns {'uuid', 'stat_type', 'time_period', 'data'} where data is a list
+    of {'timestamp', 'stats'} ordered by time, or None if nothing was recorded.
+    api_key is kept for compatibility and is not used.
     """
-    # The Hypixel API doesn't actually have a historical endpoint like this
-    # This was likely placeholder code in the original implementation
-    return None
+    game = HISTORY_GAMES.get(stat_type.upper())
+    if not game or not uuid:
+        return None
+
+    start = time.time() - time_period * 86400
+    snapshots = _history.query(uuid, game, start=start)
+    if not snapshots:
+        return None
+
+    return {
+        'uuid': uuid,
+        'stat_type': stat_type,
+        'time_period': time_period,
+        'data': [
+            {'timestamp': fetched_at, 'stats': stats}
+            for fetched_at, stats in snapshots
+        ],
+    }
 
 
 if __name__ == "__main__":
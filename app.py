@@ -1,4 +1,5 @@
 import os
+from datetime import datetime, timezone
 
 import dash
 from dash import dcc, html
@@ -6,11 +7,31 @@ from dash.dependencies import Input, Output, State
 from dash.exceptions import PreventUpdate
 import dash_bootstrap_components as dbc
 from dotenv import load_dotenv
-
-from api import get_hypixel_stats, get_player_history
-from stats import create_figures
+from flask import Response, request, stream_with_context
+
+from api import (
+    export_stats,
+    get_background_manager,
+    get_hypixel_stats_many,
+    get_hypixel_stats_many_async,
+    get_metrics_registry,
+    start_watchlist,
+)
+from stats import extract_winstreaks, get_figure, get_figure_cache_stats
+from services import ResultStore
+from services.export import EXPORT_FORMATS
+from services.metrics import instrument
+from services.render_cache import content_key
 from config.game_modes import GAME_MODES
 from config.theme import CHART_LAYOUT
+from config.settings import (
+    BACKGROUND_CALLBACKS,
+    CLIENTSIDE_CALLBACKS,
+    METRICS_ENDPOINT,
+    RESULT_MAX_ENTRIES,
+    RESULT_TTL,
+    WATCHLIST,
+)
 from components import (
     create_sidebar,
     create_header,
@@ -19,12 +40,57 @@ from components import (
     create_settings_panel,
 )
 from components.header import create_player_info, create_mode_indicator
-from components.settings_panel import create_error_message, create_success_message
+from components.stats_cards import get_card_cache_stats
+from components.sidebar import get_clientside_callbacks, get_menu_class
+from components.settings_panel import create_error_message, create_fetch_progress, create_success_message
 
 # Load environment variables
 load_dotenv()
 DEFAULT_API_KEY = os.getenv('HYPIXEL_API_KEY', '')
 
+# Fetch results kept server-side; figures-store only holds their id
+_results = ResultStore(ttl=RESULT_TTL, max_entries=RESULT_MAX_ENTRIES)
+
+# Callback and render cache metrics, served with the API ones on /metrics
+metrics = get_metrics_registry()
+_callback_duration = metrics.histogram(
+    'hypixel_callback_duration_seconds',
+    'Dash callback run time (background fetches: until their result is ready)',
+    ('callback',),
+)
+_callback_in_flight = metrics.gauge(
+    'hypixel_callback_in_flight',
+    'Dash callbacks running',
+    ('callback',),
+)
+_callback_errors = metrics.counter(
+    'hypixel_callback_errors_total',
+    'Dash callbacks that raised, by exception type',
+    ('callback', 'type'),
+)
+metrics.add_stats(
+    'hypixel_results', 'Server-side fetch results', _results.stats,
+    counters=('hits', 'misses', 'evictions', 'expirations'),
+)
+metrics.add_stats(
+    'hypixel_figure_cache', 'Memoized figures', get_figure_cache_stats,
+    counters=('hits', 'misses', 'evictions'),
+)
+metrics.add_stats(
+    'hypixel_card_cache', 'Memoized stat cards', get_card_cache_stats,
+    counters=('hits', 'misses', 'evictions'),
+)
+
+
+def _instrumented(name):
+    """Record a callback's latency, concurrency and errors (PreventUpdate is not one)."""
+    return instrument(name, _callback_duration, _callback_in_flight, _callback_errors, ignore=(PreventUpdate,))
+
+
+# Keep tracked players fresh in the background
+if WATCHLIST and DEFAULT_API_KEY:
+    start_watchlist(DEFAULT_API_KEY, WATCHLIST)
+
 # Create Dash application
 app = dash.Dash(
     __name__,
@@ -39,6 +105,8 @@ app.layout = html.Div(
         dcc.Store(id='figures-store'),
         dcc.Store(id='players-store'),
         dcc.Store(id='mode-store', data='bedwars_overall'),
+        # 'running' while a background fetch streams players in
+        dcc.Store(id='fetch-state', data='idle'),
 
         # Sidebar navigation
         create_sidebar(),
@@ -83,12 +151,7 @@ def toggle_settings(n_clicks, is_open):
     return is_open
 
 
-# Callback: Update mode from sidebar
-@app.callback(
-    Output('mode-store', 'data'),
-    [Input(f'{mode_id}-item', 'n_clicks') for mode_id in GAME_MODES.keys()],
-    prevent_initial_call=True,
-)
+# Callback: Update mode from sidebar (registered below)
 def update_mode(*args):
     ctx = dash.callback_context
     if not ctx.triggered:
@@ -103,37 +166,54 @@ def update_mode(*args):
     raise PreventUpdate
 
 
-# Callback: Fetch player data
-@app.callback(
-    [
-        Output('figures-store', 'data'),
-        Output('players-store', 'data'),
-        Output('result-message', 'children'),
-        Output('loading-output', 'children'),
-    ],
-    Input('fetch-button', 'n_clicks'),
-    [
-        State('usernames-input', 'value'),
-        State('api-key-input', 'value'),
-    ],
-    prevent_initial_call=True,
-)
-def fetch_player_data(n_clicks, usernames, api_key):
+def _fetch_error(message):
+    return dash.no_update, dash.no_update, create_error_message(message), None
+
+
+def _parse_fetch_inputs(n_clicks, usernames, api_key):
+    """Return (usernames_list, None), or (None, the callback outputs of an input error)."""
     if not n_clicks:
         raise PreventUpdate
 
     if not usernames or not usernames.strip():
-        return dash.no_update, dash.no_update, create_error_message('Veuillez entrer au moins un nom de joueur.'), None
+        return None, _fetch_error('Veuillez entrer au moins un nom de joueur.')
 
     if not api_key or not api_key.strip():
-        return dash.no_update, dash.no_update, create_error_message('Veuillez entrer votre clé API Hypixel.'), None
+        return None, _fetch_error('Veuillez entrer votre clé API Hypixel.')
+
+    return [u.strip() for u in usernames.split(',') if u.strip()], None
+
+
+def _store_entry(username, player):
+    """Prepare a player's data for storage (simplified)."""
+    return {
+        'displayname': player.get('displayname', username),
+        'uuid': player.get('uuid'),
+        'stats': player.get('stats', {}),
+    }
+
+
+def _partial_store(usernames_list, settled):
+    """
+    players-store content while a fetch runs: the players received so far,
+    in input order, and a pending entry for each username not settled yet.
+    """
+    players_store = {}
+    for username in usernames_list:
+        if username not in settled:
+            players_store[username] = {'displayname': username, 'pending': True}
+        elif settled[username] is not None:
+            entry = settled[username]
+            players_store[entry['displayname']] = entry
+    return players_store
 
-    usernames_list = [u.strip() for u in usernames.split(',') if u.strip()]
+
+def _fetch_outputs(usernames_list, results):
+    """Store the fetched players and build the fetch callback outputs."""
     players_data = {}
     errors = []
 
-    for username in usernames_list:
-        player, error = get_hypixel_stats(api_key, username)
+    for username, (player, error) in zip(usernames_list, results):
         if error:
             errors.append(f'{username}: {error}')
         elif not player:
@@ -142,33 +222,21 @@ def fetch_player_data(n_clicks, usernames, api_key):
             players_data[player.get('displayname', username)] = player
 
     if errors and not players_data:
-        return dash.no_update, dash.no_update, create_error_message(' | '.join(errors)), None
+        return _fetch_error(' | '.join(errors))
 
     if not players_data:
-        return dash.no_update, dash.no_update, create_error_message('Aucune donnée valide trouvée.'), None
-
-    # Fetch historical data
-    historical_data = {}
-    for username, player in players_data.items():
-        uuid = player.get('uuid')
-        if uuid:
-            history = get_player_history(api_key, uuid, 'BEDWARS', 30)
-            if history:
-                historical_data[username] = history.get('data')
-
-    # Create figures - now returns a dictionary
-    figures_data = create_figures(players_data, historical_data)
+        return _fetch_error('Aucune donnée valide trouvée.')
 
-    # Prepare players data for storage (simplified)
     players_store = {
-        username: {
-            'displayname': player.get('displayname', username),
-            'uuid': player.get('uuid'),
-            'stats': player.get('stats', {}),
-        }
+        username: _store_entry(username, player)
         for username, player in players_data.items()
     }
 
+    # Figures are built on demand per mode from the server-side result;
+    # the browser only keeps its id
+    result_id = _results.put({'players': players_store, 'data_key': content_key(players_store)})
+    figures_data = {'key': result_id}
+
     message = create_success_message(f'Données chargées pour {len(players_data)} joueur(s).')
     if errors:
         message = html.Div([
@@ -179,6 +247,94 @@ def fetch_player_data(n_clicks, usernames, api_key):
     return figures_data, players_store, message, None
 
 
+# Callback: Fetch player data, blocking the worker until done (registered below)
+def fetch_player_data(n_clicks, usernames, api_key):
+    usernames_list, error = _parse_fetch_inputs(n_clicks, usernames, api_key)
+    if error:
+        return error
+
+    results = get_hypixel_stats_many(api_key, usernames_list)
+    return _fetch_outputs(usernames_list, results)
+
+
+# Callback: Fetch player data in the background (registered below). Returns
+# a coroutine that the background manager runs on the client loop; each
+# player is streamed into players-store as it arrives, so its cards and
+# chart traces show up without waiting for the slowest player.
+def fetch_player_data_background(set_progress, n_clicks, usernames, api_key):
+    usernames_list, error = _parse_fetch_inputs(n_clicks, usernames, api_key)
+    if error:
+        return error
+
+    unique = list(dict.fromkeys(usernames_list))
+    settled = {}
+
+    def report(username=None, error=None):
+        # The browser only gets the latest value on each poll, so a burst of
+        # players costs one update
+        value, text = create_fetch_progress(len(settled), len(unique), username, error)
+        set_progress((value, text, _partial_store(unique, settled), None))
+
+    report()
+
+    async def fetch():
+        def on_result(username, player, error):
+            settled[username] = _store_entry(username, player) if player else None
+            report(username, error)
+
+        results = await get_hypixel_stats_many_async(api_key, usernames_list, on_result=on_result)
+        return _fetch_outputs(usernames_list, results)
+
+    return fetch()
+
+
+FETCH_OUTPUTS = [
+    Output('figures-store', 'data'),
+    Output('players-store', 'data'),
+    Output('result-message', 'children'),
+    Output('loading-output', 'children'),
+]
+FETCH_STATES = [
+    State('usernames-input', 'value'),
+    State('api-key-input', 'value'),
+]
+
+if BACKGROUND_CALLBACKS:
+    app.callback(
+        FETCH_OUTPUTS,
+        Input('fetch-button', 'n_clicks'),
+        FETCH_STATES,
+        background=True,
+        manager=get_background_manager(),
+        # Partial results go to players-store; figures-store is cleared until
+        # the final result is stored server-side
+        progress=[
+            Output('fetch-progress', 'value'),
+            Output('fetch-progress-text', 'children'),
+            Output('players-store', 'data'),
+            Output('figures-store', 'data'),
+        ],
+        running=[
+            (Output('fetch-state', 'data'), 'running', 'idle'),
+            (Output('fetch-button', 'disabled'), True, False),
+            (Output('fetch-progress', 'value'), 0, 0),
+            (Output('cancel-button', 'style'), {'display': 'inline-flex'}, {'display': 'none'}),
+            (Output('fetch-progress-container', 'style'), {'display': 'block'}, {'display': 'none'}),
+        ],
+        cancel=[Input('cancel-button', 'n_clicks')],
+        # Polling period of the browser while the fetch runs (ms)
+        interval=250,
+        prevent_initial_call=True,
+    )(_instrumented('fetch_player_data_background')(fetch_player_data_background))
+else:
+    app.callback(
+        FETCH_OUTPUTS,
+        Input('fetch-button', 'n_clicks'),
+        FETCH_STATES,
+        prevent_initial_call=True,
+    )(_instrumented('fetch_player_data')(fetch_player_data))
+
+
 # Callback: Update display based on mode and data
 @app.callback(
     [
@@ -192,10 +348,12 @@ def fetch_player_data(n_clicks, usernames, api_key):
     [
         Input('mode-store', 'data'),
         Input('players-store', 'data'),
+        Input('fetch-state', 'data'),
     ],
     State('figures-store', 'data'),
 )
-def update_display(mode, players_data, figures_data):
+@_instrumented('update_display')
+def update_display(mode, players_data, fetch_state, figures_data):
     # Default empty figure
     empty_figure = {
         'data': [],
@@ -213,8 +371,20 @@ def update_display(mode, players_data, figures_data):
         },
     }
 
+    # Players still being fetched get placeholder cards (dropped if the
+    # fetch was cancelled)
+    players_data = players_data or {}
+    pending = [
+        username for username, player in players_data.items()
+        if player.get('pending')
+    ] if fetch_state == 'running' else []
+    players_data = {
+        username: player for username, player in players_data.items()
+        if not player.get('pending')
+    }
+
     # If no data, show empty state
-    if not players_data or not figures_data:
+    if not players_data and not pending:
         return (
             create_empty_state(),
             empty_figure,
@@ -225,14 +395,21 @@ def update_display(mode, players_data, figures_data):
         )
 
     # Create stats cards
-    stats_cards = create_stats_cards(players_data, mode)
-
-    # Get figure for current mode
-    figure = figures_data.get(mode, empty_figure)
+    stats_cards = create_stats_cards(players_data, mode, pending)
+
+    # Get figure for current mode (built on first display, then memoized)
+    result = _results.get(figures_data.get('key')) if figures_data else None
+    if result:
+        figure = get_figure(result['players'], mode, result['data_key'])
+    elif players_data:
+        # Partial fetch, expired result or server restart: build from the
+        # browser's copy
+        figure = get_figure(players_data, mode)
+    else:
+        figure = None
     if figure:
-        # Apply dark theme to figure
-        if isinstance(figure, dict) and 'layout' in figure:
-            figure['layout'].update(CHART_LAYOUT)
+        # Apply dark theme to figure (on a copy: the memoized one is shared)
+        figure = {**figure, 'layout': {**figure.get('layout', {}), **CHART_LAYOUT}}
 
     # Create mode indicator
     mode_indicator = create_mode_indicator(mode)
@@ -242,7 +419,7 @@ def update_display(mode, players_data, figures_data):
 
     # Handle winstreak display
     winstreak_content = None
-    winstreaks = figures_data.get('winstreaks', {})
+    winstreaks = extract_winstreaks(players_data)
 
     if mode == 'duel_sumo' and winstreaks:
         winstreak_items = []
@@ -287,32 +464,102 @@ def update_display(mode, players_data, figures_data):
     return (
         stats_cards,
         figure if figure else empty_figure,
-        {'display': 'block'},
+        {'display': 'block'} if players_data else {'display': 'none'},
         mode_indicator,
         winstreak_content,
         player_info,
     )
 
 
-# Callback: Highlight active menu item
-@app.callback(
-    [Output(f'{mode_id}-item', 'className') for mode_id in GAME_MODES.keys()],
-    Input('mode-store', 'data'),
-)
+# Callback: Highlight active menu item (registered below)
 def update_active_menu(current_mode):
-    classes = []
-    for mode_id in GAME_MODES.keys():
-        config = GAME_MODES[mode_id]
-        if config.get('is_combined'):
-            # Combined is a top-level menu item
-            base_class = 'menu-item combined-menu-item'
-            classes.append(f'{base_class} active' if mode_id == current_mode else base_class)
-        else:
-            # All other modes are submenu items
-            base_class = 'submenu-item'
-            classes.append(f'{base_class} active' if mode_id == current_mode else base_class)
-    return classes
+    return [get_menu_class(mode_id, current_mode) for mode_id in GAME_MODES.keys()]
+
+
+# Sidebar callbacks run in the browser (no server round trip per click);
+# the Python versions above are the fallback
+MODE_INPUTS = [Input(f'{mode_id}-item', 'n_clicks') for mode_id in GAME_MODES.keys()]
+MENU_OUTPUTS = [Output(f'{mode_id}-item', 'className') for mode_id in GAME_MODES.keys()]
+
+if CLIENTSIDE_CALLBACKS:
+    update_mode_js, update_active_menu_js = get_clientside_callbacks()
+    app.clientside_callback(
+        update_mode_js,
+        Output('mode-store', 'data'),
+        MODE_INPUTS,
+        prevent_initial_call=True,
+    )
+    app.clientside_callback(
+        update_active_menu_js,
+        MENU_OUTPUTS,
+        Input('mode-store', 'data'),
+    )
+else:
+    app.callback(
+        Output('mode-store', 'data'),
+        MODE_INPUTS,
+        prevent_initial_call=True,
+    )(update_mode)
+    app.callback(
+        MENU_OUTPUTS,
+        Input('mode-store', 'data'),
+    )(update_active_menu)
+
+
+def _parse_time(value):
+    """Unix seconds or an ISO 8601 date/time (UTC if no offset), or None."""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    moment = datetime.fromisoformat(value)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+def _split(value):
+    return [item.strip() for item in value.split(',') if item.strip()] if value else None
+
+
+# Download endpoint: stream stored stats as Parquet or Arrow
+#   /export/parquet?source=history&columns=uuid,mode,fetched_at,kdr&start=2024-01-01&modes=bedwars_overall
+@app.server.route('/export/<fmt>')
+def export_download(fmt):
+    try:
+        stream = export_stats(
+            fmt,
+            source=request.args.get('source', 'latest'),
+            columns=_split(request.args.get('columns')),
+            start=_parse_time(request.args.get('start')),
+            end=_parse_time(request.args.get('end')),
+            modes=_split(request.args.get('modes')),
+        )
+    except ValueError as e:
+        return Response(str(e), status=400, mimetype='text/plain')
+    except RuntimeError as e:
+        return Response(str(e), status=501, mimetype='text/plain')
+
+    mimetype, extension = EXPORT_FORMATS[fmt]
+    filename = f'hypixel-stats-{datetime.now(timezone.utc):%Y%m%d-%H%M%S}.{extension}'
+    return Response(
+        stream_with_context(stream),
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'},
+    )
+
+
+# Prometheus scrape endpoint: callback, API, fetch, cache and rate limiter
+# metrics. Unauthenticated, like the rest of the app (see METRICS_ENDPOINT)
+def metrics_endpoint():
+    return Response(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+if METRICS_ENDPOINT:
+    app.server.add_url_rule('/metrics', view_func=metrics_endpoint)
 
 
 if __name__ == '__main__':
-    app.run_server(debug=True)
+    app.run(debug=True)
@@ -0,0 +1,99 @@
+# Derived stats: per-player compute_stats vs the vectorized engine
+#
+#     python -m benchmarks.derived_stats --players 1000 10000
+
+import argparse
+import time
+
+from api import _build_player_data
+from benchmarks.fixtures import make_players
+from services.derived_stats import derived_stats, safe_divide as vector_divide, stat_matrix, compute_derived
+from config.game_modes import GAME_MODES, compute_stats, get_mode_stats, safe_divide
+from config.stat_schema import MODE_FIELDS
+from services.player_stats import PlayerStats
+
+
+MODE_IDS = [mode_id for mode_id, config in GAME_MODES.items() if not config.get('is_combined')]
+
+
+def _baseline(players):
+    """What the dashboard does today: one compute_stats call per player and mode."""
+    return [
+        [compute_stats(get_mode_stats(player, mode_id), mode_id) for mode_id in MODE_IDS]
+        for player in players
+    ]
+
+
+def _mode_counters(player, mode_id):
+    """Every counter of a mode, including those get_mode_stats hides (beds_lost)."""
+    game, stat_keys = MODE_FIELDS[mode_id]
+    game_stats = player['stats'].get(game, {})
+    return {stat: game_stats.get(storage_key, 0) for stat, storage_key in stat_keys}
+
+
+def _check(players, baseline, derived):
+    for i, player in enumerate(players):
+        for j, mode_id in enumerate(MODE_IDS):
+            computed = baseline[i][j]
+            assert derived['kdr'][i, j] == computed['kdr']['value']
+            assert derived['win_rate'][i, j] == computed['win_rate']['value']
+
+            raw = _mode_counters(player, mode_id)
+            losses = raw.get('games', 0) - raw.get('wins', 0)
+            assert derived['wlr'][i, j] == safe_divide(raw.get('wins', 0), losses)
+            assert derived['fkdr'][i, j] == safe_divide(raw.get('final_kills', 0), raw.get('final_deaths', 0))
+            assert derived['bblr'][i, j] == safe_divide(raw.get('beds_broken', 0), raw.get('beds_lost', 0))
+
+
+def _check_rounding(rng_seed=0, count=200000):
+    """Rounding must match round(a / b, 2) on arbitrary integer pairs, including b <= 0."""
+    import numpy as np
+
+    rng = np.random.default_rng(rng_seed)
+    numerators = rng.integers(0, 100000, count)
+    divisors = rng.integers(-2, 2000, count)
+    expected = [safe_divide(a, b) for a, b in zip(numerators.tolist(), divisors.tolist())]
+    assert vector_divide(numerators, divisors).tolist() == expected
+
+
+def _time(func, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def run(counts, seed):
+    _check_rounding(seed)
+    print(f'{len(MODE_IDS)} modes, 5 derived stats per mode')
+
+    for count in counts:
+        players = [_build_player_data(player) for player in make_players(count, seed=seed)]
+        for player in players:
+            del player['_raw_player']
+
+        baseline_s, baseline = _time(lambda: _baseline(players))
+        pack_s, counts_matrix = _time(lambda: stat_matrix(players, MODE_IDS))
+        compute_s, _ = _time(lambda: compute_derived(counts_matrix))
+        total_s, derived = _time(lambda: derived_stats(players, MODE_IDS))
+        _check(players, baseline, derived)
+
+        records = [PlayerStats.from_dict(player) for player in players]
+        records_s, from_records = _time(lambda: derived_stats(records, MODE_IDS))
+        assert all((from_records[name] == derived[name]).all() for name in derived)
+
+        print(f'{count} players')
+        print(f'  compute_stats loop: {baseline_s * 1000:>9.1f} ms (kdr + win rate only)')
+        print(f'  vectorized:         {total_s * 1000:>9.1f} ms '
+              f'({baseline_s / total_s:.1f}x; pack {pack_s * 1000:.1f} ms, compute {compute_s * 1000:.1f} ms)')
+        print(f'  from PlayerStats:   {records_s * 1000:>9.1f} ms ({baseline_s / records_s:.1f}x)')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Derived stats benchmark')
+    parser.add_argument('--players', type=int, nargs='+', default=[1000, 10000])
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+    run(args.players, args.seed)
@@ -0,0 +1,69 @@
+# Figure construction: plotly graph_objects vs the plain-dict fast path
+#
+#     python -m benchmarks.figures --players 2 10 50
+
+import argparse
+import time
+
+from plotly.io.json import to_json_plotly
+
+from api import _build_player_data
+from benchmarks.fixtures import make_players
+from config.game_modes import GAME_MODES
+from stats import build_figure, build_figure_dict
+
+
+def _players(count, seed):
+    players = {}
+    for player in make_players(count, seed=seed):
+        player_data = _build_player_data(player)
+        players[player_data['displayname']] = {
+            'displayname': player_data['displayname'],
+            'uuid': player_data['uuid'],
+            'stats': player_data['stats'],
+        }
+    return players
+
+
+def _time(func, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def run(counts, seed):
+    # Warm up plotly's lazy imports and the precompiled template
+    build_figure_dict({}, 'combined')
+    build_figure({}, 'combined').to_dict()
+
+    print(f'{len(GAME_MODES)} figures per run (every mode)')
+    for count in counts:
+        players = _players(count, seed)
+
+        slow_s, slow = _time(lambda: {m: build_figure(players, m).to_dict() for m in GAME_MODES})
+        fast_s, fast = _time(lambda: {m: build_figure_dict(players, m) for m in GAME_MODES})
+        # What Dash serializes: a go.Figure before, a plain dict now
+        figures = {m: build_figure(players, m) for m in GAME_MODES}
+        slow_json_s, slow_json = _time(lambda: {m: to_json_plotly(f) for m, f in figures.items()})
+        fast_json_s, fast_json = _time(lambda: {m: to_json_plotly(f) for m, f in fast.items()})
+
+        # Same figures, down to the serialized bytes
+        assert fast == slow
+        assert fast_json == slow_json
+
+        print(f'{count} players')
+        print(f'  build:     go.Figure {slow_s * 1000:>8.1f} ms   dicts {fast_s * 1000:>7.2f} ms '
+              f'({slow_s / fast_s:.0f}x)')
+        print(f'  serialize: go.Figure {slow_json_s * 1000:>8.1f} ms   dicts {fast_json_s * 1000:>7.2f} ms '
+              f'({slow_json_s / fast_json_s:.0f}x)')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Figure construction benchmark')
+    parser.add_argument('--players', type=int, nargs='+', default=[2, 10, 50])
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+    run(args.players, args.seed)
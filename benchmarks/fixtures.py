@@ -0,0 +1,137 @@
+# Seeded synthetic players for offline benchmarks (no network, no API key)
+
+import random
+from types import SimpleNamespace
+
+
+BEDWARS_MODES = ['solo', 'doubles', 'threes', 'fours', 'teams']
+# Key prefixes of the Bedwars modes in raw Hypixel JSON
+BEDWARS_PREFIXES = ['eight_one', 'eight_two', 'four_three', 'four_four', 'two_four']
+SKYWARS_MODES = [
+    'ranked', 'solo_normal', 'solo_insane', 'team_normal', 'team_insane',
+    'mega_normal', 'mega_doubles',
+]
+DUEL_TYPES = [
+    'classic', 'bow', 'bowspleef', 'boxing', 'bridge', 'combo',
+    'mega_walls', 'nodebuff', 'op', 'potion', 'skywars', 'sumo', 'uhc',
+]
+
+
+def _counters(rng, scale):
+    wins = rng.randint(0, scale)
+    losses = rng.randint(0, scale)
+    return {
+        'wins': wins,
+        'losses': losses,
+        'games': wins + losses,
+        'kills': rng.randint(0, scale * 3),
+        'deaths': rng.randint(0, scale * 3),
+        'beds_broken': rng.randint(0, scale),
+        'beds_lost': rng.randint(0, scale),
+        'final_kills': rng.randint(0, scale * 2),
+        'final_deaths': rng.randint(0, scale),
+    }
+
+
+def fake_player(rng, index=0):
+    """
+    Build an object exposing the attributes read by api._extract_*_stats,
+    shaped like a hypixel.py Player.
+    """
+    bedwars_modes = {mode: SimpleNamespace(**_counters(rng, 2000)) for mode in BEDWARS_MODES}
+    bedwars = SimpleNamespace(
+        winstreak=rng.randint(0, 50),
+        **_counters(rng, 10000),
+        **bedwars_modes,
+    )
+
+    skywars_modes = {mode: SimpleNamespace(**_counters(rng, 2000)) for mode in SKYWARS_MODES}
+    skywars = SimpleNamespace(
+        winstreak=rng.randint(0, 50),
+        **_counters(rng, 10000),
+        **skywars_modes,
+    )
+
+    duels_data = {}
+    for duel_type in DUEL_TYPES:
+        counters = _counters(rng, 3000)
+        prefix = f'{duel_type}_duel'
+        for key in ('wins', 'losses', 'kills', 'deaths'):
+            duels_data[f'{prefix}_{key}'] = counters[key]
+        duels_data[f'best_{duel_type}_winstreak'] = rng.randint(0, 100)
+    duels = SimpleNamespace(_data=duels_data, **_counters(rng, 20000))
+
+    return SimpleNamespace(
+        uuid=f'{rng.getrandbits(128):032x}',
+        name=f'Player{index}',
+        bedwars=bedwars,
+        skywars=skywars,
+        duels=duels,
+    )
+
+
+def fake_player_json(rng, uuid, name):
+    """
+    Build the 'player' object of a Hypixel /player response, with the raw
+    keys hypixel.py parses (Bedwars, SkyWars and Duels stats).
+    """
+    bedwars = {'winstreak': rng.randint(0, 50), 'Experience': rng.randint(0, 500000)}
+    for prefix in [None] + BEDWARS_PREFIXES:
+        counters = _counters(rng, 2000 if prefix else 10000)
+        head = f'{prefix}_' if prefix else ''
+        for key, value in counters.items():
+            raw = 'games_played' if key == 'games' else key
+            bedwars[f'{head}{raw}_bedwars'] = value
+
+    skywars = {'win_streak': rng.randint(0, 50), 'skywars_experience': rng.randint(0, 100000)}
+    for mode in [None] + SKYWARS_MODES:
+        counters = _counters(rng, 2000 if mode else 10000)
+        tail = f'_{mode}' if mode else ''
+        for key in ('wins', 'losses', 'kills', 'deaths'):
+            skywars[f'{key}{tail}'] = counters[key]
+        if not mode:
+            skywars['games'] = counters['games']
+
+    duels = {}
+    for key, value in _counters(rng, 20000).items():
+        if key in ('wins', 'losses', 'kills', 'deaths'):
+            duels[key] = value
+    duels['rounds_played'] = duels['wins'] + duels['losses']
+    for duel_type in DUEL_TYPES:
+        counters = _counters(rng, 3000)
+        for key in ('wins', 'losses', 'kills', 'deaths'):
+            duels[f'{duel_type}_duel_{key}'] = counters[key]
+        duels[f'best_{duel_type}_winstreak'] = rng.randint(0, 100)
+
+    return {
+        '_id': f'{rng.getrandbits(96):024x}',
+        'uuid': uuid,
+        'displayname': name,
+        'playername': name.lower(),
+        'firstLogin': 1400000000000 + rng.randint(0, 10 ** 11),
+        'lastLogin': 1700000000000 + rng.randint(0, 10 ** 10),
+        'networkExp': rng.randint(0, 10 ** 7),
+        'karma': rng.randint(0, 10 ** 6),
+        'achievementPoints': rng.randint(0, 10000),
+        'achievements': {'bedwars_level': rng.randint(1, 500)},
+        'stats': {'Bedwars': bedwars, 'SkyWars': skywars, 'Duels': duels},
+    }
+
+
+def make_players(count, seed=42):
+    """Return count fake hypixel.py players, identical for a given seed."""
+    rng = random.Random(seed)
+    return [fake_player(rng, i) for i in range(count)]
+
+
+def play_games(stats, rng, games=3):
+    """
+    Return a copy of an extracted stats dict where a few counters grew, as
+    between two polls of an active player.
+    """
+    stats = dict(stats)
+    keys = list(stats)
+    for key in rng.sample(keys, min(len(keys), games * 3)):
+        if isinstance(stats[key], int):
+            stats[key] += rng.randint(1, 5)
+    return stats
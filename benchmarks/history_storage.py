@@ -0,0 +1,106 @@
+# History storage benchmark: delta-encoded keyframes vs full snapshots
+#
+#     python -m benchmarks.history_storage --players 200 --polls 200
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from api import _build_player_data
+from services.history import HistoryStore
+from benchmarks.fixtures import make_players, play_games
+
+
+def _file_size(store):
+    store._conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+    page_count = store._conn.execute('PRAGMA page_count').fetchone()[0]
+    page_size = store._conn.execute('PRAGMA page_size').fetchone()[0]
+    return page_count * page_size
+
+
+def _fill(store, players, polls, seed):
+    """Write polls snapshots of every player, a few counters changing each time."""
+    rng = random.Random(seed)
+    series = [_build_player_data(player) for player in players]
+    start = time.perf_counter()
+    for poll in range(polls):
+        for player_data in series:
+            player_data['stats'] = {
+                game: play_games(stats, rng) if rng.random() < 0.3 else stats
+                for game, stats in player_data['stats'].items()
+            }
+        store.append_many(series, fetched_at=float(poll))
+    return time.perf_counter() - start, series
+
+
+def _latency(func, samples):
+    timings = []
+    for args in samples:
+        start = time.perf_counter()
+        func(*args)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return statistics.mean(timings), timings[int(len(timings) * 0.95)]
+
+
+def run(players, polls, keyframe_interval, samples, seed):
+    fake_players = make_players(players, seed=seed)
+    rng = random.Random(seed)
+    results = []
+
+    for interval, label in ((1, 'full snapshots'), (keyframe_interval, f'keyframe every {keyframe_interval}')):
+        path = os.path.join(tempfile.mkdtemp(), 'history.sqlite3')
+        store = HistoryStore(path, keyframe_interval=interval)
+        write_seconds, series = _fill(store, fake_players, polls, seed)
+
+        snapshots = store.count()
+        payload = store._conn.execute('SELECT SUM(LENGTH(stats)) FROM snapshots').fetchone()[0]
+        size = _file_size(store)
+
+        games = list(series[0]['stats'])
+        points = [
+            (rng.choice(series)['uuid'], rng.choice(games), rng.uniform(0, polls - 1))
+            for _ in range(samples)
+        ]
+        ranges = [(uuid, game, t, t + 30) for uuid, game, t in points]
+        point_mean, point_p95 = _latency(store.state_at, points)
+        range_mean, range_p95 = _latency(store.query, ranges)
+
+        results.append({
+            'label': label,
+            'snapshots': snapshots,
+            'bytes_per_snapshot': size / snapshots,
+            'payload_per_snapshot': payload / snapshots,
+            'write_seconds': write_seconds,
+            'point_ms': (point_mean, point_p95),
+            'range_ms': (range_mean, range_p95),
+        })
+        store.close()
+
+    print(f'{players} players x {polls} polls x {len(games)} games')
+    print(f'{"":<22}{"file B/snap":>12}{"JSON B/snap":>12}{"write s":>9}'
+          f'{"point ms (mean/p95)":>22}{"30-poll range ms":>20}')
+    for r in results:
+        print(
+            f'{r["label"]:<22}{r["bytes_per_snapshot"]:>12.0f}{r["payload_per_snapshot"]:>12.0f}'
+            f'{r["write_seconds"]:>9.2f}'
+            f'{r["point_ms"][0]:>12.3f} / {r["point_ms"][1]:<7.3f}'
+            f'{r["range_ms"][0]:>10.3f} / {r["range_ms"][1]:<7.3f}'
+        )
+    full, delta = results
+    print(f'size reduction: {full["bytes_per_snapshot"] / delta["bytes_per_snapshot"]:.1f}x')
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='History storage benchmark')
+    parser.add_argument('--players', type=int, default=200)
+    parser.add_argument('--polls', type=int, default=200)
+    parser.add_argument('--keyframe-interval', type=int, default=32)
+    parser.add_argument('--samples', type=int, default=500)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+    run(args.players, args.polls, args.keyframe_interval, args.samples, args.seed)
@@ -0,0 +1,94 @@
+# Leaderboards: incremental ordered indexes vs sorting on every view
+#
+#     python -m benchmarks.leaderboard --players 100000
+
+import argparse
+import random
+import time
+
+from api import _build_player_data
+from benchmarks.fixtures import make_players, play_games
+from services.cache import normalize_key
+from services.leaderboard import Leaderboard
+from services.leaderboard_metrics import metric_value
+
+
+METRICS = ['bedwars_overall.fkdr', 'duel_sumo.winstreak', 'skywars_overall.kdr']
+
+
+def _sorted_top(players, metric_id, count):
+    """The baseline: rank everyone from scratch."""
+    ranked = sorted(
+        (-value, normalize_key(player['uuid']))
+        for player in players.values()
+        if (value := metric_value(player, metric_id)) is not None
+    )
+    return ranked[:count], ranked
+
+
+def run(count, updates, seed):
+    rng = random.Random(seed)
+
+    start = time.perf_counter()
+    players = {}
+    for player in make_players(count, seed=seed):
+        player_data = _build_player_data(player)
+        del player_data['_raw_player']
+        players[player_data['uuid']] = player_data
+    print(f'{count} players generated in {time.perf_counter() - start:.1f} s')
+
+    leaderboard = Leaderboard()
+    start = time.perf_counter()
+    for metric_id in METRICS:
+        leaderboard.add_metric(metric_id, players.values())
+    build_s = time.perf_counter() - start
+    print(f'index build: {build_s:.2f} s for {len(METRICS)} metrics '
+          f'({build_s / (count * len(METRICS)) * 1e6:.1f} us per player and metric)')
+
+    # Snapshot changes of random players, as polls come in
+    uuids = list(players)
+    changed = []
+    for _ in range(updates):
+        uuid = rng.choice(uuids)
+        player_data = dict(players[uuid])
+        player_data['stats'] = {
+            game: play_games(stats, rng) for game, stats in player_data['stats'].items()
+        }
+        changed.append(player_data)
+
+    start = time.perf_counter()
+    for player_data in changed:
+        leaderboard.update(player_data)
+        players[player_data['uuid']] = player_data
+    update_us = (time.perf_counter() - start) / updates * 1e6
+    print(f'update: {update_us:.1f} us per changed snapshot ({len(METRICS)} metrics)')
+
+    for metric_id in METRICS:
+        start = time.perf_counter()
+        top = leaderboard.top(metric_id, 50)
+        top_us = (time.perf_counter() - start) * 1e6
+
+        probes = rng.sample(uuids, 1000)
+        start = time.perf_counter()
+        ranks = [leaderboard.rank(metric_id, uuid) for uuid in probes]
+        rank_us = (time.perf_counter() - start) / len(probes) * 1e6
+
+        start = time.perf_counter()
+        expected_top, ranked = _sorted_top(players, metric_id, 50)
+        sort_ms = (time.perf_counter() - start) * 1000
+
+        assert [(-entry['value'], entry['uuid']) for entry in top] == expected_top
+        positions = {uuid: i + 1 for i, (negated, uuid) in enumerate(ranked)}
+        assert ranks == [positions.get(normalize_key(uuid)) for uuid in probes]
+
+        print(f'{metric_id}: top-50 {top_us:.0f} us, rank {rank_us:.1f} us, '
+              f'sort-per-view baseline {sort_ms:.0f} ms ({sort_ms * 1000 / top_us:.0f}x)')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Leaderboard benchmark')
+    parser.add_argument('--players', type=int, default=100000)
+    parser.add_argument('--updates', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+    run(args.players, args.updates, args.seed)
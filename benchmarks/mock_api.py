@@ -0,0 +1,247 @@
+# Local stand-in for the Hypixel /player and Mojang profile endpoints
+#
+#     python -m benchmarks.mock_api --port 8099 --latency lognormal:80,0.5 --error-rate 0.01
+#     HYPIXEL_API_URL=http://127.0.0.1:8099 HYPIXEL_MOJANG_API_URL=http://127.0.0.1:8099 python main.py
+#
+# Every username resolves to a stable UUID and every UUID to a seeded fake
+# player (benchmarks.fixtures), so load tests of the fetch path need neither
+# network nor API key. Responses can be delayed by a latency distribution,
+# fail at a given rate, or be throttled: each key gets --rate-limit requests
+# per --window seconds, advertised through the RateLimit-* headers Hypixel
+# sends, and a 429 with Retry-After once spent.
+#
+# GET /mock/stats returns request counters; POST /mock/reset clears them.
+
+import argparse
+import asyncio
+import hashlib
+import random
+import time
+from collections import Counter
+
+from aiohttp import web
+
+from benchmarks.fixtures import fake_player_json
+
+
+def parse_latency(spec):
+    """
+    Turn 'fixed:MS', 'uniform:MIN,MAX', 'normal:MEAN,STDDEV',
+    'lognormal:MEDIAN,SIGMA' or 'exponential:MEAN' (milliseconds) into a
+    function drawing a delay in seconds from an rng.
+    """
+    kind, _, args = spec.partition(':')
+    try:
+        values = [float(value) for value in args.split(',')] if args else []
+    except ValueError:
+        raise ValueError(f'Invalid latency parameters: {spec}') from None
+
+    distributions = {
+        'fixed': (1, lambda rng, ms: ms),
+        'uniform': (2, lambda rng, low, high: rng.uniform(low, high)),
+        'normal': (2, lambda rng, mean, stddev: rng.gauss(mean, stddev)),
+        'lognormal': (2, lambda rng, median, sigma: median * rng.lognormvariate(0.0, sigma)),
+        'exponential': (1, lambda rng, mean: rng.expovariate(1.0 / mean) if mean else 0.0),
+    }
+    if kind not in distributions:
+        raise ValueError(f'Unknown latency distribution: {kind}')
+    arity, draw = distributions[kind]
+    if len(values) != arity:
+        raise ValueError(f'{kind} latency takes {arity} parameter(s): {spec}')
+    return lambda rng: max(0.0, draw(rng, *values)) / 1000
+
+
+def _fraction(seed, *parts):
+    """Stable pseudo-random number in [0, 1) for the given parts."""
+    digest = hashlib.blake2b('\0'.join([str(seed), *parts]).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'big') / 2 ** 64
+
+
+class MockHypixelAPI:
+    """
+    aiohttp application faking the endpoints hypixel.py and api.py call.
+
+    Players are generated on request, seeded by their UUID, so the same
+    name always gets the same UUID and stats, whatever the request order,
+    without holding a population in memory. missing_rate is the share of
+    names Mojang does not know (404); error_rate and throttle_rate the
+    share of Hypixel requests answered with error_status or a spurious 429.
+    """
+
+    def __init__(self, seed=42, latency='fixed:0', mojang_latency=None, error_rate=0.0,
+                 error_status=500, throttle_rate=0.0, missing_rate=0.0, rate_limit=300, window=300):
+        self.seed = seed
+        self.latency = parse_latency(latency)
+        self.mojang_latency = parse_latency(mojang_latency) if mojang_latency else self.latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.throttle_rate = throttle_rate
+        self.missing_rate = missing_rate
+        self.rate_limit = rate_limit
+        self.window = window
+
+        self._rng = random.Random(seed)
+        self._names = {}
+        self._windows = {}
+        self.counters = Counter()
+        self.in_flight = 0
+
+    def make_app(self):
+        app = web.Application()
+        app.add_routes([
+            web.get('/player', self.player),
+            web.get('/users/profiles/minecraft/{name}', self.uuid_lookup),
+            web.get('/user/profile/{uuid}', self.name_lookup),
+            web.post('/profiles/minecraft', self.bulk_lookup),
+            web.get('/mock/stats', self.stats),
+            web.post('/mock/reset', self.reset),
+        ])
+        return app
+
+    # Mojang
+
+    def _uuid(self, name):
+        """UUID of a username, or None for the names Mojang does not know."""
+        key = name.lower()
+        if _fraction(self.seed, 'missing', key) < self.missing_rate:
+            return None
+        uuid = hashlib.md5(f'{self.seed}:{key}'.encode()).hexdigest()
+        self._names.setdefault(uuid, name)
+        return uuid
+
+    def _display_name(self, uuid):
+        return self._names.get(uuid) or f'Player_{uuid[:8]}'
+
+    async def _mojang_delay(self):
+        self.counters['mojang_requests'] += 1
+        await asyncio.sleep(self.mojang_latency(self._rng))
+
+    async def uuid_lookup(self, request):
+        await self._mojang_delay()
+        name = request.match_info['name']
+        uuid = self._uuid(name)
+        if uuid is None:
+            self.counters['mojang_not_found'] += 1
+            return web.json_response({'errorMessage': f"Couldn't find any profile with name {name}"}, status=404)
+        return web.json_response({'id': uuid, 'name': self._display_name(uuid)})
+
+    async def name_lookup(self, request):
+        await self._mojang_delay()
+        uuid = request.match_info['uuid'].replace('-', '').lower()
+        return web.json_response({'id': uuid, 'name': self._display_name(uuid)})
+
+    async def bulk_lookup(self, request):
+        await self._mojang_delay()
+        names = await request.json()
+        if not isinstance(names, list) or len(names) > 10:
+            return web.json_response({'errorMessage': 'Not more that 10 profile name per call is allowed.'}, status=400)
+        profiles = []
+        for name in names:
+            uuid = self._uuid(name)
+            if uuid is not None:
+                profiles.append({'id': uuid, 'name': self._display_name(uuid)})
+        return web.json_response(profiles)
+
+    # Hypixel
+
+    def _take(self, key):
+        """Spend one request of key's window: (allowed, remaining, seconds to reset)."""
+        now = time.monotonic()
+        start, used = self._windows.get(key, (now, 0))
+        if now - start >= self.window:
+            start, used = now, 0
+        reset = max(1, int(self.window - (now - start) + 0.999))
+        if used >= self.rate_limit:
+            return False, 0, reset
+        self._windows[key] = (start, used + 1)
+        return True, self.rate_limit - used - 1, reset
+
+    async def player(self, request):
+        self.counters['hypixel_requests'] += 1
+        self.in_flight += 1
+        try:
+            await asyncio.sleep(self.latency(self._rng))
+            return self._player_response(request)
+        finally:
+            self.in_flight -= 1
+
+    def _player_response(self, request):
+        key = request.query.get('key') or request.headers.get('API-Key')
+        if not key:
+            self.counters['forbidden'] += 1
+            return web.json_response({'success': False, 'cause': 'Invalid API key'}, status=403)
+
+        allowed, remaining, reset = self._take(key)
+        headers = {
+            'RateLimit-Limit': str(self.rate_limit),
+            'RateLimit-Remaining': str(remaining),
+            'RateLimit-Reset': str(reset),
+        }
+        if not allowed or self._rng.random() < self.throttle_rate:
+            self.counters['throttled'] += 1
+            headers['Retry-After'] = str(reset)
+            return web.json_response(
+                {'success': False, 'cause': 'Key throttle', 'throttle': True},
+                status=429, headers=headers,
+            )
+        if self._rng.random() < self.error_rate:
+            self.counters['errors'] += 1
+            return web.json_response(
+                {'success': False, 'cause': 'Internal error'},
+                status=self.error_status, headers=headers,
+            )
+
+        uuid = request.query.get('uuid', '').replace('-', '').lower()
+        if len(uuid) != 32 or any(c not in '0123456789abcdef' for c in uuid):
+            return web.json_response(
+                {'success': False, 'cause': 'Malformed UUID'},
+                status=422, headers=headers,
+            )
+
+        rng = random.Random(f'{self.seed}:{uuid}')
+        player = fake_player_json(rng, uuid, self._display_name(uuid))
+        self.counters['players'] += 1
+        return web.json_response({'success': True, 'player': player}, headers=headers)
+
+    async def stats(self, request):
+        return web.json_response({**self.counters, 'in_flight': self.in_flight, 'keys': len(self._windows)})
+
+    async def reset(self, request):
+        self.counters.clear()
+        self._windows.clear()
+        return web.json_response({'success': True})
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Mock Hypixel and Mojang API server')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8099)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--latency', default='fixed:0',
+                        help='Hypixel latency in ms: fixed:MS, uniform:MIN,MAX, normal:MEAN,STDDEV, '
+                             'lognormal:MEDIAN,SIGMA or exponential:MEAN')
+    parser.add_argument('--mojang-latency', help='Mojang latency, same format (default: --latency)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='share of Hypixel requests failing')
+    parser.add_argument('--error-status', type=int, default=500)
+    parser.add_argument('--throttle-rate', type=float, default=0.0,
+                        help='share of Hypixel requests answered 429 regardless of the rate limit')
+    parser.add_argument('--missing-rate', type=float, default=0.0, help='share of usernames that do not exist')
+    parser.add_argument('--rate-limit', type=int, default=300, help='requests per key and window')
+    parser.add_argument('--window', type=int, default=300, help='rate limit window in seconds')
+    args = parser.parse_args()
+
+    try:
+        mock = MockHypixelAPI(
+            seed=args.seed,
+            latency=args.latency,
+            mojang_latency=args.mojang_latency,
+            error_rate=args.error_rate,
+            error_status=args.error_status,
+            throttle_rate=args.throttle_rate,
+            missing_rate=args.missing_rate,
+            rate_limit=args.rate_limit,
+            window=args.window,
+        )
+    except ValueError as e:
+        parser.error(str(e))
+    web.run_app(mock.make_app(), host=args.host, port=args.port)
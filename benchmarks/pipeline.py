@@ -0,0 +1,206 @@
+# Hot paths of the display pipeline: extraction -> mode stats -> figures -> cards
+#
+#     python -m benchmarks.pipeline --players 1 10 100 1000 --output pipeline.json
+#     python -m benchmarks.pipeline --compare pipeline.json   # diff against an earlier run
+#
+# Everything runs offline on seeded fake hypixel.py players (benchmarks.fixtures).
+# Each benchmark reports ops/sec (one op = one call over the whole batch of
+# players, as the dashboard does per fetch) and the memory it allocates:
+# the peak traced by tracemalloc during one op and what the op left behind.
+
+import argparse
+import gc
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from api import _build_player_data, _extract_bedwars_stats, _extract_duels_stats, _extract_skywars_stats
+from benchmarks.fixtures import make_players
+from components.stats_cards import _cards, create_combined_cards, create_stats_cards
+from config.game_modes import GAME_MODES, compute_stats, get_mode_stats
+from stats import create_figures
+
+
+MODES = [mode_id for mode_id, config in GAME_MODES.items() if not config.get('is_combined')]
+
+
+def _store(raw_players):
+    """players-store content for a batch, as the fetch callback builds it."""
+    players = {}
+    for player in raw_players:
+        player_data = _build_player_data(player)
+        players[player_data['displayname']] = {
+            'displayname': player_data['displayname'],
+            'uuid': player_data['uuid'],
+            'stats': player_data['stats'],
+        }
+    return players
+
+
+def _benchmarks(raw_players, players, card_mode):
+    """name -> (setup, op); setup runs before every op, untimed."""
+    mode_stats = [
+        (get_mode_stats(player, mode_id), mode_id)
+        for player in players.values()
+        for mode_id in MODES
+    ]
+
+    def warm_cards():
+        create_stats_cards(players, card_mode)
+        create_combined_cards(players)
+
+    return {
+        '_extract_bedwars_stats': (None, lambda: [_extract_bedwars_stats(p) for p in raw_players]),
+        '_extract_skywars_stats': (None, lambda: [_extract_skywars_stats(p) for p in raw_players]),
+        '_extract_duels_stats': (None, lambda: [_extract_duels_stats(p) for p in raw_players]),
+        'get_mode_stats': (None, lambda: [
+            get_mode_stats(player, mode_id) for player in players.values() for mode_id in MODES
+        ]),
+        'compute_stats': (None, lambda: [compute_stats(raw, mode_id) for raw, mode_id in mode_stats]),
+        'create_figures': (None, lambda: create_figures(players, None)),
+        # Cold: every card rebuilt; cached: served by the per-snapshot card cache
+        'create_stats_cards': (_cards.clear, lambda: create_stats_cards(players, card_mode)),
+        'create_stats_cards[cached]': (warm_cards, lambda: create_stats_cards(players, card_mode)),
+        'create_combined_cards': (_cards.clear, lambda: create_combined_cards(players)),
+        'create_combined_cards[cached]': (warm_cards, lambda: create_combined_cards(players)),
+    }
+
+
+def _time(setup, op, min_time, rounds):
+    """Best ops/sec over rounds, each running the op until min_time / rounds has elapsed."""
+    budget = min_time / rounds
+    best = 0.0
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(rounds):
+            ops = 0
+            elapsed = 0.0
+            while ops == 0 or elapsed < budget:
+                if setup:
+                    setup()
+                start = time.perf_counter()
+                op()
+                elapsed += time.perf_counter() - start
+                ops += 1
+            best = max(best, ops / elapsed)
+            # One op already longer than the whole budget: no point in more rounds
+            if elapsed >= min_time:
+                break
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return best
+
+
+def _allocations(setup, op):
+    """(peak, retained) bytes traced during one op."""
+    if setup:
+        setup()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        result = op()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return peak - baseline, current - baseline
+
+
+def _commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(counts, seed, min_time, rounds, card_mode, only=None):
+    results = []
+    for count in counts:
+        raw_players = make_players(count, seed=seed)
+        players = _store(raw_players)
+        print(f'{count} players')
+
+        for name, (setup, op) in _benchmarks(raw_players, players, card_mode).items():
+            if only and not any(pattern in name for pattern in only):
+                continue
+            # Warm up lazy imports and templates
+            if setup:
+                setup()
+            op()
+
+            ops_per_sec = _time(setup, op, min_time, rounds)
+            peak, retained = _allocations(setup, op)
+            results.append({
+                'name': name,
+                'players': count,
+                'ops_per_sec': ops_per_sec,
+                'players_per_sec': ops_per_sec * count,
+                'alloc_peak_bytes': peak,
+                'alloc_retained_bytes': retained,
+            })
+            print(f'  {name:<30} {ops_per_sec:>12,.2f} ops/s  {ops_per_sec * count:>12,.0f} players/s  '
+                  f'peak {peak / 1024:>10,.0f} KiB  retained {retained / 1024:>10,.0f} KiB')
+
+    return {
+        'meta': {
+            'commit': _commit(),
+            'date': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': seed,
+            'min_time': min_time,
+            'rounds': rounds,
+            'card_mode': card_mode,
+        },
+        'results': results,
+    }
+
+
+def compare(report, baseline):
+    """Print the speed and allocation ratios of report against an earlier run."""
+    previous = {(r['name'], r['players']): r for r in baseline['results']}
+    print(f"\nvs {baseline['meta'].get('commit') or 'baseline'} ({baseline['meta'].get('date')}):")
+    for result in report['results']:
+        before = previous.get((result['name'], result['players']))
+        if before is None:
+            continue
+        speedup = result['ops_per_sec'] / before['ops_per_sec']
+        peak = result['alloc_peak_bytes'] / max(before['alloc_peak_bytes'], 1)
+        print(f"  {result['name']:<30} {result['players']:>5} players  "
+              f'{speedup:>6.2f}x speed  {peak:>6.2f}x peak memory')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Display pipeline microbenchmarks')
+    parser.add_argument('--players', type=int, nargs='+', default=[1, 10, 100, 1000])
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--min-time', type=float, default=1.0, help='seconds spent timing each benchmark')
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--mode', default='bedwars_overall', choices=MODES, help='mode of the stat cards')
+    parser.add_argument('--only', nargs='+', help='run the benchmarks whose name contains one of these')
+    parser.add_argument('--output', default='pipeline.json', help='JSON report path')
+    parser.add_argument('--compare', help='earlier JSON report to diff against')
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    report = run(args.players, args.seed, args.min_time, args.rounds, args.mode, args.only)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f'\nReport written to {args.output}', file=sys.stderr)
+
+    if baseline:
+        compare(report, baseline)
@@ -0,0 +1,60 @@
+# Memory per player: player_data dicts vs compact PlayerStats records
+#
+#     python -m benchmarks.player_memory --players 10000
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+
+from api import _build_player_data
+from services.player_stats import PlayerStats
+from benchmarks.fixtures import make_players
+
+
+def _measure(build):
+    """Return (objects, bytes allocated and still alive) for build()."""
+    gc.collect()
+    tracemalloc.start()
+    objects = build()
+    size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return objects, size
+
+
+def run(players, seed):
+    fake_players = make_players(players, seed=seed)
+    extracted = [_build_player_data(player) for player in fake_players]
+    for player_data in extracted:
+        del player_data['_raw_player']
+
+    # Dicts as loaded back from the snapshot store (fresh keys and ints per player)
+    payloads = [json.dumps(p) for p in extracted]
+    dicts, dict_bytes = _measure(lambda: [json.loads(payload) for payload in payloads])
+    records, record_bytes = _measure(lambda: [PlayerStats.from_dict(p) for p in extracted])
+
+    start = time.perf_counter()
+    for record in records:
+        record.to_dict()
+    to_dict_us = (time.perf_counter() - start) / players * 1e6
+    start = time.perf_counter()
+    for p in extracted:
+        PlayerStats.from_dict(p)
+    from_dict_us = (time.perf_counter() - start) / players * 1e6
+
+    assert records[0].to_dict() == dicts[0]
+
+    print(f'{players} players')
+    print(f'dict format:   {dict_bytes / players:>8.0f} B/player')
+    print(f'PlayerStats:   {record_bytes / players:>8.0f} B/player '
+          f'({dict_bytes / record_bytes:.1f}x smaller)')
+    print(f'from_dict {from_dict_us:.1f} us/player, to_dict {to_dict_us:.1f} us/player')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Player memory benchmark')
+    parser.add_argument('--players', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+    run(args.players, args.seed)
@@ -76,13 +76,43 @@ def create_settings_panel(default_api_key=''):
                             ],
                             className='input-group',
                         ),
-                        html.Button(
+                        html.Div(
+                            [
+                                html.Button(
+                                    [
+                                        html.Span('\U0001f50d', className='btn-icon'),
+                                        html.Span('Charger les stats', className='btn-text'),
+                                    ],
+                                    id='fetch-button',
+                                    className='fetch-btn',
+                                ),
+                                # Shown while a background fetch runs
+                                html.Button(
+                                    [
+                                        html.Span('\u23f9\ufe0f', className='btn-icon'),
+                                        html.Span('Annuler', className='btn-text'),
+                                    ],
+                                    id='cancel-button',
+                                    className='cancel-btn',
+                                    style={'display': 'none'},
+                                ),
+                            ],
+                            className='fetch-buttons',
+                        ),
+                        html.Div(
                             [
-                                html.Span('\U0001f50d', className='btn-icon'),
-                                html.Span('Charger les stats', className='btn-text'),
+                                dbc.Progress(
+                                    id='fetch-progress',
+                                    value=0,
+                                    striped=True,
+                                    animated=True,
+                                    className='fetch-progress-bar',
+                                ),
+                                html.Div(id='fetch-progress-text', className='fetch-progress-text'),
                             ],
-                            id='fetch-button',
-                            className='fetch-btn',
+                            id='fetch-progress-container',
+                            className='fetch-progress',
+                            style={'display': 'none'},
                         ),
                         html.Div(id='result-message', className='result-message'),
                         dcc.Loading(
@@ -122,3 +152,12 @@ def create_success_message(message):
         ],
         className='success-message',
     )
+
+
+def create_fetch_progress(done, total, username=None, error=None):
+    """Progress bar value and status line of a running fetch."""
+    value = round(done / total * 100) if total else 0
+    if username is None:
+        return value, f'Recherche de {total} joueur(s)...'
+    status = '\u274c' if error else '\u2705'
+    return value, f'{done} / {total} joueur(s) \u2014 {status} {username}'
@@ -1,3 +1,5 @@
+import json
+
 from dash import html
 import dash_bootstrap_components as dbc
 from config.game_modes import GAME_CATEGORIES, GAME_MODES
@@ -85,3 +87,48 @@ def get_mode_from_trigger(triggered_id):
     if triggered_id and '-item' in triggered_id:
         return triggered_id.replace('-item', '')
     return None
+
+
+def get_menu_class(mode_id, current_mode):
+    """CSS class of a menu item, marked active for the current mode."""
+    if GAME_MODES[mode_id].get('is_combined'):
+        # Combined is a top-level menu item
+        base_class = 'menu-item combined-menu-item'
+    else:
+        # All other modes are submenu items
+        base_class = 'submenu-item'
+    return f'{base_class} active' if mode_id == current_mode else base_class
+
+
+def get_clientside_callbacks():
+    """
+    JavaScript versions of the mode switching and active menu callbacks,
+    generated from GAME_MODES: (update_mode, update_active_menu).
+    """
+    mode_ids = json.dumps(list(GAME_MODES.keys()))
+    base_classes = json.dumps([get_menu_class(mode_id, None) for mode_id in GAME_MODES.keys()])
+
+    update_mode = f"""
+function() {{
+    const modeIds = {mode_ids};
+    const triggered = dash_clientside.callback_context.triggered;
+    if (!triggered || !triggered.length) {{
+        throw dash_clientside.PreventUpdate;
+    }}
+    const modeId = triggered[0].prop_id.split('.')[0].replace(/-item$/, '');
+    if (modeIds.includes(modeId)) {{
+        return modeId;
+    }}
+    throw dash_clientside.PreventUpdate;
+}}
+"""
+
+    update_active_menu = f"""
+function(currentMode) {{
+    const modeIds = {mode_ids};
+    const baseClasses = {base_classes};
+    return modeIds.map((modeId, i) => modeId === currentMode ? baseClasses[i] + ' active' : baseClasses[i]);
+}}
+"""
+
+    return update_mode, update_active_menu
@@ -1,239 +1,303 @@
 from dash import html
 from config.game_modes import GAME_MODES, get_mode_stats, compute_stats
+from config.settings import CARD_CACHE_SIZE
 from config.theme import THEME
+from services.render_cache import RenderCache, content_key
 
+# Rendered cards per player snapshot and mode
+_cards = RenderCache(max_entries=CARD_CACHE_SIZE)
 
-def create_stats_cards(players_data, mode_id):
-    """Create stat cards for the selected game mode."""
-    if not players_data or mode_id not in GAME_MODES:
+
+def _cached_card(username, player, mode_id, build):
+    """
+    Return a player's card for a mode, memoized by UUID, a content hash of
+    the stats and mode: it is only rebuilt when the player's stats change.
+    The hash is always computed here, never taken from the callback input,
+    so a client cannot make other sessions see cards of altered stats.
+    """
+    uuid = player.get('uuid')
+    if not uuid:
+        return build()
+    return _cards.get((uuid, content_key(player.get('stats', {})), username), mode_id, build)
+
+
+def get_card_cache_stats():
+    """Hit/miss/eviction counters of the stat card cache."""
+    return _cards.stats()
+
+
+def create_stats_cards(players_data, mode_id, pending=()):
+    """
+    Create stat cards for the selected game mode, followed by a placeholder
+    card for each username still being fetched (pending).
+    """
+    if (not players_data and not pending) or mode_id not in GAME_MODES:
         return create_empty_state()
 
     config = GAME_MODES[mode_id]
 
     # For combined stats, show aggregated view
     if config.get('is_combined'):
-        return create_combined_cards(players_data)
-
-    cards = []
-
-    for username, player in players_data.items():
-        raw_stats = get_mode_stats(player, mode_id)
-        computed = compute_stats(raw_stats, mode_id)
-
-        # Create individual stat items
-        stat_items = []
-
-        # Main stats - dynamically create from available raw_stats
-        stat_keys = [
-            ('wins', 'Victoires', '🏆'),
-            ('games', 'Parties', '🎮'),
-            ('kills', 'Éliminations', '🗡️'),
-            ('deaths', 'Morts', '💀'),
-            ('beds_broken', 'Lits détruits', '🛏️'),
-            ('final_kills', 'Final Kills', '⚡'),
-        ]
-
-        for key, label, icon in stat_keys[:4]:  # Show first 4 available stats
-            if key in raw_stats:
-                value = raw_stats[key]
-                stat_items.append(
+        return create_combined_cards(players_data, pending)
+
+    cards = [
+        _cached_card(username, player, mode_id, lambda: create_stat_card(username, player, mode_id))
+        for username, player in players_data.items()
+    ]
+    cards += [create_placeholder_card(username) for username in pending]
+
+    return html.Div(cards, className='stats-cards-container')
+
+
+def create_combined_cards(players_data, pending=()):
+    """Create cards for combined stats view."""
+    cards = [
+        _cached_card(username, player, 'combined', lambda: create_combined_card(username, player))
+        for username, player in players_data.items()
+    ]
+    cards += [create_placeholder_card(username) for username in pending]
+
+    return html.Div(cards, className='stats-cards-container')
+
+
+def create_placeholder_card(username):
+    """Create the card shown for a player whose stats are still being fetched."""
+    return html.Div(
+        [
+            html.Div(
+                [
+                    html.Img(
+                        src=f'https://mc-heads.net/avatar/{username}/48',
+                        className='card-avatar',
+                    ),
                     html.Div(
                         [
-                            html.Span(icon, className='stat-icon'),
-                            html.Div(
-                                [
-                                    html.Span(f'{value:,}', className='stat-value'),
-                                    html.Span(label, className='stat-label'),
-                                ],
-                                className='stat-text',
-                            ),
+                            html.H3(username, className='card-username'),
+                            html.Span('Chargement...', className='card-mode'),
                         ],
-                        className='stat-item',
-                    )
-                )
+                        className='card-header-text',
+                    ),
+                ],
+                className='card-header',
+            ),
+            html.Div(
+                [html.Div(className='stat-item placeholder-block') for _ in range(4)],
+                className='stats-grid',
+            ),
+        ],
+        className='stat-card placeholder-card',
+    )
+
+
+def create_stat_card(username, player, mode_id):
+    """Create the stat card of one player for a game mode."""
+    config = GAME_MODES[mode_id]
+    raw_stats = get_mode_stats(player, mode_id)
+    computed = compute_stats(raw_stats, mode_id)
+
+    # Create individual stat items
+    stat_items = []
 
-        # Computed stats (KDR, Win Rate)
-        computed_items = []
-        for stat_id, stat_data in computed.items():
-            computed_items.append(
+    # Main stats - dynamically create from available raw_stats
+    stat_keys = [
+        ('wins', 'Victoires', '🏆'),
+        ('games', 'Parties', '🎮'),
+        ('kills', 'Éliminations', '🗡️'),
+        ('deaths', 'Morts', '💀'),
+        ('beds_broken', 'Lits détruits', '🛏️'),
+        ('final_kills', 'Final Kills', '⚡'),
+    ]
+
+    for key, label, icon in stat_keys[:4]:  # Show first 4 available stats
+        if key in raw_stats:
+            value = raw_stats[key]
+            stat_items.append(
                 html.Div(
                     [
-                        html.Span(stat_data['display'], className='computed-value'),
-                        html.Span(stat_data['label'], className='computed-label'),
+                        html.Span(icon, className='stat-icon'),
+                        html.Div(
+                            [
+                                html.Span(f'{value:,}', className='stat-value'),
+                                html.Span(label, className='stat-label'),
+                            ],
+                            className='stat-text',
+                        ),
                     ],
-                    className='computed-item',
+                    className='stat-item',
                 )
             )
 
-        cards.append(
+    # Computed stats (KDR, Win Rate)
+    computed_items = []
+    for stat_id, stat_data in computed.items():
+        computed_items.append(
+            html.Div(
+                [
+                    html.Span(stat_data['display'], className='computed-value'),
+                    html.Span(stat_data['label'], className='computed-label'),
+                ],
+                className='computed-item',
+            )
+        )
+
+    return html.Div(
+        [
             html.Div(
                 [
+                    html.Img(
+                        src=f'https://mc-heads.net/avatar/{username}/48',
+                        className='card-avatar',
+                    ),
                     html.Div(
                         [
-                            html.Img(
-                                src=f'https://mc-heads.net/avatar/{username}/48',
-                                className='card-avatar',
-                            ),
-                            html.Div(
-                                [
-                                    html.H3(username, className='card-username'),
-                                    html.Span(config['name'], className='card-mode'),
-                                ],
-                                className='card-header-text',
-                            ),
+                            html.H3(username, className='card-username'),
+                            html.Span(config['name'], className='card-mode'),
                         ],
-                        className='card-header',
+                        className='card-header-text',
                     ),
-                    html.Div(stat_items, className='stats-grid'),
-                    html.Div(computed_items, className='computed-stats'),
                 ],
-                className='stat-card',
-                style={'borderTopColor': config.get('color', '#6366f1')},
-            )
-        )
+                className='card-header',
+            ),
+            html.Div(stat_items, className='stats-grid'),
+            html.Div(computed_items, className='computed-stats'),
+        ],
+        className='stat-card',
+        style={'borderTopColor': config.get('color', '#6366f1')},
+    )
 
-    return html.Div(cards, className='stats-cards-container')
 
+def create_combined_card(username, player):
+    """Create the combined stats card of one player."""
+    total_wins = 0
+    total_games = 0
+    total_kills = 0
+    total_deaths = 0
 
-def create_combined_cards(players_data):
-    """Create cards for combined stats view."""
-    cards = []
-
-    for username, player in players_data.items():
-        total_wins = 0
-        total_games = 0
-        total_kills = 0
-        total_deaths = 0
-
-        # Aggregate from Bedwars
-        if 'Bedwars' in player.get('stats', {}):
-            bw = player['stats']['Bedwars']
-            total_wins += bw.get('wins_bedwars', 0)
-            total_games += bw.get('games_played_bedwars', 0)
-            total_kills += bw.get('kills_bedwars', 0)
-            total_deaths += bw.get('deaths_bedwars', 0)
-
-        # Aggregate from Duels
-        if 'Duels' in player.get('stats', {}):
-            duels = player['stats']['Duels']
-            total_wins += duels.get('wins', 0)
-            total_games += duels.get('rounds_played', 0)
-            total_kills += duels.get('kills', 0)
-            total_deaths += duels.get('deaths', 0)
-
-        # Aggregate from Skywars
-        if 'SkyWars' in player.get('stats', {}):
-            sw = player['stats']['SkyWars']
-            total_wins += sw.get('wins', 0)
-            total_games += sw.get('games_played_skywars', 0)
-            total_kills += sw.get('kills', 0)
-            total_deaths += sw.get('deaths', 0)
-
-        kdr = round(total_kills / total_deaths, 2) if total_deaths > 0 else 0
-        win_rate = round((total_wins / total_games) * 100, 1) if total_games > 0 else 0
-
-        cards.append(
+    # Aggregate from Bedwars
+    if 'Bedwars' in player.get('stats', {}):
+        bw = player['stats']['Bedwars']
+        total_wins += bw.get('wins_bedwars', 0)
+        total_games += bw.get('games_played_bedwars', 0)
+        total_kills += bw.get('kills_bedwars', 0)
+        total_deaths += bw.get('deaths_bedwars', 0)
+
+    # Aggregate from Duels
+    if 'Duels' in player.get('stats', {}):
+        duels = player['stats']['Duels']
+        total_wins += duels.get('wins', 0)
+        total_games += duels.get('rounds_played', 0)
+        total_kills += duels.get('kills', 0)
+        total_deaths += duels.get('deaths', 0)
+
+    # Aggregate from Skywars
+    if 'SkyWars' in player.get('stats', {}):
+        sw = player['stats']['SkyWars']
+        total_wins += sw.get('wins', 0)
+        total_games += sw.get('games_played_skywars', 0)
+        total_kills += sw.get('kills', 0)
+        total_deaths += sw.get('deaths', 0)
+
+    kdr = round(total_kills / total_deaths, 2) if total_deaths > 0 else 0
+    win_rate = round((total_wins / total_games) * 100, 1) if total_games > 0 else 0
+
+    return html.Div(
+        [
             html.Div(
                 [
+                    html.Img(
+                        src=f'https://mc-heads.net/avatar/{username}/48',
+                        className='card-avatar',
+                    ),
                     html.Div(
                         [
-                            html.Img(
-                                src=f'https://mc-heads.net/avatar/{username}/48',
-                                className='card-avatar',
-                            ),
-                            html.Div(
-                                [
-                                    html.H3(username, className='card-username'),
-                                    html.Span('Stats Combin\u00e9es', className='card-mode'),
-                                ],
-                                className='card-header-text',
-                            ),
+                            html.H3(username, className='card-username'),
+                            html.Span('Stats Combin\u00e9es', className='card-mode'),
                         ],
-                        className='card-header',
+                        className='card-header-text',
                     ),
+                ],
+                className='card-header',
+            ),
+            html.Div(
+                [
                     html.Div(
                         [
+                            html.Span('\U0001f3c6', className='stat-icon'),
                             html.Div(
                                 [
-                                    html.Span('\U0001f3c6', className='stat-icon'),
-                                    html.Div(
-                                        [
-                                            html.Span(f'{total_wins:,}', className='stat-value'),
-                                            html.Span('Victoires', className='stat-label'),
-                                        ],
-                                        className='stat-text',
-                                    ),
-                                ],
-                                className='stat-item',
-                            ),
-                            html.Div(
-                                [
-                                    html.Span('\U0001f3ae', className='stat-icon'),
-                                    html.Div(
-                                        [
-                                            html.Span(f'{total_games:,}', className='stat-value'),
-                                            html.Span('Parties', className='stat-label'),
-                                        ],
-                                        className='stat-text',
-                                    ),
+                                    html.Span(f'{total_wins:,}', className='stat-value'),
+                                    html.Span('Victoires', className='stat-label'),
                                 ],
-                                className='stat-item',
-                            ),
-                            html.Div(
-                                [
-                                    html.Span('\U0001f5e1\ufe0f', className='stat-icon'),
-                                    html.Div(
-                                        [
-                                            html.Span(f'{total_kills:,}', className='stat-value'),
-                                            html.Span('\u00c9liminations', className='stat-label'),
-                                        ],
-                                        className='stat-text',
-                                    ),
-                                ],
-                                className='stat-item',
+                                className='stat-text',
                             ),
+                        ],
+                        className='stat-item',
+                    ),
+                    html.Div(
+                        [
+                            html.Span('\U0001f3ae', className='stat-icon'),
                             html.Div(
                                 [
-                                    html.Span('\U0001f480', className='stat-icon'),
-                                    html.Div(
-                                        [
-                                            html.Span(f'{total_deaths:,}', className='stat-value'),
-                                            html.Span('Morts', className='stat-label'),
-                                        ],
-                                        className='stat-text',
-                                    ),
+                                    html.Span(f'{total_games:,}', className='stat-value'),
+                                    html.Span('Parties', className='stat-label'),
                                 ],
-                                className='stat-item',
+                                className='stat-text',
                             ),
                         ],
-                        className='stats-grid',
+                        className='stat-item',
                     ),
                     html.Div(
                         [
+                            html.Span('\U0001f5e1\ufe0f', className='stat-icon'),
                             html.Div(
                                 [
-                                    html.Span(f'{kdr}', className='computed-value'),
-                                    html.Span('K/D Ratio', className='computed-label'),
+                                    html.Span(f'{total_kills:,}', className='stat-value'),
+                                    html.Span('\u00c9liminations', className='stat-label'),
                                 ],
-                                className='computed-item',
+                                className='stat-text',
                             ),
+                        ],
+                        className='stat-item',
+                    ),
+                    html.Div(
+                        [
+                            html.Span('\U0001f480', className='stat-icon'),
                             html.Div(
                                 [
-                                    html.Span(f'{win_rate}%', className='computed-value'),
-                                    html.Span('Win Rate', className='computed-label'),
+                                    html.Span(f'{total_deaths:,}', className='stat-value'),
+                                    html.Span('Morts', className='stat-label'),
                                 ],
-                                className='computed-item',
+                                className='stat-text',
                             ),
                         ],
-                        className='computed-stats',
+                        className='stat-item',
                     ),
                 ],
-                className='stat-card',
-                style={'borderTopColor': '#4caf50'},
-            )
-        )
-
-    return html.Div(cards, className='stats-cards-container')
+                className='stats-grid',
+            ),
+            html.Div(
+                [
+                    html.Div(
+                        [
+                            html.Span(f'{kdr}', className='computed-value'),
+                            html.Span('K/D Ratio', className='computed-label'),
+                        ],
+                        className='computed-item',
+                    ),
+                    html.Div(
+                        [
+                            html.Span(f'{win_rate}%', className='computed-value'),
+                            html.Span('Win Rate', className='computed-label'),
+                        ],
+                        className='computed-item',
+                    ),
+                ],
+                className='computed-stats',
+            ),
+        ],
+        className='stat-card',
+        style={'borderTopColor': '#4caf50'},
+    )
 
 
 def create_empty_state():
@@ -1,5 +1,8 @@
 # Game modes configuration - Organized by game type with sub-modes
 
+from .stat_schema import SHOWN_FIELDS
+
+
 def safe_divide(a, b):
     """Safely divide two numbers, returning 0 if divisor is 0."""
     return round(a / b, 2) if b > 0 else 0
@@ -201,166 +204,16 @@ def get_categories():
 
 def get_mode_stats(player_data, mode_id):
     """Extract stats for a specific mode from player data."""
-    if not player_data or 'stats' not in player_data:
+    fields = SHOWN_FIELDS.get(mode_id)
+    if fields is None or not player_data or 'stats' not in player_data:
         return {}
 
-    # Parse mode_id to determine game type and specific mode
-    if mode_id.startswith('bedwars_'):
-        return _get_bedwars_stats(player_data, mode_id)
-    elif mode_id.startswith('skywars_'):
-        return _get_skywars_stats(player_data, mode_id)
-    elif mode_id.startswith('duel_') or mode_id == 'duels_overall':
-        return _get_duels_stats(player_data, mode_id)
-
-    return {}
-
-
-def _get_bedwars_stats(player_data, mode_id):
-    """Extract Bedwars stats for a specific mode."""
-    if 'Bedwars' not in player_data.get('stats', {}):
-        return {}
-
-    bedwars = player_data['stats']['Bedwars']
-
-    if mode_id == 'bedwars_overall':
-        return {
-            'wins': bedwars.get('wins_bedwars', 0),
-            'games': bedwars.get('games_played_bedwars', 0),
-            'kills': bedwars.get('kills_bedwars', 0),
-            'deaths': bedwars.get('deaths_bedwars', 0),
-            'beds_broken': bedwars.get('beds_broken_bedwars', 0),
-            'final_kills': bedwars.get('final_kills_bedwars', 0),
-            'final_deaths': bedwars.get('final_deaths_bedwars', 0),
-        }
-    elif mode_id == 'bedwars_solo':
-        return {
-            'wins': bedwars.get('eight_one_wins_bedwars', 0),
-            'games': bedwars.get('eight_one_games_played_bedwars', 0),
-            'kills': bedwars.get('eight_one_kills_bedwars', 0),
-            'deaths': bedwars.get('eight_one_deaths_bedwars', 0),
-            'beds_broken': bedwars.get('eight_one_beds_broken_bedwars', 0),
-        }
-    elif mode_id == 'bedwars_doubles':
-        return {
-            'wins': bedwars.get('eight_two_wins_bedwars', 0),
-            'games': bedwars.get('eight_two_games_played_bedwars', 0),
-            'kills': bedwars.get('eight_two_kills_bedwars', 0),
-            'deaths': bedwars.get('eight_two_deaths_bedwars', 0),
-            'beds_broken': bedwars.get('eight_two_beds_broken_bedwars', 0),
-        }
-    elif mode_id == 'bedwars_threes':
-        return {
-            'wins': bedwars.get('four_three_wins_bedwars', 0),
-            'games': bedwars.get('four_three_games_played_bedwars', 0),
-            'kills': bedwars.get('four_three_kills_bedwars', 0),
-            'deaths': bedwars.get('four_three_deaths_bedwars', 0),
-            'beds_broken': bedwars.get('four_three_beds_broken_bedwars', 0),
-        }
-    elif mode_id == 'bedwars_fours':
-        return {
-            'wins': bedwars.get('four_four_wins_bedwars', 0),
-            'games': bedwars.get('four_four_games_played_bedwars', 0),
-            'kills': bedwars.get('four_four_kills_bedwars', 0),
-            'deaths': bedwars.get('four_four_deaths_bedwars', 0),
-            'beds_broken': bedwars.get('four_four_beds_broken_bedwars', 0),
-        }
-    elif mode_id == 'bedwars_4v4':
-        return {
-            'wins': bedwars.get('two_four_wins_bedwars', 0),
-            'games': bedwars.get('two_four_games_played_bedwars', 0),
-            'kills': bedwars.get('two_four_kills_bedwars', 0),
-            'deaths': bedwars.get('two_four_deaths_bedwars', 0),
-            'beds_broken': bedwars.get('two_four_beds_broken_bedwars', 0),
-        }
-
-    return {}
-
-
-def _get_skywars_stats(player_data, mode_id):
-    """Extract Skywars stats for a specific mode."""
-    if 'SkyWars' not in player_data.get('stats', {}):
+    game, stat_keys = fields
+    game_stats = player_data['stats'].get(game)
+    if game_stats is None:
         return {}
 
-    skywars = player_data['stats']['SkyWars']
-
-    if mode_id == 'skywars_overall':
-        return {
-            'wins': skywars.get('wins', 0),
-            'games': skywars.get('games_played_skywars', 0),
-            'kills': skywars.get('kills', 0),
-            'deaths': skywars.get('deaths', 0),
-        }
-    elif mode_id == 'skywars_ranked':
-        return {
-            'wins': skywars.get('ranked_wins', 0),
-            'games': skywars.get('ranked_games', 0),
-            'kills': skywars.get('ranked_kills', 0),
-            'deaths': skywars.get('ranked_deaths', 0),
-        }
-    elif mode_id == 'skywars_solo_normal':
-        return {
-            'wins': skywars.get('solo_normal_wins', 0),
-            'games': skywars.get('solo_normal_games', 0),
-            'kills': skywars.get('solo_normal_kills', 0),
-            'deaths': skywars.get('solo_normal_deaths', 0),
-        }
-    elif mode_id == 'skywars_solo_insane':
-        return {
-            'wins': skywars.get('solo_insane_wins', 0),
-            'games': skywars.get('solo_insane_games', 0),
-            'kills': skywars.get('solo_insane_kills', 0),
-            'deaths': skywars.get('solo_insane_deaths', 0),
-        }
-    elif mode_id == 'skywars_team_normal':
-        return {
-            'wins': skywars.get('team_normal_wins', 0),
-            'games': skywars.get('team_normal_games', 0),
-            'kills': skywars.get('team_normal_kills', 0),
-            'deaths': skywars.get('team_normal_deaths', 0),
-        }
-    elif mode_id == 'skywars_team_insane':
-        return {
-            'wins': skywars.get('team_insane_wins', 0),
-            'games': skywars.get('team_insane_games', 0),
-            'kills': skywars.get('team_insane_kills', 0),
-            'deaths': skywars.get('team_insane_deaths', 0),
-        }
-    elif mode_id == 'skywars_mega':
-        return {
-            'wins': skywars.get('mega_wins', 0),
-            'games': skywars.get('mega_games', 0),
-            'kills': skywars.get('mega_kills', 0),
-            'deaths': skywars.get('mega_deaths', 0),
-        }
-
-    return {}
-
-
-def _get_duels_stats(player_data, mode_id):
-    """Extract Duels stats for a specific mode."""
-    if 'Duels' not in player_data.get('stats', {}):
-        return {}
-
-    duels = player_data['stats']['Duels']
-
-    if mode_id == 'duels_overall':
-        return {
-            'wins': duels.get('wins', 0),
-            'games': duels.get('rounds_played', 0),
-            'kills': duels.get('kills', 0),
-            'deaths': duels.get('deaths', 0),
-        }
-
-    # Extract the duel type from mode_id (e.g., 'duel_sumo' -> 'sumo')
-    duel_type = mode_id.replace('duel_', '')
-
-    return {
-        'wins': duels.get(f'{duel_type}_duel_wins', 0),
-        'games': duels.get(f'{duel_type}_duel_rounds_played', 0),
-        'kills': duels.get(f'{duel_type}_duel_kills', 0),
-        'deaths': duels.get(f'{duel_type}_duel_deaths', 0),
-        'winstreak': duels.get(f'best_{duel_type}_winstreak', 0),
-    }
+    return {stat: game_stats.get(storage_key, 0) for stat, storage_key in stat_keys}
 
 
 def compute_stats(raw_stats, mode_id):
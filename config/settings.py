@@ -0,0 +1,85 @@
+# Runtime settings for the API layer, read from the environment (.env)
+
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def _env_int(name, default):
+    """Read an integer setting, falling back to the default."""
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+# API base URLs (point both at benchmarks.mock_api for offline load tests)
+HYPIXEL_API_URL = os.getenv('HYPIXEL_API_URL', 'https://api.hypixel.net').rstrip('/')
+MOJANG_API_URL = os.getenv('HYPIXEL_MOJANG_API_URL', 'https://api.mojang.com').rstrip('/')
+
+# Shared HTTP client
+HTTP_TIMEOUT = _env_int('HYPIXEL_HTTP_TIMEOUT', 10)          # seconds per request
+HTTP_POOL_SIZE = _env_int('HYPIXEL_HTTP_POOL_SIZE', 50)      # open connections per key
+HTTP_KEEPALIVE = _env_int('HYPIXEL_HTTP_KEEPALIVE', 60)      # idle seconds before closing
+
+# Batch fetches
+FETCH_CONCURRENCY = _env_int('HYPIXEL_FETCH_CONCURRENCY', 8)  # players fetched in parallel
+
+# In-memory player cache
+CACHE_TTL = _env_int('HYPIXEL_CACHE_TTL', 300)                         # seconds an entry is fresh
+CACHE_STALE_TTL = _env_int('HYPIXEL_CACHE_STALE_TTL', 3600)            # extra seconds served while refreshing (0 = off)
+CACHE_MAX_ENTRIES = _env_int('HYPIXEL_CACHE_MAX_ENTRIES', 5000)
+CACHE_MAX_BYTES = _env_int('HYPIXEL_CACHE_MAX_BYTES', 64 * 1024 * 1024)
+
+# On-disk snapshot store (survives restarts)
+STORE_PATH = os.getenv('HYPIXEL_STORE_PATH', os.path.join('data', 'players.sqlite3'))
+HISTORY_PATH = os.getenv('HYPIXEL_HISTORY_PATH', os.path.join('data', 'history.sqlite3'))
+HISTORY_KEYFRAME_INTERVAL = _env_int('HYPIXEL_HISTORY_KEYFRAME_INTERVAL', 32)  # snapshots per full keyframe
+
+# Username -> UUID resolution
+RESOLVER_TTL = _env_int('HYPIXEL_RESOLVER_TTL', 86400)                 # seconds a resolved name is trusted
+RESOLVER_NEGATIVE_TTL = _env_int('HYPIXEL_RESOLVER_NEGATIVE_TTL', 300)  # seconds "not found" is remembered
+
+# Hypixel API budget per key (default: 300 requests per 5 minutes)
+RATE_LIMIT = _env_int('HYPIXEL_RATE_LIMIT', 300)
+RATE_LIMIT_WINDOW = _env_int('HYPIXEL_RATE_LIMIT_WINDOW', 300)  # seconds
+
+# Leaderboards kept live from the first request (others are indexed on first use)
+LEADERBOARDS = [
+    metric.strip()
+    for metric in os.getenv('HYPIXEL_LEADERBOARDS', 'bedwars_overall.fkdr,duel_sumo.winstreak').split(',')
+    if metric.strip()
+]
+
+# Parquet/Arrow exports: snapshots encoded per batch (bounds memory use)
+EXPORT_BATCH_SIZE = _env_int('HYPIXEL_EXPORT_BATCH_SIZE', 5000)
+
+# Figures memoized per set of players and mode, stat cards per player and mode
+FIGURE_CACHE_SIZE = _env_int('HYPIXEL_FIGURE_CACHE_SIZE', 256)
+CARD_CACHE_SIZE = _env_int('HYPIXEL_CARD_CACHE_SIZE', 4096)
+
+# Fetch results kept server-side (the browser only holds their id)
+RESULT_TTL = _env_int('HYPIXEL_RESULT_TTL', 3600)                      # seconds a result lives without being viewed
+RESULT_MAX_ENTRIES = _env_int('HYPIXEL_RESULT_MAX_ENTRIES', 1000)
+
+# Run sidebar mode switching in the browser (0 = Python callbacks)
+CLIENTSIDE_CALLBACKS = _env_int('HYPIXEL_CLIENTSIDE_CALLBACKS', 1)
+
+# Fetch players as background callbacks with progress and cancel (0 = blocking callback)
+BACKGROUND_CALLBACKS = _env_int('HYPIXEL_BACKGROUND_CALLBACKS', 1)
+
+# Serve Prometheus metrics on /metrics, unauthenticated (0 = not served)
+METRICS_ENDPOINT = _env_int('HYPIXEL_METRICS_ENDPOINT', 1)
+
+# Watchlist refreshed in the background (comma-separated usernames or UUIDs)
+WATCHLIST = [name.strip() for name in os.getenv('HYPIXEL_WATCHLIST', '').split(',') if name.strip()]
+WATCHLIST_FILE = os.getenv('HYPIXEL_WATCHLIST_FILE', '')               # one username per line
+WATCHLIST_INTERVAL = _env_int('HYPIXEL_WATCHLIST_INTERVAL', 600)       # seconds between refreshes of a player
+WATCHLIST_BATCH_SIZE = _env_int('HYPIXEL_WATCHLIST_BATCH_SIZE', 10)    # players refreshed per cycle
+WATCHLIST_BUDGET_PERCENT = _env_int('HYPIXEL_WATCHLIST_BUDGET_PERCENT', 50)  # share of the API budget it may use
+
+if WATCHLIST_FILE and os.path.exists(WATCHLIST_FILE):
+    with open(WATCHLIST_FILE, encoding='utf-8') as f:
+        WATCHLIST += [line.strip() for line in f if line.strip() and not line.startswith('#')]
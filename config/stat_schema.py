@@ -0,0 +1,208 @@
+# Declarative stat schema: game -> mode -> stat -> (storage key, source)
+#
+# The storage key is the key used in player_data['stats'][game] (what the
+# snapshot store, history and players-store hold). The source says where the
+# counter comes from on a hypixel.py Player:
+#   - an attribute path, e.g. 'bedwars.solo.wins'
+#   - a key of a raw data dict, e.g. 'duels._data.sumo_duel_wins' (0 if absent)
+#   - a tuple of the above, summed
+# Missing (None) values are stored as 0.
+#
+# The schema is compiled once at import into flat accessor tables, so
+# extraction and per-mode lookups never branch on the mode id. Adding a mode
+# is a new row in one of the tables below (plus its entry in GAME_CATEGORIES).
+
+from operator import attrgetter
+
+
+# Bedwars: mode_id -> (storage prefix, hypixel.py attribute)
+BEDWARS_MODES = {
+    'bedwars_solo': ('eight_one', 'solo'),
+    'bedwars_doubles': ('eight_two', 'doubles'),
+    'bedwars_threes': ('four_three', 'threes'),
+    'bedwars_fours': ('four_four', 'fours'),
+    'bedwars_4v4': ('two_four', 'teams'),
+}
+
+# Skywars: mode_id -> (storage prefix, hypixel.py attributes summed together)
+SKYWARS_MODES = {
+    'skywars_ranked': ('ranked', ('ranked',)),
+    'skywars_solo_normal': ('solo_normal', ('solo_normal',)),
+    'skywars_solo_insane': ('solo_insane', ('solo_insane',)),
+    'skywars_team_normal': ('team_normal', ('team_normal',)),
+    'skywars_team_insane': ('team_insane', ('team_insane',)),
+    'skywars_mega': ('mega', ('mega_normal', 'mega_doubles')),
+}
+
+# Duels: duel types read from the raw duels data (mode_id is 'duel_<type>')
+DUEL_TYPES = [
+    'classic', 'bow', 'bowspleef', 'boxing', 'bridge', 'combo',
+    'mega_walls', 'nodebuff', 'op', 'potion', 'skywars', 'sumo', 'uhc',
+]
+
+# Key of the per-game stats that are stored but not shown by any mode
+STORED_ONLY = '_stored'
+
+
+def _bedwars_mode(prefix, attr):
+    return {
+        'wins': (f'{prefix}_wins_bedwars', f'bedwars.{attr}.wins'),
+        'games': (f'{prefix}_games_played_bedwars', f'bedwars.{attr}.games'),
+        'kills': (f'{prefix}_kills_bedwars', f'bedwars.{attr}.kills'),
+        'deaths': (f'{prefix}_deaths_bedwars', f'bedwars.{attr}.deaths'),
+        'beds_broken': (f'{prefix}_beds_broken_bedwars', f'bedwars.{attr}.beds_broken'),
+        'beds_lost': (f'{prefix}_beds_lost_bedwars', f'bedwars.{attr}.beds_lost'),
+    }
+
+
+def _skywars_mode(prefix, attrs):
+    return {
+        'wins': (f'{prefix}_wins', tuple(f'skywars.{a}.wins' for a in attrs)),
+        'games': (
+            f'{prefix}_games',
+            tuple(f'skywars.{a}.{c}' for a in attrs for c in ('wins', 'losses')),
+        ),
+        'kills': (f'{prefix}_kills', tuple(f'skywars.{a}.kills' for a in attrs)),
+        'deaths': (f'{prefix}_deaths', tuple(f'skywars.{a}.deaths' for a in attrs)),
+    }
+
+
+def _duel_mode(duel_type):
+    data = f'duels._data.{duel_type}_duel'
+    return {
+        'wins': (f'{duel_type}_duel_wins', f'{data}_wins'),
+        'games': (f'{duel_type}_duel_rounds_played', (f'{data}_wins', f'{data}_losses')),
+        'kills': (f'{duel_type}_duel_kills', f'{data}_kills'),
+        'deaths': (f'{duel_type}_duel_deaths', f'{data}_deaths'),
+        'winstreak': (f'best_{duel_type}_winstreak', f'duels._data.best_{duel_type}_winstreak'),
+    }
+
+
+STAT_SCHEMA = {
+    'Bedwars': {
+        'bedwars_overall': {
+            'wins': ('wins_bedwars', 'bedwars.wins'),
+            'games': ('games_played_bedwars', 'bedwars.games'),
+            'kills': ('kills_bedwars', 'bedwars.kills'),
+            'deaths': ('deaths_bedwars', 'bedwars.deaths'),
+            'beds_broken': ('beds_broken_bedwars', 'bedwars.beds_broken'),
+            'beds_lost': ('beds_lost_bedwars', 'bedwars.beds_lost'),
+            'final_kills': ('final_kills_bedwars', 'bedwars.final_kills'),
+            'final_deaths': ('final_deaths_bedwars', 'bedwars.final_deaths'),
+        },
+        STORED_ONLY: {
+            'winstreak': ('winstreak', 'bedwars.winstreak'),
+        },
+        **{
+            mode_id: _bedwars_mode(prefix, attr)
+            for mode_id, (prefix, attr) in BEDWARS_MODES.items()
+        },
+    },
+    'SkyWars': {
+        'skywars_overall': {
+            'wins': ('wins', 'skywars.wins'),
+            'games': ('games_played_skywars', 'skywars.games'),
+            'kills': ('kills', 'skywars.kills'),
+            'deaths': ('deaths', 'skywars.deaths'),
+        },
+        STORED_ONLY: {
+            'winstreak': ('winstreak', 'skywars.winstreak'),
+        },
+        **{
+            mode_id: _skywars_mode(prefix, attrs)
+            for mode_id, (prefix, attrs) in SKYWARS_MODES.items()
+        },
+    },
+    'Duels': {
+        'duels_overall': {
+            'wins': ('wins', 'duels.wins'),
+            'games': ('rounds_played', ('duels.wins', 'duels.losses')),
+            'kills': ('kills', 'duels.kills'),
+            'deaths': ('deaths', 'duels.deaths'),
+        },
+        STORED_ONLY: {
+            f'{duel_type}_losses': (f'{duel_type}_duel_losses', f'duels._data.{duel_type}_duel_losses')
+            for duel_type in DUEL_TYPES
+        },
+        **{
+            f'duel_{duel_type}': _duel_mode(duel_type)
+            for duel_type in DUEL_TYPES
+        },
+    },
+}
+
+
+def _or_zero(getter):
+    def get(player):
+        value = getter(player)
+        return 0 if value is None else value
+    return get
+
+
+def _compile_path(path):
+    """Compile one source path into a getter on a hypixel.py Player."""
+    owner, sep, key = path.partition('._data.')
+    if sep:
+        get_data = attrgetter(f'{owner}._data')
+        return lambda player: get_data(player).get(key, 0)
+    return attrgetter(path)
+
+
+def _compile_source(source):
+    if isinstance(source, tuple):
+        getters = [_or_zero(_compile_path(path)) for path in source]
+        return lambda player: sum(get(player) for get in getters)
+    return _or_zero(_compile_path(source))
+
+
+def _compile(schema):
+    """
+    Build the accessor tables:
+      FIELD_GETTERS[game] -> ((storage_key, getter), ...) in schema order
+      MODE_FIELDS[mode_id] -> (game, ((stat, storage_key), ...))
+    """
+    field_getters = {}
+    mode_fields = {}
+
+    for game, modes in schema.items():
+        sources = {}
+        for mode_id, stats in modes.items():
+            for stat, (storage_key, source) in stats.items():
+                if sources.setdefault(storage_key, source) != source:
+                    raise ValueError(f'{game}: storage key {storage_key!r} has two sources')
+            if mode_id != STORED_ONLY:
+                if mode_id in mode_fields:
+                    raise ValueError(f'Mode {mode_id!r} is defined twice')
+                mode_fields[mode_id] = (
+                    game,
+                    tuple((stat, storage_key) for stat, (storage_key, source) in stats.items()),
+                )
+
+        field_getters[game] = tuple(
+            (storage_key, _compile_source(source))
+            for storage_key, source in sources.items()
+        )
+
+    return field_getters, mode_fields
+
+
+FIELD_GETTERS, MODE_FIELDS = _compile(STAT_SCHEMA)
+
+# Stats stored per mode for derived ratios (BBLR) but not shown by it
+HIDDEN_STATS = frozenset({'beds_lost'})
+
+# MODE_FIELDS without HIDDEN_STATS: the stats get_mode_stats returns
+SHOWN_FIELDS = {
+    mode_id: (game, tuple((stat, key) for stat, key in stat_keys if stat not in HIDDEN_STATS))
+    for mode_id, (game, stat_keys) in MODE_FIELDS.items()
+}
+
+
+def extract_game_stats(player, game):
+    """Extract the stored stats dict of one game from a hypixel.py Player."""
+    return {storage_key: get(player) for storage_key, get in FIELD_GETTERS[game]}
+
+
+def get_storage_keys(game):
+    """Storage keys of a game's stats dict, in schema order."""
+    return [storage_key for storage_key, get in FIELD_GETTERS[game]]
@@ -3,4 +3,4 @@ import webbrowser
 
 if __name__ == "__main__":
     webbrowser.open("http://127.0.0.1:8050/")
-    app.run_server(debug=True, use_reloader=False)
+    app.run(debug=True, use_reloader=False)
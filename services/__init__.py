@@ -0,0 +1,31 @@
+from .client import HypixelService
+from .player_stats import PlayerStats
+from .cache import PlayerCache
+from .store import SnapshotStore
+from .history import HistoryStore
+from .resolver import NameResolver
+from .rate_limiter import RateLimiter
+from .singleflight import SingleFlight
+from .scheduler import RefreshScheduler
+from .render_cache import RenderCache
+from .result_store import ResultStore
+from .leaderboard import Leaderboard
+from .background import LoopCallbackManager
+from .metrics import MetricsRegistry
+
+__all__ = [
+    'HypixelService',
+    'PlayerStats',
+    'PlayerCache',
+    'SnapshotStore',
+    'HistoryStore',
+    'NameResolver',
+    'RateLimiter',
+    'SingleFlight',
+    'RefreshScheduler',
+    'RenderCache',
+    'ResultStore',
+    'Leaderboard',
+    'LoopCallbackManager',
+    'MetricsRegistry',
+]
@@ -0,0 +1,183 @@
+import asyncio
+import functools
+import inspect
+import itertools
+import threading
+import time
+import traceback
+from contextvars import copy_context
+
+from dash.background_callback.managers import BaseBackgroundCallbackManager
+from dash.exceptions import PreventUpdate
+
+# The one Dash internal used here: the context variable behind
+# dash.callback_context and dash.set_props. Dash's own background managers
+# set it the same way and there is no public setter (checked on the Dash
+# versions allowed by requirements.txt).
+from dash._callback_context import context_value
+
+
+class _JobContext(dict):
+    """Callback context of a job: the dict Dash hands the manager, readable as attributes."""
+
+    def __getattr__(self, key):
+        try:
+            return self[key]
+        except KeyError:
+            raise AttributeError(key) from None
+
+    def __setattr__(self, key, value):
+        self[key] = value
+
+
+class _RecordedProps(dict):
+    """updated_props of a job context, reporting each dash.set_props call to on_change."""
+
+    def __init__(self, on_change):
+        super().__init__()
+        self._on_change = on_change
+
+    def __setitem__(self, component_id, props):
+        super().__setitem__(component_id, props)
+        self._on_change(component_id, props)
+
+
+class LoopCallbackManager(BaseBackgroundCallbackManager):
+    """
+    Dash background callback manager running jobs on the shared client loop.
+
+    Dash's own managers run each job in a subprocess (DiskcacheManager) or a
+    Celery worker, away from this process' rate limiters, caches and result
+    store. Here a job is a task on the HypixelService loop instead: the
+    callback body runs in the loop's default executor and, if it returns a
+    coroutine, that coroutine is awaited on the loop, so a fetch only holds
+    the server worker that starts it and cancelling the job cancels its
+    pending requests. Progress, set_props updates and results are kept in
+    memory until the browser polls them; results nobody collects are dropped
+    after expire seconds.
+    """
+
+    def __init__(self, service, expire=3600):
+        super().__init__(None)
+        self._service = service
+        self.expire = expire
+
+        self._jobs = {}
+        self._results = {}
+        self._progress = {}
+        self._updated_props = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def make_job_fn(self, fn, progress, key=None):
+        async def job_fn(result_key, progress_key, args, context):
+            def set_progress(value):
+                if not isinstance(value, (list, tuple)):
+                    value = [value]
+                with self._lock:
+                    self._progress[progress_key] = value
+
+            def set_props(component_id, props):
+                with self._lock:
+                    self._updated_props.setdefault(result_key, {})[component_id] = props
+
+            def run():
+                ctx = _JobContext(context)
+                ctx.ignore_register_page = False
+                ctx.updated_props = _RecordedProps(set_props)
+                context_value.set(ctx)
+
+                call_args = [set_progress] if progress else []
+                if isinstance(args, dict):
+                    return fn(*call_args, **args)
+                if isinstance(args, (list, tuple)):
+                    return fn(*call_args, *args)
+                return fn(*call_args, args)
+
+            try:
+                ctx = copy_context()
+                output = await asyncio.get_running_loop().run_in_executor(None, ctx.run, run)
+                if inspect.isawaitable(output):
+                    output = await output
+            except PreventUpdate:
+                output = {'_dash_no_update': '_dash_no_update'}
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                output = {'background_callback_error': {'msg': str(e), 'tb': traceback.format_exc()}}
+            self._store_result(result_key, output)
+
+        return job_fn
+
+    def _store_result(self, key, output):
+        now = time.monotonic()
+        with self._lock:
+            self._results[key] = (output, now)
+            # Drop results of jobs whose page went away
+            for stale in [k for k, (_, at) in self._results.items() if now - at >= self.expire]:
+                del self._results[stale]
+                self._progress.pop(self._make_progress_key(stale), None)
+                self._updated_props.pop(stale, None)
+
+    def call_job_fn(self, key, job_fn, args, context):
+        job = str(next(self._ids))
+        future = self._service.submit(job_fn(key, self._make_progress_key(key), args, context))
+        with self._lock:
+            self._jobs[job] = future
+        future.add_done_callback(functools.partial(self._forget_job, job))
+        return job
+
+    def _forget_job(self, job, future):
+        with self._lock:
+            if self._jobs.get(job) is future:
+                del self._jobs[job]
+
+    def terminate_job(self, job):
+        if job is None:
+            return
+        with self._lock:
+            future = self._jobs.pop(str(job), None)
+        if future is not None:
+            future.cancel()
+
+    def terminate_unhealthy_job(self, job):
+        return False
+
+    def job_running(self, job):
+        with self._lock:
+            future = self._jobs.get(str(job))
+        return future is not None and not future.done()
+
+    def get_progress(self, key):
+        with self._lock:
+            return self._progress.pop(self._make_progress_key(key), None)
+
+    def result_ready(self, key):
+        with self._lock:
+            return key in self._results
+
+    def get_result(self, key, job):
+        with self._lock:
+            entry = self._results.pop(key, None)
+            self._progress.pop(self._make_progress_key(key), None)
+        if entry is None:
+            return self.UNDEFINED
+        self.terminate_job(job)
+        return entry[0]
+
+    def get_updated_props(self, key):
+        with self._lock:
+            return self._updated_props.pop(key, {})
+
+    def clear_cache_entry(self, key):
+        with self._lock:
+            self._results.pop(key, None)
+
+    def stats(self):
+        """Return the number of running jobs and uncollected results."""
+        with self._lock:
+            return {
+                'running': sum(1 for future in self._jobs.values() if not future.done()),
+                'results': len(self._results),
+            }
+
@@ -0,0 +1,171 @@
+import threading
+import time
+from collections import OrderedDict
+
+from .player_stats import PlayerStats
+
+
+def normalize_key(key):
+    """Normalize a username or UUID into a cache key (lowercase, no dashes)."""
+    return key.strip().lower().replace('-', '')
+
+
+class _Entry:
+    __slots__ = ('data', 'stored_at', 'size', 'aliases')
+
+    def __init__(self, data, stored_at, size, aliases):
+        self.data = data
+        self.stored_at = stored_at
+        self.size = size
+        self.aliases = aliases
+
+
+class PlayerCache:
+    """
+    Bounded in-process cache of extracted player data.
+
+    Players are held as compact PlayerStats records and converted back to
+    the player_data dict format on read.
+
+    Entries are stored by UUID and can be looked up by UUID or by any
+    username they were fetched with (case-insensitive). Entries older than
+    ttl are expired; with a non-zero stale_ttl they are still served for
+    that extra window while the caller refreshes them in the background.
+    The least recently used entries are evicted once max_entries or
+    max_bytes is exceeded.
+    """
+
+    def __init__(self, ttl=300, max_entries=5000, max_bytes=64 * 1024 * 1024, stale_ttl=0):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.stale_ttl = stale_ttl
+
+        self._entries = OrderedDict()
+        self._aliases = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def stale_while_revalidate(self):
+        """Whether expired entries are served while being refreshed."""
+        return self.stale_ttl > 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, count=True):
+        """
+        Look up a player by username or UUID.
+
+        Returns (player_data, is_fresh), or None on a miss. A stale entry
+        (is_fresh False) is only returned in stale-while-revalidate mode.
+        count=False leaves the hit/miss counters alone, for a second probe
+        of a lookup already counted (e.g. by UUID after its name missed).
+        """
+        key = normalize_key(key)
+        now = time.monotonic()
+
+        with self._lock:
+            uuid = self._aliases.get(key, key)
+            entry = self._entries.get(uuid)
+            if entry is None:
+                self.misses += count
+                return None
+
+            age = now - entry.stored_at
+            if age >= self.ttl + self.stale_ttl:
+                self._remove(uuid)
+                self.expirations += 1
+                self.misses += count
+                return None
+
+            self._entries.move_to_end(uuid)
+            if age < self.ttl:
+                self.hits += count
+                return entry.data.to_dict(), True
+
+            self.stale_hits += count
+            return entry.data.to_dict(), False
+
+    def put(self, player_data, *aliases, age=0):
+        """
+        Store a player under its UUID, its display name and any extra aliases.
+
+        Names given with an earlier snapshot are dropped, and a name moves to
+        the latest player stored with it. age (seconds) backdates the entry,
+        e.g. when it is loaded from disk.
+        """
+        uuid = normalize_key(player_data['uuid'])
+        record = PlayerStats.from_dict(player_data)
+        names = {normalize_key(a) for a in aliases if a}
+        if record.displayname:
+            names.add(normalize_key(record.displayname))
+        names.discard(uuid)
+
+        with self._lock:
+            # The new names replace the old ones: after a rename the old
+            # name must stop resolving to this player
+            if uuid in self._entries:
+                self._remove(uuid)
+
+            entry = _Entry(record, time.monotonic() - age, record.nbytes(), names)
+            self._entries[uuid] = entry
+            self._bytes += entry.size
+            for name in names:
+                # A name now used by another player is no longer an alias of its previous owner
+                owner = self._aliases.get(name)
+                if owner is not None and owner != uuid and owner in self._entries:
+                    self._entries[owner].aliases.discard(name)
+                self._aliases[name] = uuid
+
+            self._evict()
+
+    def invalidate(self, key):
+        """Drop a player from the cache by username or UUID."""
+        key = normalize_key(key)
+        with self._lock:
+            uuid = self._aliases.get(key, key)
+            if uuid in self._entries:
+                self._remove(uuid)
+
+    def clear(self):
+        """Remove every entry (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._aliases.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """Return cache counters and current size."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'stale_hits': self.stale_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+            }
+
+    def _remove(self, uuid):
+        entry = self._entries.pop(uuid)
+        self._bytes -= entry.size
+        for name in entry.aliases:
+            if self._aliases.get(name) == uuid:
+                del self._aliases[name]
+
+    def _evict(self):
+        while self._entries and (
+            len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+        ):
+            uuid = next(iter(self._entries))
+            self._remove(uuid)
+            self.evictions += 1
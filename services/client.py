@@ -0,0 +1,220 @@
+import asyncio
+import threading
+import time
+
+import aiohttp
+import hypixel
+
+from config.settings import (
+    HYPIXEL_API_URL,
+    MOJANG_API_URL,
+    HTTP_TIMEOUT,
+    HTTP_POOL_SIZE,
+    HTTP_KEEPALIVE,
+    RATE_LIMIT,
+    RATE_LIMIT_WINDOW,
+)
+from .rate_limiter import RateLimiter
+
+
+def _endpoint(url):
+    """Metrics label of a request: the Mojang lookup, or the Hypixel API path."""
+    path = url.path
+    if path.startswith('/users/profiles/minecraft/'):
+        return 'mojang_uuid'
+    if path.startswith('/user/profile/'):
+        return 'mojang_name'
+    if path.rstrip('/') == '/profiles/minecraft':
+        return 'mojang_bulk'
+    return path.rsplit('/', 1)[-1] or 'unknown'
+
+
+class HypixelService:
+    """
+    Long-lived hypixel.py clients running on a dedicated event loop thread.
+
+    Dash serves callbacks from several worker threads; instead of each of them
+    creating a loop and an HTTP session per lookup, they all submit coroutines
+    to this single loop. One client (and its pooled aiohttp session) is kept
+    per API key so connections stay alive between lookups, and every Hypixel
+    request made with a key goes through that key's RateLimiter.
+
+    With a MetricsRegistry, the latency, status and concurrency of every HTTP
+    request of the clients' sessions (Hypixel and Mojang) are recorded in it.
+    """
+
+    def __init__(self, metrics=None):
+        self._loop = None
+        self._thread = None
+        self._clients = {}
+        self._limiters = {}
+        # API key -> opaque label used in stats (keys must not leak into metrics)
+        self._labels = {}
+        self._lock = threading.Lock()
+
+        self._trace_configs = []
+        if metrics is not None:
+            self._trace_configs.append(self._request_metrics(metrics))
+
+    @property
+    def loop(self):
+        """The background event loop, started on first use."""
+        self.start()
+        return self._loop
+
+    def start(self):
+        """Start the background loop thread if it is not already running."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(
+                target=self._run_loop,
+                name='hypixel-client-loop',
+                daemon=True,
+            )
+            self._thread.start()
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    def submit(self, coro):
+        """Schedule a coroutine on the background loop and return a concurrent Future."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro, timeout=None):
+        """Run a coroutine on the background loop and block until it completes."""
+        return self.submit(coro).result(timeout)
+
+    async def get_client(self, api_key):
+        """Return the shared client for an API key, creating it on first use."""
+        client = self._clients.get(api_key)
+        if client is not None and not client._session.closed:
+            return client
+
+        client = hypixel.Client(api_key, loop=self._loop, timeout=HTTP_TIMEOUT)
+        # Swap the default session for one with an explicit keep-alive pool.
+        # The client is registered before awaiting so concurrent callers share it.
+        default_session = client._session
+        client._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=HTTP_POOL_SIZE,
+                keepalive_timeout=HTTP_KEEPALIVE,
+                ttl_dns_cache=300,
+            ),
+            timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT),
+            trace_configs=self._trace_configs,
+        )
+        self._wrap_requests(client, self.rate_limiter(api_key))
+        self._clients[api_key] = client
+        await default_session.close()
+        return client
+
+    def rate_limiter(self, api_key):
+        """Return the rate limiter shared by every request made with an API key."""
+        limiter = self._limiters.get(api_key)
+        if limiter is None:
+            with self._lock:
+                limiter = self._limiters.get(api_key)
+                if limiter is None:
+                    self._labels[api_key] = f'key{len(self._labels) + 1}'
+                    limiter = self._limiters[api_key] = RateLimiter(limit=RATE_LIMIT, window=RATE_LIMIT_WINDOW)
+        return limiter
+
+    def rate_limit_stats(self):
+        """
+        Return the budget of every API key used so far, keyed by an opaque
+        label (key1, key2... in order of first use) rather than the key.
+        """
+        with self._lock:
+            limiters = [(self._labels[api_key], limiter) for api_key, limiter in self._limiters.items()]
+        return {label: limiter.stats() for label, limiter in limiters}
+
+    @staticmethod
+    def _request_metrics(metrics):
+        """aiohttp trace hooks recording each request, labelled by endpoint."""
+        duration = metrics.histogram(
+            'hypixel_api_request_duration_seconds',
+            'Time from sending an API request to its response headers',
+            ('endpoint',),
+        )
+        requests = metrics.counter(
+            'hypixel_api_requests_total',
+            'API requests by endpoint and HTTP status (exception name if none)',
+            ('endpoint', 'status'),
+        )
+        in_flight = metrics.gauge(
+            'hypixel_api_requests_in_flight',
+            'API requests waiting for a response',
+            ('endpoint',),
+        )
+
+        async def on_start(session, context, params):
+            context.endpoint = _endpoint(params.url)
+            context.start = time.perf_counter()
+            in_flight.labels(context.endpoint).inc()
+
+        def finish(context, status):
+            in_flight.labels(context.endpoint).dec()
+            duration.labels(context.endpoint).observe(time.perf_counter() - context.start)
+            requests.labels(context.endpoint, status).inc()
+
+        async def on_end(session, context, params):
+            finish(context, str(params.response.status))
+
+        async def on_exception(session, context, params):
+            finish(context, type(params.exception).__name__)
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(on_start)
+        trace_config.on_request_end.append(on_end)
+        trace_config.on_request_exception.append(on_exception)
+        trace_config.freeze()
+        return trace_config
+
+    @staticmethod
+    def _wrap_requests(client, limiter):
+        """
+        Send the client's requests to the configured API base URLs, and its
+        Hypixel requests (not Mojang ones) through a rate limiter.
+        """
+        async def _get_helper(path, params):
+            await limiter.acquire()
+            response = await client._session.get(f'{HYPIXEL_API_URL}/{path}', params=params)
+            limiter.update(response.status, response.headers)
+            return response
+
+        async def _get_uuid_helper(name):
+            return await client._session.get(f'{MOJANG_API_URL}/users/profiles/minecraft/{name}')
+
+        async def _get_name_helper(uuid):
+            return await client._session.get(f'{MOJANG_API_URL}/user/profile/{uuid}')
+
+        client._get_helper = _get_helper
+        client._get_uuid_helper = _get_uuid_helper
+        client._get_name_helper = _get_name_helper
+
+    async def _shutdown(self):
+        # Cancel background work (refreshes, watchlist) before closing sessions
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        clients, self._clients = list(self._clients.values()), {}
+        for client in clients:
+            await client.close()
+
+    def close(self):
+        """Close every HTTP session and stop the background loop."""
+        with self._lock:
+            if self._thread is None:
+                return
+            loop, thread = self._loop, self._thread
+            self._loop, self._thread = None, None
+
+        asyncio.run_coroutine_threadsafe(self._shutdown(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
@@ -0,0 +1,132 @@
+# Vectorized derived stats for many players x many modes
+#
+# The counters of every (player, mode) pair are packed into one
+# players x modes x counters matrix and every ratio is computed over the
+# whole matrix in one NumPy pass. Results match config.game_modes.compute_stats:
+# a divisor <= 0 gives 0 (as safe_divide), and ratios are rounded to 2
+# decimals exactly as Python's round() does.
+
+import numpy as np
+
+from config.stat_schema import MODE_FIELDS, get_storage_keys
+
+
+# Counter axis of the stat matrix
+COUNTERS = (
+    'wins', 'games', 'kills', 'deaths',
+    'final_kills', 'final_deaths', 'beds_broken', 'beds_lost',
+)
+COUNTER_INDEX = {name: i for i, name in enumerate(COUNTERS)}
+
+# Ratio -> (numerator, divisor); losses are games - wins
+RATIOS = {
+    'kdr': ('kills', 'deaths'),
+    'wlr': ('wins', 'losses'),
+    'fkdr': ('final_kills', 'final_deaths'),
+    'bblr': ('beds_broken', 'beds_lost'),
+}
+
+DERIVED = (*RATIOS, 'win_rate')
+
+_column_cache = {}
+
+
+def _columns(mode_ids):
+    """
+    Per game: (positions of its modes in mode_ids, modes x counters array of
+    columns into the game's storage keys). Counters a mode does not have
+    point at an extra all-zero column.
+    """
+    columns = _column_cache.get(mode_ids)
+    if columns is not None:
+        return columns
+
+    by_game = {}
+    for position, mode_id in enumerate(mode_ids):
+        fields = MODE_FIELDS.get(mode_id)
+        if fields is None:
+            continue  # e.g. 'combined': all zeros, like get_mode_stats
+        game, stat_keys = fields
+        keys = get_storage_keys(game)
+        index = {key: i for i, key in enumerate(keys)}
+        storage = dict(stat_keys)
+        row = [index[storage[name]] if name in storage else len(keys) for name in COUNTERS]
+        positions, rows = by_game.setdefault(game, ([], []))
+        positions.append(position)
+        rows.append(row)
+
+    columns = {
+        game: (positions, np.array(rows, dtype=np.intp))
+        for game, (positions, rows) in by_game.items()
+    }
+    _column_cache[mode_ids] = columns
+    return columns
+
+
+def stat_matrix(players, mode_ids):
+    """
+    Pack the mode counters of players (player_data dicts or PlayerStats
+    records) into an int64 array of shape (players, modes, COUNTERS).
+    Missing games and counters are 0.
+    """
+    mode_ids = tuple(mode_ids)
+    counts = np.zeros((len(players), len(mode_ids), len(COUNTERS)), dtype=np.int64)
+
+    for game, (positions, columns) in _columns(mode_ids).items():
+        keys = get_storage_keys(game)
+        # One row per player over the game's storage keys, plus a zero column
+        empty = [0] * len(keys)
+        values = []
+        for player in players:
+            if hasattr(player, 'games'):
+                # services.PlayerStats: the counters already use this layout
+                values.extend(player.games.get(game) or empty)
+            else:
+                stats = (player or {}).get('stats', {}).get(game) or {}
+                values.extend([stats.get(key, 0) for key in keys])
+            values.append(0)
+        table = np.array(values, dtype=np.int64).reshape(len(players), len(keys) + 1)
+        counts[:, positions, :] = table[:, columns]
+
+    return counts
+
+
+def _round2(values):
+    """Element-wise round(x, 2) with Python's semantics."""
+    scaled = values * 100
+    rounded = np.rint(scaled) / 100
+    # x * 100 is itself rounded, so it can land on the other side of a
+    # half; fall back to round() for the (rare) values close to a half
+    suspect = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if suspect.any():
+        rounded[suspect] = [round(x, 2) for x in values[suspect].tolist()]
+    return rounded
+
+
+def safe_divide(numerator, divisor):
+    """Vectorized game_modes.safe_divide: rounded ratio, 0 where divisor <= 0."""
+    quotient = np.zeros(np.broadcast(numerator, divisor).shape)
+    np.divide(numerator, divisor, out=quotient, where=divisor > 0)
+    return _round2(quotient)
+
+
+def compute_derived(counts):
+    """Return {name: players x modes float array} for every DERIVED stat."""
+    def counter(name):
+        if name == 'losses':
+            return counts[..., COUNTER_INDEX['games']] - counts[..., COUNTER_INDEX['wins']]
+        return counts[..., COUNTER_INDEX[name]]
+
+    derived = {
+        name: safe_divide(counter(numerator), counter(divisor))
+        for name, (numerator, divisor) in RATIOS.items()
+    }
+
+    games = counter('games')
+    derived['win_rate'] = np.where(games > 0, safe_divide(counter('wins'), games) * 100, 0.0)
+    return derived
+
+
+def derived_stats(players, mode_ids):
+    """KDR, WLR, FKDR, BBLR and win rate of every player in every mode."""
+    return compute_derived(stat_matrix(players, mode_ids))
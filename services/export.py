@@ -0,0 +1,225 @@
+from collections import defaultdict
+
+import numpy as np
+
+from config.stat_schema import MODE_FIELDS
+
+from .derived_stats import COUNTERS, DERIVED, compute_derived, stat_matrix
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+
+EXPORT_FORMATS = {
+    'parquet': ('application/vnd.apache.parquet', 'parquet'),
+    'arrow': ('application/vnd.apache.arrow.stream', 'arrows'),
+}
+
+# One row per snapshot and mode
+KEY_COLUMNS = ('uuid', 'displayname', 'fetched_at', 'game', 'mode')
+COLUMNS = KEY_COLUMNS + COUNTERS + ('winstreak',) + DERIVED
+
+# game -> mode ids of that game, and the winstreak storage key of each mode
+_GAME_MODES = defaultdict(list)
+_WINSTREAK_KEYS = {}
+for _mode_id, (_game, _stat_keys) in MODE_FIELDS.items():
+    _GAME_MODES[_game].append(_mode_id)
+    _WINSTREAK_KEYS[_mode_id] = dict(_stat_keys).get('winstreak')
+
+
+def require_pyarrow():
+    """Raise a clear error when the optional pyarrow dependency is missing."""
+    if pa is None:
+        raise RuntimeError('pyarrow is required for exports (pip install pyarrow)')
+
+
+def _schema(columns):
+    types = {
+        'uuid': pa.string(),
+        'displayname': pa.string(),
+        'fetched_at': pa.timestamp('ms', tz='UTC'),
+        'game': pa.string(),
+        'mode': pa.string(),
+        'winstreak': pa.int64(),
+        **{name: pa.int64() for name in COUNTERS},
+        **{name: pa.float64() for name in DERIVED},
+    }
+    return pa.schema([(name, types[name]) for name in columns])
+
+
+def validate_columns(columns):
+    """Return the requested columns in export order; raises ValueError on unknown ones."""
+    if not columns:
+        return list(COLUMNS)
+    unknown = [name for name in columns if name not in COLUMNS]
+    if unknown:
+        raise ValueError(f'Unknown export columns: {", ".join(unknown)}')
+    return list(dict.fromkeys(columns))
+
+
+def validate_modes(modes):
+    """Return the requested mode ids as a set, or None for all; raises ValueError on unknown ones."""
+    if not modes:
+        return None
+    if isinstance(modes, str):
+        modes = [modes]
+    unknown = [mode_id for mode_id in modes if mode_id not in MODE_FIELDS]
+    if unknown:
+        raise ValueError(f'Unknown export modes: {", ".join(unknown)}')
+    return frozenset(modes)
+
+
+def _snapshot_batches(snapshots, batch_size):
+    batch = []
+    for snapshot in snapshots:
+        batch.append(snapshot)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _game_columns(game, snapshots, names, mode_ids, columns):
+    """Columns of the rows of one game's snapshots: snapshots x modes."""
+    players = [{'stats': {game: stats}} for uuid, fetched_at, stats in snapshots]
+    counts = stat_matrix(players, mode_ids)
+    n_snapshots, n_modes = len(snapshots), len(mode_ids)
+
+    data = {}
+    if 'uuid' in columns:
+        data['uuid'] = np.repeat([uuid for uuid, fetched_at, stats in snapshots], n_modes)
+    if 'displayname' in columns:
+        data['displayname'] = np.repeat(
+            np.array([names.get(uuid) for uuid, fetched_at, stats in snapshots], dtype=object),
+            n_modes,
+        )
+    if 'fetched_at' in columns:
+        fetched = np.array([fetched_at for uuid, fetched_at, stats in snapshots]) * 1000
+        data['fetched_at'] = np.repeat(fetched.astype('int64'), n_modes)
+    if 'game' in columns:
+        data['game'] = np.full(n_snapshots * n_modes, game, dtype=object)
+    if 'mode' in columns:
+        data['mode'] = np.tile(np.array(mode_ids, dtype=object), n_snapshots)
+
+    for i, name in enumerate(COUNTERS):
+        if name in columns:
+            data[name] = counts[:, :, i].reshape(-1)
+
+    if 'winstreak' in columns:
+        winstreaks = np.zeros((n_snapshots, n_modes), dtype=np.int64)
+        for j, mode_id in enumerate(mode_ids):
+            key = _WINSTREAK_KEYS[mode_id]
+            if key:
+                winstreaks[:, j] = [stats.get(key, 0) for uuid, fetched_at, stats in snapshots]
+        data['winstreak'] = winstreaks.reshape(-1)
+
+    if any(name in columns for name in DERIVED):
+        derived = compute_derived(counts)
+        for name in DERIVED:
+            if name in columns:
+                data[name] = derived[name].reshape(-1)
+
+    return data
+
+
+def iter_record_batches(snapshots, lookup_names, columns=None, modes=None, batch_size=5000):
+    """
+    Turn a stream of (uuid, game, fetched_at, stats) snapshots into Arrow
+    record batches of one row per snapshot and mode, with the derived stats.
+
+    Snapshots are consumed batch_size at a time, so memory is bounded by
+    one batch whatever the number of rows. lookup_names maps a list of UUIDs
+    to {uuid: displayname}. columns projects the output (see COLUMNS) and
+    modes keeps only the given mode ids.
+    """
+    require_pyarrow()
+    columns = validate_columns(columns)
+    modes = validate_modes(modes)
+    schema = _schema(columns)
+
+    for batch in _snapshot_batches(snapshots, batch_size):
+        by_game = defaultdict(list)
+        for uuid, game, fetched_at, stats in batch:
+            by_game[game].append((uuid, fetched_at, stats))
+
+        names = {}
+        if 'displayname' in columns:
+            names = lookup_names(list({uuid for uuid, game, fetched_at, stats in batch}))
+        for game, game_snapshots in by_game.items():
+            mode_ids = [m for m in _GAME_MODES.get(game, ()) if modes is None or m in modes]
+            if not mode_ids:
+                continue
+            data = _game_columns(game, game_snapshots, names, mode_ids, columns)
+            yield pa.record_batch(
+                [pa.array(data[name], type=field.type) for name, field in zip(columns, schema)],
+                schema=schema,
+            )
+
+
+class _ChunkSink:
+    """Write-only file object handing written bytes back to a generator."""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def stream_export(batches, columns=None, fmt='parquet'):
+    """
+    Encode record batches as a Parquet file (one row group per batch) or an
+    Arrow IPC stream, yielding the bytes as each batch is written.
+    """
+    require_pyarrow()
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f'Unknown export format: {fmt}')
+
+    schema = _schema(validate_columns(columns))
+    sink = _ChunkSink()
+    if fmt == 'parquet':
+        writer = pq.ParquetWriter(sink, schema, compression='zstd')
+    else:
+        writer = pa.ipc.new_stream(sink, schema)
+
+    try:
+        for batch in batches:
+            writer.write_batch(batch)
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def export_to_file(path, batches, columns=None, fmt='parquet'):
+    """Write an export to a local file; returns the number of bytes written."""
+    size = 0
+    with open(path, 'wb') as f:
+        for chunk in stream_export(batches, columns, fmt):
+            f.write(chunk)
+            size += len(chunk)
+    return size
@@ -0,0 +1,262 @@
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from .cache import normalize_key
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    uuid TEXT NOT NULL,
+    game TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    stats TEXT NOT NULL,
+    is_keyframe INTEGER NOT NULL DEFAULT 1,
+    PRIMARY KEY (uuid, game, fetched_at)
+) WITHOUT ROWID;
+"""
+
+
+def _diff(previous, current):
+    """Counters that changed between two stats dicts, and the keys that were removed."""
+    changed = {
+        key: value for key, value in current.items()
+        if key not in previous or previous[key] != value
+    }
+    removed = sorted(previous.keys() - current.keys())
+    return {'set': changed, 'del': removed}
+
+
+def _apply(state, delta):
+    """Apply a delta produced by _diff to a stats dict in place."""
+    state.update(delta['set'])
+    for key in delta['del']:
+        state.pop(key, None)
+
+
+class HistoryStore:
+    """
+    Append-only time series of extracted stats, one row per player, game and fetch.
+
+    Most counters do not change between two polls, so rows are written as a
+    full keyframe every keyframe_interval snapshots and as sparse deltas
+    (changed counters only) in between. Rows are clustered on
+    (uuid, game, fetched_at): rebuilding any point in time is one index seek
+    to the previous keyframe plus at most keyframe_interval - 1 deltas.
+    keyframe_interval=1 stores full snapshots only.
+
+    The latest state of recently written series is kept in memory so
+    appends do not read back from disk.
+    """
+
+    def __init__(self, path, keyframe_interval=32, max_tracked=10000):
+        self.path = path
+        self.keyframe_interval = max(1, keyframe_interval)
+        self.max_tracked = max_tracked
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(_SCHEMA)
+        self._migrate()
+        self._lock = threading.Lock()
+
+        # (uuid, game) -> (latest stats, snapshots since last keyframe)
+        self._latest = OrderedDict()
+
+    def _migrate(self):
+        # Stores written before delta encoding only hold full snapshots
+        columns = [row[1] for row in self._conn.execute('PRAGMA table_info(snapshots)')]
+        if 'is_keyframe' not in columns:
+            with self._conn:
+                self._conn.execute(
+                    'ALTER TABLE snapshots ADD COLUMN is_keyframe INTEGER NOT NULL DEFAULT 1'
+                )
+
+    def append(self, player_data, fetched_at=None):
+        """Append one snapshot of every game in a player's stats."""
+        self.append_many([player_data], fetched_at=fetched_at)
+
+    def append_many(self, players, fetched_at=None):
+        """Append snapshots for several players in a single transaction."""
+        if fetched_at is None:
+            fetched_at = time.time()
+
+        with self._lock:
+            # A player listed twice shares one row: the last snapshot wins
+            snapshots = {}
+            for player_data in players:
+                uuid = normalize_key(player_data['uuid'])
+                for game, stats in player_data.get('stats', {}).items():
+                    snapshots[uuid, game] = stats
+            if not snapshots:
+                return
+
+            # Latest states of this batch, kept apart until the rows are committed
+            pending = {}
+            rows = [
+                self._encode(uuid, game, stats, fetched_at, pending)
+                for (uuid, game), stats in snapshots.items()
+            ]
+
+            with self._conn:
+                self._conn.executemany(
+                    'INSERT OR REPLACE INTO snapshots (uuid, game, fetched_at, stats, is_keyframe) '
+                    'VALUES (?, ?, ?, ?, ?)',
+                    rows,
+                )
+
+            # Only now that the rows are on disk can later deltas build on them
+            for series, latest in pending.items():
+                self._latest[series] = latest
+                self._latest.move_to_end(series)
+            while len(self._latest) > self.max_tracked:
+                self._latest.popitem(last=False)
+
+    def _encode(self, uuid, game, stats, fetched_at, pending):
+        """
+        Build the row for a new snapshot, as a keyframe or a delta, and record
+        the state it leaves the series in into pending.
+        """
+        series = (uuid, game)
+        latest = self._latest.get(series)
+        if latest is None:
+            latest = self._load_latest(uuid, game)
+
+        if latest is None or latest[1] + 1 >= self.keyframe_interval:
+            payload, is_keyframe, since_keyframe = stats, 1, 0
+        else:
+            payload, is_keyframe, since_keyframe = _diff(latest[0], stats), 0, latest[1] + 1
+
+        pending[series] = (dict(stats), since_keyframe)
+        return uuid, game, fetched_at, json.dumps(payload, separators=(',', ':')), is_keyframe
+
+    def _load_latest(self, uuid, game):
+        """Rebuild the newest state of a series from disk: (stats, snapshots since keyframe)."""
+        latest = None
+        for fetched_at, state, since_keyframe in self._replay(uuid, game, float('inf'), float('inf')):
+            latest = (state, since_keyframe)
+        if latest is None:
+            return None
+        return dict(latest[0]), latest[1]
+
+    def _keyframe_at(self, uuid, game, timestamp):
+        """
+        fetched_at of the last keyframe of a series at or before timestamp,
+        where replaying it must begin (timestamp itself if there is none).
+        """
+        keyframe = self._conn.execute(
+            'SELECT fetched_at FROM snapshots '
+            'WHERE uuid = ? AND game = ? AND is_keyframe = 1 AND fetched_at <= ? '
+            'ORDER BY fetched_at DESC LIMIT 1',
+            (uuid, game, timestamp),
+        ).fetchone()
+        return keyframe[0] if keyframe else timestamp
+
+    def _replay(self, uuid, game, start, end):
+        """
+        Yield (fetched_at, state, snapshots since keyframe) for every row from
+        the last keyframe at or before start up to end. The state dict is
+        updated in place between rows; copy it to keep it.
+        """
+        rows = self._conn.execute(
+            'SELECT fetched_at, stats, is_keyframe FROM snapshots '
+            'WHERE uuid = ? AND game = ? AND fetched_at BETWEEN ? AND ? '
+            'ORDER BY fetched_at',
+            (uuid, game, self._keyframe_at(uuid, game, start), end),
+        )
+
+        state = {}
+        since_keyframe = 0
+        for fetched_at, payload, is_keyframe in rows:
+            if is_keyframe:
+                state = json.loads(payload)
+                since_keyframe = 0
+            else:
+                _apply(state, json.loads(payload))
+                since_keyframe += 1
+            yield fetched_at, state, since_keyframe
+
+    def query(self, uuid, game, start=None, end=None):
+        """Return [(fetched_at, stats), ...] for a player and game, oldest first."""
+        start = float('-inf') if start is None else start
+        end = float('inf') if end is None else end
+
+        with self._lock:
+            return [
+                (fetched_at, dict(state))
+                for fetched_at, state, since_keyframe in self._replay(normalize_key(uuid), game, start, end)
+                if fetched_at >= start
+            ]
+
+    def state_at(self, uuid, game, timestamp):
+        """Return (fetched_at, stats) of the latest snapshot at or before timestamp, or None."""
+        latest = None
+        with self._lock:
+            for fetched_at, state, since_keyframe in self._replay(normalize_key(uuid), game, timestamp, timestamp):
+                latest = (fetched_at, state)
+        if latest is None:
+            return None
+        return latest[0], dict(latest[1])
+
+    def iter_snapshots(self, start=None, end=None, batch_size=5000):
+        """
+        Yield (uuid, game, fetched_at, stats) for every snapshot between start
+        and end, series by series, oldest first within a series. Each series
+        is read from its last keyframe at or before start, batch_size rows at
+        a time, with deltas replayed on the fly, so a narrow window only reads
+        its own rows and memory stays bounded however large the store is.
+        """
+        start = float('-inf') if start is None else start
+        end = float('inf') if end is None else end
+        series = ('', '')
+
+        while True:
+            with self._lock:
+                series = self._conn.execute(
+                    'SELECT uuid, game FROM snapshots WHERE (uuid, game) > (?, ?) '
+                    'ORDER BY uuid, game LIMIT 1',
+                    series,
+                ).fetchone()
+                if series is None:
+                    return
+                # Just below the keyframe, so that the first batch includes it
+                last = math.nextafter(self._keyframe_at(*series, start), float('-inf'))
+
+            state = {}
+            while True:
+                with self._lock:
+                    rows = self._conn.execute(
+                        'SELECT fetched_at, stats, is_keyframe FROM snapshots '
+                        'WHERE uuid = ? AND game = ? AND fetched_at > ? AND fetched_at <= ? '
+                        'ORDER BY fetched_at LIMIT ?',
+                        (*series, last, end, batch_size),
+                    ).fetchall()
+
+                for fetched_at, payload, is_keyframe in rows:
+                    if is_keyframe:
+                        state = json.loads(payload)
+                    else:
+                        _apply(state, json.loads(payload))
+                    if fetched_at >= start:
+                        yield series[0], series[1], fetched_at, dict(state)
+
+                if len(rows) < batch_size:
+                    break
+                last = rows[-1][0]
+
+    def count(self):
+        """Total number of stored snapshots."""
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM snapshots').fetchone()[0]
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,249 @@
+import math
+import random
+import threading
+
+from .cache import normalize_key
+from .leaderboard_metrics import LEADERBOARD_METRICS, metric_value
+
+
+class _Node:
+    __slots__ = ('key', 'next', 'width')
+
+    def __init__(self, key, levels):
+        self.key = key
+        self.next = [None] * levels
+        self.width = [1] * levels
+
+
+# Sorts after every (-value, uuid) key
+_END = (math.inf,)
+
+
+class OrderedIndex:
+    """
+    Indexable skip list of unique, sortable keys.
+
+    Each link stores how many entries it skips, so insert, remove, rank and
+    select all run in O(log n) expected time, and iterating the first k
+    keys is O(k).
+    """
+
+    def __init__(self, max_levels=24, seed=None):
+        self.max_levels = max_levels
+        self._random = random.Random(seed)
+        self._tail = _Node(_END, 0)
+        self._head = _Node(None, max_levels)
+        self._head.next = [self._tail] * max_levels
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def _level(self):
+        # Geometric: each extra level with probability 1/2
+        return min(self.max_levels, 1 - int(math.log(1.0 - self._random.random(), 2.0)))
+
+    def insert(self, key):
+        """Insert a key that is not already present."""
+        chain = [None] * self.max_levels
+        steps_at_level = [0] * self.max_levels
+        node = self._head
+        for level in reversed(range(self.max_levels)):
+            while node.next[level].key < key:
+                steps_at_level[level] += node.width[level]
+                node = node.next[level]
+            chain[level] = node
+
+        levels = self._level()
+        new = _Node(key, levels)
+        steps = 0
+        for level in range(levels):
+            previous = chain[level]
+            new.next[level] = previous.next[level]
+            previous.next[level] = new
+            new.width[level] = previous.width[level] - steps
+            previous.width[level] = steps + 1
+            steps += steps_at_level[level]
+        for level in range(levels, self.max_levels):
+            chain[level].width[level] += 1
+        self._size += 1
+
+    def remove(self, key):
+        """Remove a key; raises KeyError if it is missing."""
+        chain = [None] * self.max_levels
+        node = self._head
+        for level in reversed(range(self.max_levels)):
+            while node.next[level].key < key:
+                node = node.next[level]
+            chain[level] = node
+
+        target = chain[0].next[0]
+        if target.key != key:
+            raise KeyError(key)
+
+        levels = len(target.next)
+        for level in range(levels):
+            previous = chain[level]
+            previous.width[level] += target.width[level] - 1
+            previous.next[level] = target.next[level]
+        for level in range(levels, self.max_levels):
+            chain[level].width[level] -= 1
+        self._size -= 1
+
+    def rank(self, key):
+        """0-based position of a key; raises KeyError if it is missing."""
+        position = 0
+        node = self._head
+        for level in reversed(range(self.max_levels)):
+            while node.next[level].key < key:
+                position += node.width[level]
+                node = node.next[level]
+        if node.next[0].key != key:
+            raise KeyError(key)
+        return position
+
+    def select(self, index):
+        """Key at a 0-based position."""
+        if not 0 <= index < self._size:
+            raise IndexError(index)
+        node = self._head
+        remaining = index + 1
+        for level in reversed(range(self.max_levels)):
+            while node.width[level] <= remaining:
+                remaining -= node.width[level]
+                node = node.next[level]
+        return node.key
+
+    def first(self, count):
+        """The first count keys, in order."""
+        keys = []
+        node = self._head.next[0]
+        while node is not self._tail and len(keys) < count:
+            keys.append(node.key)
+            node = node.next[0]
+        return keys
+
+
+class Leaderboard:
+    """
+    Live leaderboards over every player fed to update().
+
+    One OrderedIndex per active metric (see leaderboard_metrics) keeps the
+    players sorted by value, highest first, ties broken by UUID. Updating a
+    player costs O(log n) per metric whose value changed; top-K is O(log n + K)
+    and a player's rank O(log n). Metrics are activated up front or on first
+    use through add_metric, which indexes an initial set of players.
+    Players without stats for a metric's game are not ranked on it.
+    """
+
+    def __init__(self, metrics=()):
+        self._indexes = {}
+        self._values = {}
+        self._names = {}
+        self._lock = threading.Lock()
+
+        self.updates = 0
+        self.moves = 0
+
+        for metric_id in metrics:
+            self.add_metric(metric_id)
+
+    def metrics(self):
+        """Ids of the active metrics."""
+        with self._lock:
+            return list(self._indexes)
+
+    def add_metric(self, metric_id, players=()):
+        """Activate a metric and index the given players on it."""
+        if metric_id not in LEADERBOARD_METRICS:
+            raise KeyError(f'Unknown leaderboard metric: {metric_id}')
+
+        with self._lock:
+            if metric_id in self._indexes:
+                return
+            self._indexes[metric_id] = OrderedIndex()
+            self._values[metric_id] = {}
+            for player_data in players:
+                self._update(player_data, (metric_id,))
+
+    def update(self, player_data):
+        """Index a player's latest snapshot on every active metric."""
+        self.update_many([player_data])
+
+    def update_many(self, players):
+        """Index several players' latest snapshots."""
+        with self._lock:
+            metric_ids = tuple(self._indexes)
+            for player_data in players:
+                self._update(player_data, metric_ids)
+                self.updates += 1
+
+    def _update(self, player_data, metric_ids):
+        uuid = normalize_key(player_data['uuid'])
+        if player_data.get('displayname'):
+            self._names[uuid] = player_data['displayname']
+
+        for metric_id in metric_ids:
+            values = self._values[metric_id]
+            index = self._indexes[metric_id]
+            value = metric_value(player_data, metric_id)
+            previous = values.get(uuid)
+            if previous == value:
+                continue
+
+            if previous is not None:
+                index.remove((-previous, uuid))
+            if value is None:
+                del values[uuid]
+            else:
+                index.insert((-value, uuid))
+                values[uuid] = value
+            self.moves += 1
+
+    def remove(self, uuid):
+        """Drop a player from every leaderboard."""
+        uuid = normalize_key(uuid)
+        with self._lock:
+            for metric_id, values in self._values.items():
+                value = values.pop(uuid, None)
+                if value is not None:
+                    self._indexes[metric_id].remove((-value, uuid))
+            self._names.pop(uuid, None)
+
+    def top(self, metric_id, count=50):
+        """[{'rank', 'uuid', 'displayname', 'value'}] of the best players on a metric."""
+        with self._lock:
+            keys = self._indexes[metric_id].first(count)
+            return [
+                {
+                    'rank': position + 1,
+                    'uuid': uuid,
+                    'displayname': self._names.get(uuid),
+                    'value': -negated,
+                }
+                for position, (negated, uuid) in enumerate(keys)
+            ]
+
+    def rank(self, metric_id, uuid):
+        """1-based rank of a player on a metric, or None if not ranked."""
+        uuid = normalize_key(uuid)
+        with self._lock:
+            value = self._values[metric_id].get(uuid)
+            if value is None:
+                return None
+            return self._indexes[metric_id].rank((-value, uuid)) + 1
+
+    def size(self, metric_id):
+        """Number of players ranked on a metric."""
+        with self._lock:
+            return len(self._indexes[metric_id])
+
+    def stats(self):
+        """Active metrics, ranked players and update counters."""
+        with self._lock:
+            return {
+                'metrics': len(self._indexes),
+                'players': len(self._names),
+                'updates': self.updates,
+                'moves': self.moves,
+            }
@@ -0,0 +1,68 @@
+# Leaderboard metrics, derived from the mode definitions
+#
+# Every mode of GAME_MODES (except the combined view) gets one metric per
+# stat it stores plus its derived ratios, with ids '<mode_id>.<stat>', e.g.
+# 'bedwars_overall.fkdr' or 'duel_sumo.winstreak'. Ratios use safe_divide
+# so values match the stat cards.
+
+from config.game_modes import GAME_MODES, safe_divide
+from config.stat_schema import MODE_FIELDS
+
+from .derived_stats import RATIOS
+
+
+def _counter(storage_key):
+    return lambda stats: stats.get(storage_key, 0)
+
+
+def _ratio(numerator, divisor):
+    return lambda stats: safe_divide(numerator(stats), divisor(stats))
+
+
+def _win_rate(wins, games):
+    def get(stats):
+        played = games(stats)
+        return safe_divide(wins(stats), played) * 100 if played > 0 else 0
+    return get
+
+
+def _mode_metrics(mode_id):
+    """{stat: getter on the game's stats dict} for one mode."""
+    game, stat_keys = MODE_FIELDS[mode_id]
+    counters = {stat: _counter(storage_key) for stat, storage_key in stat_keys}
+    metrics = dict(counters)
+
+    if 'wins' in counters and 'games' in counters:
+        wins, games = counters['wins'], counters['games']
+        counters['losses'] = lambda stats: games(stats) - wins(stats)
+        metrics['win_rate'] = _win_rate(wins, games)
+
+    for name, (numerator, divisor) in RATIOS.items():
+        if numerator in counters and divisor in counters:
+            metrics[name] = _ratio(counters[numerator], counters[divisor])
+
+    return game, metrics
+
+
+def _build_metrics():
+    metrics = {}
+    for mode_id, mode_config in GAME_MODES.items():
+        if mode_config.get('is_combined') or mode_id not in MODE_FIELDS:
+            continue
+        game, getters = _mode_metrics(mode_id)
+        for stat, get in getters.items():
+            metrics[f'{mode_id}.{stat}'] = (game, get)
+    return metrics
+
+
+# metric id -> (game, getter on player_data['stats'][game])
+LEADERBOARD_METRICS = _build_metrics()
+
+
+def metric_value(player_data, metric_id):
+    """Value of a metric for a player, or None when the player has no stats for its game."""
+    game, get = LEADERBOARD_METRICS[metric_id]
+    stats = (player_data.get('stats') or {}).get(game)
+    if stats is None:
+        return None
+    return get(stats)
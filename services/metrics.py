@@ -0,0 +1,313 @@
+import bisect
+import functools
+import inspect
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+
+
+# Latency buckets (seconds), from a cache hit to a request near the HTTP timeout
+DEFAULT_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+
+def _format_value(value):
+    if value == math.inf:
+        return '+Inf'
+    if value == -math.inf:
+        return '-Inf'
+    if value != value:
+        return 'NaN'
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(pairs):
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _header(lines, name, kind, documentation):
+    lines.append(f'# HELP {name} {documentation}')
+    lines.append(f'# TYPE {name} {kind}')
+
+
+class _Value:
+    """One counter or gauge time series."""
+
+    __slots__ = ('_value', '_lock')
+
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount=1):
+        with self._lock:
+            self._value -= amount
+
+    def set(self, value):
+        with self._lock:
+            self._value = value
+
+    def get(self):
+        return self._value
+
+
+class _Buckets:
+    """One histogram time series: per-bucket counts, cumulated when rendered."""
+
+    __slots__ = ('_bounds', '_counts', '_sum', '_lock')
+
+    def __init__(self, bounds):
+        self._bounds = bounds
+        self._counts = [0] * (len(bounds) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect.bisect_left(self._bounds, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    def snapshot(self):
+        with self._lock:
+            return list(self._counts), self._sum
+
+
+class _Metric(ABC):
+    """A named metric: one time series per combination of label values."""
+
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+
+    @abstractmethod
+    def _new_child(self):
+        """A new time series (_Value or _Buckets) for one combination of label values."""
+
+    @abstractmethod
+    def render(self, lines):
+        """Append the metric in the Prometheus text format to lines."""
+
+    def labels(self, *values):
+        """The time series of one combination of label values, created on first use."""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f'{self.name} expects labels {self.labelnames}, got {values}')
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def _series(self):
+        with self._lock:
+            return list(self._children.items())
+
+
+class _Scalar(_Metric):
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount=1):
+        self.labels().inc(amount)
+
+    def render(self, lines):
+        _header(lines, self.name, self.kind, self.documentation)
+        for values, child in self._series():
+            lines.append(f'{self.name}{_labels(list(zip(self.labelnames, values)))} {_format_value(child.get())}')
+
+
+class Counter(_Scalar):
+    """Monotonic count; without labels the metric is its own time series."""
+
+    kind = 'counter'
+
+
+class Gauge(_Scalar):
+    """Value that goes up and down, e.g. work in flight."""
+
+    kind = 'gauge'
+
+    def dec(self, amount=1):
+        self.labels().dec(amount)
+
+    def set(self, value):
+        self.labels().set(value)
+
+
+class Histogram(_Metric):
+    """Distribution of observed values (latencies) over fixed buckets."""
+
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _Buckets(self.buckets)
+
+    def observe(self, value):
+        self.labels().observe(value)
+
+    def render(self, lines):
+        _header(lines, self.name, self.kind, self.documentation)
+        for values, child in self._series():
+            pairs = list(zip(self.labelnames, values))
+            counts, total = child.snapshot()
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                lines.append(
+                    f'{self.name}_bucket{_labels(pairs + [("le", _format_value(bound))])} {cumulative}'
+                )
+            lines.append(f'{self.name}_sum{_labels(pairs)} {_format_value(total)}')
+            lines.append(f'{self.name}_count{_labels(pairs)} {cumulative}')
+
+
+class MetricsRegistry:
+    """
+    Metrics rendered in the Prometheus text exposition format.
+
+    Counters, gauges and histograms are updated inline: one uncontended lock
+    and, for histograms, a bisect per update, so instrumentation can stay on.
+    Components that already keep their own counters (caches, rate limiters)
+    are read through add_stats on each scrape instead.
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self._stats = []
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f'Metric already registered: {metric.name}')
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def add_stats(self, prefix, documentation, stats, counters=(), label=None):
+        """
+        Export a stats() dict on every scrape: each numeric entry becomes the
+        gauge prefix_<key>, or the counter prefix_<key>_total for the keys in
+        counters. With label, stats returns {label value: stats dict}, e.g.
+        one per API key. stats may return None when there is nothing to report.
+        """
+        with self._lock:
+            self._stats.append((prefix, documentation, stats, frozenset(counters), label))
+
+    def _render_stats(self, lines, prefix, documentation, stats, counters, label):
+        try:
+            result = stats()
+        except Exception:
+            # A broken collector must not take the other metrics down
+            return
+        if not result:
+            return
+        groups = result.items() if label else [(None, result)]
+
+        series = {}
+        for label_value, values in groups:
+            pairs = [(label, label_value)] if label else []
+            for key, value in values.items():
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                series.setdefault(key, []).append((pairs, value))
+
+        for key, samples in series.items():
+            is_counter = key in counters
+            name = f'{prefix}_{key}_total' if is_counter else f'{prefix}_{key}'
+            _header(lines, name, 'counter' if is_counter else 'gauge', f'{documentation}: {key}')
+            for pairs, value in samples:
+                lines.append(f'{name}{_labels(pairs)} {_format_value(value)}')
+
+    def render(self):
+        """All metrics in the Prometheus text format (version 0.0.4)."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+            stats = list(self._stats)
+
+        lines = []
+        for metric in metrics:
+            metric.render(lines)
+        for entry in stats:
+            self._render_stats(lines, *entry)
+        return '\n'.join(lines) + '\n'
+
+
+def instrument(name, duration, in_flight, errors, ignore=()):
+    """
+    Decorator timing a function into duration{name}, counting its running
+    calls in in_flight{name} and its exceptions in errors{name, type}
+    (except those in ignore, e.g. control-flow exceptions).
+
+    When the function returns an awaitable (a coroutine to run elsewhere),
+    the awaitable is timed too, from the call until it completes.
+    """
+    timer = duration.labels(name)
+    running = in_flight.labels(name)
+
+    def count_error(e):
+        if not isinstance(e, ignore):
+            errors.labels(name, type(e).__name__).inc()
+
+    def decorator(func):
+        async def finish(awaitable, start):
+            running.inc()
+            try:
+                return await awaitable
+            except Exception as e:
+                count_error(e)
+                raise
+            finally:
+                running.dec()
+                timer.observe(time.perf_counter() - start)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            running.inc()
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                count_error(e)
+                timer.observe(time.perf_counter() - start)
+                raise
+            finally:
+                running.dec()
+            if inspect.isawaitable(result):
+                return finish(result, start)
+            timer.observe(time.perf_counter() - start)
+            return result
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,95 @@
+import json
+import sys
+from array import array
+
+from config.stat_schema import STAT_SCHEMA, get_storage_keys
+
+
+# Shared key tables: one fixed counter layout per game, built from the schema
+KEY_TABLES = {game: tuple(get_storage_keys(game)) for game in STAT_SCHEMA}
+KEY_INDEX = {
+    game: {key: i for i, key in enumerate(keys)}
+    for game, keys in KEY_TABLES.items()
+}
+
+# Signed 64-bit counters
+_TYPECODE = 'q'
+
+
+class PlayerStats:
+    """
+    Compact player record: one fixed-layout integer array per game.
+
+    Counter names live once in KEY_TABLES instead of in every player's
+    dicts, and values are packed machine integers instead of int objects.
+    Values that do not fit the layout (unknown keys, non-integers) are kept
+    in a small extra dict so conversion back to the dict format is lossless;
+    layout counters missing from the source dict read back as 0.
+    """
+
+    __slots__ = ('uuid', 'displayname', 'games', 'extra')
+
+    def __init__(self, uuid, displayname, games, extra=None):
+        self.uuid = uuid
+        self.displayname = displayname
+        self.games = games
+        self.extra = extra
+
+    @classmethod
+    def from_dict(cls, player_data):
+        """Build a record from the player_data dict format."""
+        games = {}
+        extra = None
+        for game, stats in player_data.get('stats', {}).items():
+            index = KEY_INDEX.get(game)
+            if index is None:
+                extra = extra or {}
+                extra[game] = dict(stats)
+                continue
+
+            values = array(_TYPECODE, bytes(8 * len(index)))
+            for key, value in stats.items():
+                i = index.get(key)
+                if i is not None and type(value) is int:
+                    values[i] = value
+                else:
+                    extra = extra or {}
+                    extra.setdefault(game, {})[key] = value
+            games[game] = values
+
+        return cls(player_data.get('uuid'), player_data.get('displayname'), games, extra)
+
+    def to_dict(self):
+        """Convert back to the player_data dict format."""
+        stats = {}
+        for game, values in self.games.items():
+            stats[game] = dict(zip(KEY_TABLES[game], values))
+        if self.extra:
+            for game, values in self.extra.items():
+                stats.setdefault(game, {}).update(values)
+
+        return {
+            'uuid': self.uuid,
+            'displayname': self.displayname,
+            'stats': stats,
+        }
+
+    def get(self, game, key, default=0):
+        """Read a single counter without converting the record."""
+        if self.extra and key in self.extra.get(game, {}):
+            return self.extra[game][key]
+        values = self.games.get(game)
+        i = KEY_INDEX.get(game, {}).get(key)
+        if values is not None and i is not None:
+            return values[i]
+        return default
+
+    def nbytes(self):
+        """Approximate memory used by the record, in bytes."""
+        size = sys.getsizeof(self) + sys.getsizeof(self.games)
+        size += sum(sys.getsizeof(values) for values in self.games.values())
+        size += sys.getsizeof(self.uuid) + sys.getsizeof(self.displayname)
+        if self.extra:
+            # Rough: extra values are rare and small
+            size += len(json.dumps(self.extra, default=str)) * 4
+        return size
@@ -0,0 +1,142 @@
+import asyncio
+import time
+
+
+def _header_number(headers, name):
+    """Read a numeric header, returning None when absent or malformed."""
+    value = headers.get(name)
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+class RateLimiter:
+    """
+    Token bucket shared by every request made with one Hypixel API key.
+
+    The bucket holds up to limit tokens and refills at limit / window tokens
+    per second. Callers wait in FIFO order (asyncio.Lock is fair) instead of
+    failing, so bursts are spread out at the allowed ceiling. The bucket is
+    corrected from the RateLimit-* headers returned by the API: it never holds
+    more than the remaining budget, and it is full again when the API's
+    window resets (RateLimit-Reset). A 429 or an exhausted budget blocks
+    everyone until that reset.
+
+    Must be used from a single event loop (the shared client loop).
+    """
+
+    def __init__(self, limit=300, window=300):
+        self.limit = limit
+        self.window = window
+
+        self._tokens = float(limit)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        # When the API's current window ends and its whole budget is back
+        self._reset_at = None
+        self._lock = asyncio.Lock()
+
+        self.waiting = 0
+        self.acquired = 0
+        self.throttled = 0
+        self.total_wait = 0.0
+
+    @property
+    def rate(self):
+        """Tokens added per second."""
+        return self.limit / self.window
+
+    def _available(self, now):
+        """Tokens in the bucket at time now, without modifying it."""
+        if self._reset_at is not None and now >= self._reset_at:
+            return float(self.limit)
+        elapsed = max(0.0, now - self._updated)
+        return min(float(self.limit), self._tokens + elapsed * self.rate)
+
+    def _refill(self, now):
+        self._tokens = self._available(now)
+        self._updated = now
+        if self._reset_at is not None and now >= self._reset_at:
+            self._reset_at = None
+
+    def _delay(self, now):
+        """Seconds until a token can be taken (0 if one is available now)."""
+        if now < self._blocked_until:
+            return self._blocked_until - now
+        tokens = self._available(now)
+        if tokens >= 1:
+            return 0.0
+        delay = (1 - tokens) / self.rate
+        if self._reset_at is not None:
+            delay = min(delay, self._reset_at - now)
+        return delay
+
+    async def acquire(self):
+        """Wait for a token, queueing behind earlier callers."""
+        start = time.monotonic()
+        self.waiting += 1
+        try:
+            async with self._lock:
+                while True:
+                    delay = self._delay(time.monotonic())
+                    if delay <= 0:
+                        break
+                    await asyncio.sleep(delay)
+                self._refill(time.monotonic())
+                self._tokens -= 1
+                self.acquired += 1
+        finally:
+            self.waiting -= 1
+            self.total_wait += time.monotonic() - start
+
+    def update(self, status, headers):
+        """Adjust the bucket from an API response's status and rate-limit headers."""
+        now = time.monotonic()
+        self._refill(now)
+
+        limit = _header_number(headers, 'RateLimit-Limit')
+        remaining = _header_number(headers, 'RateLimit-Remaining')
+        reset = _header_number(headers, 'RateLimit-Reset')
+
+        if limit:
+            self.limit = int(limit)
+        if remaining is not None:
+            self._tokens = min(self._tokens, remaining)
+        if reset:
+            self._reset_at = now + reset
+
+        if status == 429:
+            self.throttled += 1
+            retry_after = _header_number(headers, 'Retry-After') or reset or 1
+            self._tokens = 0.0
+            self._reset_at = now + retry_after
+            self._blocked_until = max(self._blocked_until, now + retry_after)
+        elif remaining is not None and remaining < 1 and reset:
+            self._blocked_until = max(self._blocked_until, now + reset)
+
+    def wait_time(self):
+        """Seconds a new caller would wait, ignoring callers already queued."""
+        return self._delay(time.monotonic())
+
+    def remaining(self):
+        """Requests that can be made right now."""
+        now = time.monotonic()
+        if now < self._blocked_until:
+            return 0
+        return int(self._available(now))
+
+    def stats(self):
+        """Return the current budget and counters."""
+        return {
+            'limit': self.limit,
+            'window': self.window,
+            'remaining': self.remaining(),
+            'wait_time': round(self.wait_time(), 3),
+            'waiting': self.waiting,
+            'acquired': self.acquired,
+            'throttled': self.throttled,
+            'total_wait': round(self.total_wait, 3),
+        }
@@ -0,0 +1,72 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+
+def content_key(data):
+    """Stable hash of JSON-serializable data (key order matters)."""
+    payload = json.dumps(data, separators=(',', ':'), default=str)
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class RenderCache:
+    """
+    Memoizes rendered output (figures, card trees) by (data key, mode id).
+
+    The data key identifies the content rendered, e.g. a content hash of
+    the player data. Output is only built when a mode is first displayed
+    for that content; the least recently used entries are evicted past
+    max_entries. Building happens outside the lock, so two threads asking
+    for the same new entry at once may both build it. Cached output is
+    shared between callers and must not be mutated.
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, data_key, mode_id, build):
+        """Return the entry for (data_key, mode_id), calling build() on a miss."""
+        key = (data_key, mode_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        entry = build()
+
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return entry
+
+    def clear(self):
+        """Drop every memoized entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Return hit/miss/eviction counters and the current size."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+            }
@@ -0,0 +1,122 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from .cache import normalize_key
+
+
+_UUID_RE = re.compile(r'^[0-9a-f]{32}$')
+
+# Sentinel returned by NameResolver.lookup for names known not to exist
+NOT_FOUND = object()
+
+
+def is_uuid(key):
+    """Whether a player id is a UUID (with or without dashes) rather than a username."""
+    return bool(_UUID_RE.match(normalize_key(key)))
+
+
+class NameResolver:
+    """
+    Username -> UUID cache with negative entries and bulk resolution.
+
+    Positive entries live for ttl seconds (names can change owner after a
+    rename); "player not found" answers are cached for negative_ttl so
+    mistyped names do not hit the Mojang API on every fetch.
+    """
+
+    def __init__(self, ttl=86400, negative_ttl=300, max_entries=50000):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+
+        # name -> (uuid or NOT_FOUND, expires_at)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+
+    def lookup(self, name):
+        """Return the cached UUID for a name, NOT_FOUND, or None if unknown."""
+        key = normalize_key(name)
+        if _UUID_RE.match(key):
+            return key
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            if entry[0] is NOT_FOUND:
+                self.negative_hits += 1
+            else:
+                self.hits += 1
+            return entry[0]
+
+    def remember(self, name, uuid):
+        """Cache a resolved name."""
+        self._set(name, normalize_key(uuid), self.ttl)
+
+    def remember_missing(self, name):
+        """Cache a "player not found" answer for a name."""
+        self._set(name, NOT_FOUND, self.negative_ttl)
+
+    async def resolve_many(self, names, fetch_uuids):
+        """
+        Resolve several names at once.
+
+        Cached names are answered locally; the others are passed in one call
+        to fetch_uuids, a coroutine function taking a list of names and
+        returning {normalize_key(name): uuid}, with None as the uuid of names
+        that do not exist. Names it leaves out (lookup failed) are not
+        cached. Returns {name: uuid, NOT_FOUND or None} for every input name.
+        """
+        resolved = {}
+        unknown = []
+        for name in names:
+            uuid = self.lookup(name)
+            if uuid is None:
+                unknown.append(name)
+            else:
+                resolved[name] = uuid
+
+        if unknown:
+            distinct = {normalize_key(name): name for name in unknown}
+            found = await fetch_uuids(list(distinct.values()))
+            for name in unknown:
+                key = normalize_key(name)
+                if key not in found:
+                    resolved[name] = None
+                elif found[key]:
+                    self.remember(name, found[key])
+                    resolved[name] = normalize_key(found[key])
+                else:
+                    self.remember_missing(name)
+                    resolved[name] = NOT_FOUND
+
+        return resolved
+
+    def stats(self):
+        """Return resolver counters and current size."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'negative_hits': self.negative_hits,
+                'misses': self.misses,
+                'entries': len(self._entries),
+            }
+
+    def _set(self, name, value, ttl):
+        key = normalize_key(name)
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
@@ -0,0 +1,74 @@
+import secrets
+import threading
+import time
+from collections import OrderedDict
+
+
+class ResultStore:
+    """
+    Server-side store of fetch results, keyed by a random result id.
+
+    The browser only keeps the id (in a dcc.Store) and callbacks look the
+    data up here, so results are not shipped back and forth on every
+    callback. Results expire after ttl seconds without being read and the
+    least recently used ones are evicted past max_entries; callers must
+    handle get() returning None.
+    """
+
+    def __init__(self, ttl=3600, max_entries=1000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def put(self, data):
+        """Store a result and return its id."""
+        result_id = secrets.token_urlsafe(16)
+        with self._lock:
+            self._entries[result_id] = (data, time.monotonic())
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return result_id
+
+    def get(self, result_id):
+        """Return a stored result, or None if unknown or expired."""
+        with self._lock:
+            entry = self._entries.get(result_id)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            data, used_at = entry
+            now = time.monotonic()
+            if now - used_at >= self.ttl:
+                del self._entries[result_id]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            # Reading a result keeps it alive
+            self._entries[result_id] = (data, now)
+            self._entries.move_to_end(result_id)
+            self.hits += 1
+            return data
+
+    def stats(self):
+        """Return hit/miss counters and the number of stored results."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'entries': len(self._entries),
+            }
@@ -0,0 +1,182 @@
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+
+
+class RefreshScheduler:
+    """
+    Keeps a watchlist of players fresh in the background.
+
+    Players sit in a priority queue ordered by when they become stale
+    (last fetch + interval), so the stalest player is always refreshed
+    first. Each cycle refreshes up to batch_size due players through the
+    refresh coroutine function, which takes a list of player ids and
+    returns a list of (player_data, error) in the same order.
+
+    When a rate limiter is given, the scheduler only spends budget_share of
+    the key's budget and leaves the rest for interactive lookups.
+    Players can be added from any thread; run() must be awaited on the
+    shared client loop.
+    """
+
+    def __init__(self, refresh, interval=600, batch_size=10, limiter=None, budget_share=0.5):
+        self.refresh = refresh
+        self.interval = interval
+        self.batch_size = batch_size
+        self.limiter = limiter
+        self.budget_share = budget_share
+
+        # (due_at, seq, player_id); superseded entries are skipped lazily
+        self._heap = []
+        self._due = {}
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._task = None
+
+        self.cycles = 0
+        self.refreshed = 0
+        self.errors = 0
+        self.last_cycle_size = 0
+        self.last_cycle_seconds = 0.0
+
+    def add(self, player_ids, last_fetched=None):
+        """
+        Watch players. last_fetched optionally maps player ids to the Unix
+        time of their latest snapshot; players without one are due now.
+        """
+        last_fetched = last_fetched or {}
+        now = time.time()
+        with self._lock:
+            for player_id in player_ids:
+                fetched_at = last_fetched.get(player_id)
+                due_at = fetched_at + self.interval if fetched_at else now
+                self._push(player_id, due_at)
+
+    def remove(self, player_id):
+        """Stop watching a player."""
+        with self._lock:
+            self._due.pop(player_id, None)
+
+    def watched(self):
+        """Player ids currently on the watchlist."""
+        with self._lock:
+            return list(self._due)
+
+    def _push(self, player_id, due_at):
+        self._due[player_id] = due_at
+        heapq.heappush(self._heap, (due_at, next(self._seq), player_id))
+
+    def _pop_due(self, now):
+        """Pop up to batch_size players whose due time has passed."""
+        batch = []
+        with self._lock:
+            while self._heap and len(batch) < self.batch_size:
+                due_at, _, player_id = self._heap[0]
+                if self._due.get(player_id) != due_at:
+                    heapq.heappop(self._heap)
+                    continue
+                if due_at > now:
+                    break
+                heapq.heappop(self._heap)
+                batch.append(player_id)
+        return batch
+
+    def _next_due(self):
+        with self._lock:
+            while self._heap:
+                due_at, _, player_id = self._heap[0]
+                if self._due.get(player_id) == due_at:
+                    return due_at
+                heapq.heappop(self._heap)
+        return None
+
+    def _budget_wait(self):
+        """Seconds to wait before spending budget, keeping a reserve for users."""
+        if self.limiter is None:
+            return 0.0
+        reserve = self.limiter.limit * (1 - self.budget_share)
+        if self.limiter.remaining() > reserve:
+            return 0.0
+        # Wait for the bucket to refill above the reserve
+        missing = reserve - self.limiter.remaining() + 1
+        return max(self.limiter.wait_time(), missing / self.limiter.rate)
+
+    async def run(self):
+        """Refresh due players forever."""
+        while True:
+            now = time.time()
+            next_due = self._next_due()
+            if next_due is None or next_due > now:
+                wait = 1.0 if next_due is None else next_due - now
+                await asyncio.sleep(min(wait, 1.0))
+                continue
+
+            wait = self._budget_wait()
+            if wait > 0:
+                await asyncio.sleep(min(wait, 5.0))
+                continue
+
+            await self._run_cycle(now)
+
+    async def _run_cycle(self, now):
+        batch = self._pop_due(now)
+        if not batch:
+            return
+
+        start = time.monotonic()
+        try:
+            results = await self.refresh(batch)
+        except Exception:
+            results = [(None, 'refresh failed')] * len(batch)
+
+        finished = time.time()
+        with self._lock:
+            for player_id, (player_data, error) in zip(batch, results):
+                if player_id not in self._due:
+                    continue  # removed while refreshing
+                if player_data:
+                    self.refreshed += 1
+                    self._push(player_id, finished + self.interval)
+                else:
+                    # Retry failures sooner than a full interval
+                    self.errors += 1
+                    self._push(player_id, finished + self.interval / 4)
+
+        self.cycles += 1
+        self.last_cycle_size = len(batch)
+        self.last_cycle_seconds = time.monotonic() - start
+
+    def start(self, loop):
+        """Start run() on an event loop owned by another thread."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.run_coroutine_threadsafe(self.run(), loop)
+
+    def stop(self):
+        """Stop the background refresh."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def stats(self):
+        """Queue depth, lag of the most overdue player and per-cycle throughput."""
+        now = time.time()
+        with self._lock:
+            due = [due_at for due_at in self._due.values() if due_at <= now]
+            oldest = min(due) if due else None
+
+        return {
+            'watched': len(self._due),
+            'queue_depth': len(due),
+            'lag': round(now - oldest, 3) if oldest else 0.0,
+            'cycles': self.cycles,
+            'refreshed': self.refreshed,
+            'errors': self.errors,
+            'last_cycle_size': self.last_cycle_size,
+            'last_cycle_seconds': round(self.last_cycle_seconds, 3),
+            'last_cycle_throughput': (
+                round(self.last_cycle_size / self.last_cycle_seconds, 2)
+                if self.last_cycle_seconds else 0.0
+            ),
+        }
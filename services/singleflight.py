@@ -0,0 +1,48 @@
+import asyncio
+
+
+def _consume_exception(future):
+    # Avoid "exception was never retrieved" when nobody joined the call
+    if not future.cancelled():
+        future.exception()
+
+
+class SingleFlight:
+    """
+    Deduplicate concurrent calls for the same key.
+
+    The first caller for a key starts the coroutine as a task; callers
+    arriving while it is in flight wait on the same task and share its
+    result or exception.
+    Must be used from a single event loop (the shared client loop).
+    """
+
+    def __init__(self):
+        self._calls = {}
+
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key, func):
+        """Run func() (a coroutine function) once for all concurrent callers of key."""
+        task = self._calls.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            task = asyncio.ensure_future(func())
+            task.add_done_callback(_consume_exception)
+            task.add_done_callback(lambda done: self._calls.pop(key, None))
+            self._calls[key] = task
+            self.calls += 1
+
+        # shield: a cancelled caller (e.g. a cancelled background fetch) must
+        # not cancel the call other callers are waiting on
+        return await asyncio.shield(task)
+
+    def stats(self):
+        """Return call counters and the number of calls in flight."""
+        return {
+            'calls': self.calls,
+            'coalesced': self.coalesced,
+            'in_flight': len(self._calls),
+        }
@@ -0,0 +1,193 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from .cache import normalize_key
+
+
+# SQLite limits the number of bound parameters per statement
+_CHUNK_SIZE = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS players (
+    uuid TEXT PRIMARY KEY,
+    displayname TEXT,
+    stats TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS player_names (
+    name TEXT PRIMARY KEY,
+    uuid TEXT NOT NULL
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS player_names_uuid ON player_names (uuid);
+"""
+
+
+def _chunks(items, size=_CHUNK_SIZE):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+class SnapshotStore:
+    """
+    Local SQLite store of the latest extracted stats for each player.
+
+    Rows are keyed by UUID; a second table maps lowercased usernames to
+    UUIDs so players can be read back by the name they were requested with.
+    Each row records when it was fetched (Unix time) so callers can decide
+    whether it is still fresh. Reads and writes are batched in chunks and
+    single transactions so bulk operations stay fast on large stores.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return (player_data, fetched_at) for a username or UUID, or None."""
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys):
+        """
+        Bulk read by username or UUID.
+
+        Returns a dict mapping each key that was found to
+        (player_data, fetched_at); missing keys are left out.
+        """
+        normalized = {key: normalize_key(key) for key in keys}
+        names = list(set(normalized.values()))
+        if not names:
+            return {}
+
+        with self._lock:
+            uuids = {name: name for name in names}
+            for chunk in _chunks(names):
+                placeholders = ','.join('?' * len(chunk))
+                rows = self._conn.execute(
+                    f'SELECT name, uuid FROM player_names WHERE name IN ({placeholders})',
+                    chunk,
+                )
+                uuids.update(rows)
+
+            rows_by_uuid = {}
+            wanted = list(set(uuids.values()))
+            for chunk in _chunks(wanted):
+                placeholders = ','.join('?' * len(chunk))
+                rows = self._conn.execute(
+                    f'SELECT uuid, displayname, stats, fetched_at FROM players '
+                    f'WHERE uuid IN ({placeholders})',
+                    chunk,
+                )
+                for uuid, displayname, stats, fetched_at in rows:
+                    rows_by_uuid[uuid] = (displayname, stats, fetched_at)
+
+        found = {}
+        for key, name in normalized.items():
+            row = rows_by_uuid.get(uuids[name])
+            if row is None:
+                continue
+            displayname, stats, fetched_at = row
+            player_data = {
+                'uuid': uuids[name],
+                'displayname': displayname,
+                'stats': json.loads(stats),
+            }
+            found[key] = (player_data, fetched_at)
+        return found
+
+    def put(self, player_data, *aliases, fetched_at=None):
+        """Store a single player snapshot."""
+        self.put_many([(player_data, aliases)], fetched_at=fetched_at)
+
+    def put_many(self, items, fetched_at=None):
+        """
+        Bulk upsert of player snapshots in a single transaction.
+
+        items is an iterable of (player_data, aliases) pairs, where aliases
+        are the usernames the player was requested with. They replace the
+        names stored with earlier snapshots, so a renamed player is no longer
+        found by its old name.
+        """
+        if fetched_at is None:
+            fetched_at = time.time()
+
+        players = []
+        names = []
+        for player_data, aliases in items:
+            uuid = normalize_key(player_data['uuid'])
+            displayname = player_data.get('displayname')
+            players.append((
+                uuid,
+                displayname,
+                json.dumps(player_data.get('stats', {}), separators=(',', ':')),
+                fetched_at,
+            ))
+            for alias in (displayname, *aliases):
+                if alias:
+                    names.append((normalize_key(alias), uuid))
+
+        if not players:
+            return
+
+        with self._lock, self._conn:
+            self._conn.executemany(
+                'DELETE FROM player_names WHERE uuid = ?',
+                [(player[0],) for player in players],
+            )
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO players (uuid, displayname, stats, fetched_at) '
+                'VALUES (?, ?, ?, ?)',
+                players,
+            )
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO player_names (name, uuid) VALUES (?, ?)',
+                names,
+            )
+
+    def iter_players(self, batch_size=1000):
+        """Yield every stored player_data, reading batch_size rows at a time."""
+        for player_data, fetched_at in self.iter_rows(batch_size=batch_size):
+            yield player_data
+
+    def iter_rows(self, start=None, end=None, batch_size=1000):
+        """
+        Yield (player_data, fetched_at) for every player fetched between start
+        and end (Unix times, inclusive), reading batch_size rows at a time.
+        """
+        start = float('-inf') if start is None else start
+        end = float('inf') if end is None else end
+        last = ''
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    'SELECT uuid, displayname, stats, fetched_at FROM players '
+                    'WHERE uuid > ? AND fetched_at BETWEEN ? AND ? '
+                    'ORDER BY uuid LIMIT ?',
+                    (last, start, end, batch_size),
+                ).fetchall()
+            if not rows:
+                return
+            for uuid, displayname, stats, fetched_at in rows:
+                yield {'uuid': uuid, 'displayname': displayname, 'stats': json.loads(stats)}, fetched_at
+            last = rows[-1][0]
+
+    def count(self):
+        """Number of players in the store."""
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM players').fetchone()[0]
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
@@ -1,6 +1,25 @@
+from functools import lru_cache
+
 import plotly.graph_objects as go
 from config.theme import CHART_COLORS, CHART_LAYOUT
-from config.game_modes import get_mode_stats
+from config.game_modes import GAME_MODES, get_mode_stats
+from config.settings import FIGURE_CACHE_SIZE
+from services.render_cache import RenderCache, content_key
+
+# Figures built on demand, per set of players and mode
+_figures = RenderCache(max_entries=FIGURE_CACHE_SIZE)
+
+# Bars shown per mode, in order, when the mode has the stat
+STAT_LABELS = (
+    ('wins', 'Victoires'),
+    ('games', 'Parties'),
+    ('kills', 'Éliminations'),
+    ('deaths', 'Morts'),
+    ('beds_broken', 'Lits détruits'),
+    ('final_kills', 'Final Kills'),
+)
+COMBINED_LABELS = ['Victoires', 'Parties', 'Éliminations', 'Morts']
+HOVER_TEMPLATE = '<b>%{x}</b><br>%{y:,}<extra></extra>'
 
 
 def apply_dark_theme(fig, title):
@@ -59,32 +78,8 @@ def create_mode_figure(players_data, mode_id, mode_name):
             continue
 
         # Determine which stats to display based on available data
-        x_labels = []
-        y_values = []
-
-        if 'wins' in stats:
-            x_labels.append('Victoires')
-            y_values.append(stats['wins'])
-
-        if 'games' in stats:
-            x_labels.append('Parties')
-            y_values.append(stats['games'])
-
-        if 'kills' in stats:
-            x_labels.append('Éliminations')
-            y_values.append(stats['kills'])
-
-        if 'deaths' in stats:
-            x_labels.append('Morts')
-            y_values.append(stats['deaths'])
-
-        if 'beds_broken' in stats:
-            x_labels.append('Lits détruits')
-            y_values.append(stats['beds_broken'])
-
-        if 'final_kills' in stats:
-            x_labels.append('Final Kills')
-            y_values.append(stats['final_kills'])
+        x_labels = [label for key, label in STAT_LABELS if key in stats]
+        y_values = [stats[key] for key, label in STAT_LABELS if key in stats]
 
         if x_labels and y_values:
             fig.add_trace(go.Bar(
@@ -93,7 +88,7 @@ def create_mode_figure(players_data, mode_id, mode_name):
                 name=username,
                 marker_color=color,
                 marker_line_width=0,
-                hovertemplate='<b>%{x}</b><br>%{y:,}<extra></extra>',
+                hovertemplate=HOVER_TEMPLATE,
             ))
 
     apply_dark_theme(fig, f"Statistiques {mode_name}")
@@ -104,19 +99,13 @@ def create_figures(players_data, historical_data):
     """
     Create all chart figures for the dashboard.
     Returns a dictionary with mode_id as keys and figures as values.
+    The dashboard builds figures lazily through get_figure instead.
     """
-    from config.game_modes import GAME_MODES
-
     figures = {}
 
     # Create a figure for each game mode
-    for mode_id, mode_config in GAME_MODES.items():
-        if mode_config.get('is_combined'):
-            # Handle combined view separately
-            figures[mode_id] = create_combined_figure(players_data)
-        else:
-            mode_name = mode_config.get('name', mode_id)
-            figures[mode_id] = create_mode_figure(players_data, mode_id, mode_name)
+    for mode_id in GAME_MODES:
+        figures[mode_id] = build_figure(players_data, mode_id)
 
     # Extract winstreaks for display
     winstreaks = extract_winstreaks(players_data)
@@ -125,6 +114,35 @@ def create_figures(players_data, historical_data):
     return figures
 
 
+def build_figure(players_data, mode_id):
+    """Build the figure of a single mode (or the combined view)."""
+    mode_config = GAME_MODES.get(mode_id)
+    if mode_config is None:
+        return None
+    if mode_config.get('is_combined'):
+        return create_combined_figure(players_data)
+    return create_mode_figure(players_data, mode_id, mode_config.get('name', mode_id))
+
+
+def get_figure(players_data, mode_id, data_key=None):
+    """
+    Figure of one mode as a plain dict, built on first use and memoized by
+    the content hash of players_data (data_key, if already known) and mode.
+    """
+    if data_key is None:
+        data_key = content_key(players_data)
+
+    def build():
+        return build_figure_dict(players_data, mode_id)
+
+    return _figures.get(data_key, mode_id, build)
+
+
+def get_figure_cache_stats():
+    """Hit/miss/eviction counters of the figure cache."""
+    return _figures.stats()
+
+
 def create_combined_figure(players_data):
     """Create a combined figure showing overall stats from all games."""
     fig = go.Figure()
@@ -160,12 +178,12 @@ def create_combined_figure(players_data):
         )
 
         fig.add_trace(go.Bar(
-            x=['Victoires', 'Parties', 'Éliminations', 'Morts'],
+            x=COMBINED_LABELS,
             y=[combined_wins, combined_games, combined_kills, combined_deaths],
             name=username,
             marker_color=color,
             marker_line_width=0,
-            hovertemplate='<b>%{x}</b><br>%{y:,}<extra></extra>',
+            hovertemplate=HOVER_TEMPLATE,
         ))
 
     apply_dark_theme(fig, "Statistiques Combinées")
@@ -190,3 +208,74 @@ def extract_winstreaks(players_data):
         winstreaks[username] = player_winstreaks
 
     return winstreaks
+
+
+# Fast path: the same figures as plain dicts, without graph_objects validation.
+# Layouts share the nested dicts of one precompiled template; do not mutate them.
+
+@lru_cache(maxsize=None)
+def _dark_layout_template():
+    """Layout produced by apply_dark_theme (default plotly template included), built once."""
+    return apply_dark_theme(go.Figure(), '').to_dict()['layout']
+
+
+def _dark_layout(title):
+    template = _dark_layout_template()
+    return {**template, 'title': {**template['title'], 'text': title}}
+
+
+def _bar(username, color, x_labels, y_values):
+    """A bar trace, keys in the order go.Bar.to_dict() emits them."""
+    return {
+        'hovertemplate': HOVER_TEMPLATE,
+        'marker': {'color': color, 'line': {'width': 0}},
+        'name': username,
+        'x': x_labels,
+        'y': y_values,
+        'type': 'bar',
+    }
+
+
+def create_mode_figure_dict(players_data, mode_id, mode_name):
+    """create_mode_figure(...).to_dict(), without building a go.Figure."""
+    traces = []
+
+    for i, (username, player) in enumerate(players_data.items()):
+        stats = get_mode_stats(player, mode_id)
+        if not stats:
+            continue
+
+        x_labels = [label for key, label in STAT_LABELS if key in stats]
+        y_values = [stats[key] for key, label in STAT_LABELS if key in stats]
+        if x_labels and y_values:
+            traces.append(_bar(username, CHART_COLORS[i % len(CHART_COLORS)], x_labels, y_values))
+
+    return {'data': traces, 'layout': _dark_layout(f"Statistiques {mode_name}")}
+
+
+def create_combined_figure_dict(players_data):
+    """create_combined_figure(...).to_dict(), without building a go.Figure."""
+    traces = []
+
+    for i, (username, player) in enumerate(players_data.items()):
+        totals = [0, 0, 0, 0]
+        for mode_id in ('bedwars_overall', 'skywars_overall', 'duels_overall'):
+            stats = get_mode_stats(player, mode_id)
+            totals[0] += stats.get('wins', 0)
+            totals[1] += stats.get('games', 0)
+            totals[2] += stats.get('kills', 0)
+            totals[3] += stats.get('deaths', 0)
+
+        traces.append(_bar(username, CHART_COLORS[i % len(CHART_COLORS)], list(COMBINED_LABELS), totals))
+
+    return {'data': traces, 'layout': _dark_layout("Statistiques Combinées")}
+
+
+def build_figure_dict(players_data, mode_id):
+    """build_figure(...).to_dict() through the fast path, or None for an unknown mode."""
+    mode_config = GAME_MODES.get(mode_id)
+    if mode_config is None:
+        return None
+    if mode_config.get('is_combined'):
+        return create_combined_figure_dict(players_data)
+    return create_mode_figure_dict(players_data, mode_id, mode_config.get('name', mode_id))
@@ -0,0 +1,7 @@
+import os
+import tempfile
+
+# Keep the module-level stores of api.py away from data/
+_data_dir = tempfile.mkdtemp(prefix='hypixel-tests-')
+os.environ.setdefault('HYPIXEL_STORE_PATH', os.path.join(_data_dir, 'players.sqlite3'))
+os.environ.setdefault('HYPIXEL_HISTORY_PATH', os.path.join(_data_dir, 'history.sqlite3'))
@@ -0,0 +1,14 @@
+from app import _partial_store
+
+
+def test_partial_store_keeps_input_order_and_marks_pending_players():
+    settled = {
+        'carol': {'displayname': 'Carol', 'stats': {}},
+        'alice': {'displayname': 'Alice', 'stats': {}},
+        'dave': None,
+    }
+    store = _partial_store(['alice', 'bob', 'carol', 'dave'], settled)
+
+    assert list(store) == ['Alice', 'bob', 'Carol']
+    assert store['bob'] == {'displayname': 'bob', 'pending': True}
+    assert 'pending' not in store['Alice']
@@ -0,0 +1,105 @@
+import asyncio
+import threading
+import time
+
+import dash
+import pytest
+
+from services.background import LoopCallbackManager
+from services.client import HypixelService
+
+
+CONTEXT = {'triggered_inputs': [{'prop_id': 'fetch-button.n_clicks', 'value': 1}]}
+
+
+@pytest.fixture
+def manager():
+    service = HypixelService()
+    manager = LoopCallbackManager(service, expire=60)
+    yield manager
+    LoopCallbackManager.managers.remove(manager)
+    service.close()
+
+
+def start(manager, fn, args, key='key', progress=False):
+    return manager.call_job_fn(key, manager.make_job_fn(fn, progress), args, CONTEXT)
+
+
+def wait_for_result(manager, key='key', timeout=5):
+    deadline = time.monotonic() + timeout
+    while not manager.result_ready(key):
+        assert time.monotonic() < deadline, 'job did not finish'
+        time.sleep(0.01)
+
+
+def test_runs_sync_and_async_callbacks(manager):
+    job = start(manager, lambda a, b: a + b, [1, 2])
+    wait_for_result(manager)
+    assert manager.get_result('key', job) == 3
+
+    async def fetch(name):
+        await asyncio.sleep(0)
+        return name.upper()
+
+    job = start(manager, lambda name: fetch(name), {'name': 'alice'})
+    wait_for_result(manager)
+    assert manager.get_result('key', job) == 'ALICE'
+
+    # A collected result is gone
+    assert manager.get_result('key', job) is manager.UNDEFINED
+    assert manager.stats() == {'running': 0, 'results': 0}
+
+
+def test_callback_context_progress_and_set_props(manager):
+    def callback(set_progress, value):
+        set_progress('halfway')
+        dash.set_props('result-message', {'children': 'loading'})
+        dash.set_props('result-message', {'className': 'busy'})
+        return dash.callback_context.triggered_id, value
+
+    job = start(manager, callback, [42], progress=True)
+    wait_for_result(manager)
+
+    assert manager.get_progress('key') == ['halfway']
+    assert manager.get_updated_props('key') == {
+        'result-message': {'children': 'loading', 'className': 'busy'},
+    }
+    assert manager.get_result('key', job) == ('fetch-button', 42)
+
+
+def test_errors_and_prevent_update(manager):
+    def fail():
+        raise ValueError('boom')
+
+    def prevent():
+        raise dash.exceptions.PreventUpdate
+
+    job = start(manager, fail, [])
+    wait_for_result(manager)
+    assert manager.get_result('key', job)['background_callback_error']['msg'] == 'boom'
+
+    job = start(manager, prevent, [])
+    wait_for_result(manager)
+    assert manager.get_result('key', job) == {'_dash_no_update': '_dash_no_update'}
+
+
+def test_terminate_cancels_the_coroutine(manager):
+    started = threading.Event()
+    cancelled = threading.Event()
+
+    async def slow():
+        started.set()
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    job = start(manager, lambda: slow(), [])
+    assert started.wait(5)
+    assert manager.job_running(job)
+
+    manager.terminate_job(job)
+    assert cancelled.wait(5)
+    assert not manager.job_running(job)
+    assert not manager.result_ready('key')
@@ -0,0 +1,151 @@
+from types import SimpleNamespace
+
+import pytest
+
+from services import cache as cache_module
+from services.cache import PlayerCache, normalize_key
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(cache_module, 'time', SimpleNamespace(monotonic=clock.monotonic))
+    return clock
+
+
+def player(uuid_char, name, wins=1):
+    return {
+        'uuid': uuid_char * 32,
+        'displayname': name,
+        'stats': {'Bedwars': {'wins_bedwars': wins}},
+    }
+
+
+def test_normalize_key():
+    assert normalize_key(' Some-Name ') == 'somename'
+    assert normalize_key('0123ABCD-0000-0000-0000-000000000000') == '0123abcd000000000000000000000000'
+
+
+def test_lookup_by_uuid_display_name_and_alias(clock):
+    cache = PlayerCache(ttl=60)
+    cache.put(player('a', 'Alice'), 'ALICE_requested')
+
+    for key in ('a' * 32, 'alice', 'Alice', 'alice_requested'):
+        player_data, is_fresh = cache.get(key)
+        assert player_data['uuid'] == 'a' * 32
+        assert player_data['stats']['Bedwars']['wins_bedwars'] == 1
+        assert is_fresh
+
+
+def test_hit_and_miss_counters(clock):
+    cache = PlayerCache(ttl=60)
+    assert cache.get('alice') is None
+    cache.put(player('a', 'Alice'))
+    cache.get('alice')
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # A second probe of a lookup already counted
+    cache.get('bob', count=False)
+    cache.get('alice', count=False)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = PlayerCache(ttl=60)
+    cache.put(player('a', 'Alice'))
+    clock.now += 59
+    assert cache.get('alice') is not None
+
+    clock.now += 1
+    assert cache.get('alice') is None
+    assert cache.expirations == 1
+    assert len(cache) == 0
+
+
+def test_stale_entries_served_within_stale_ttl(clock):
+    cache = PlayerCache(ttl=60, stale_ttl=120)
+    cache.put(player('a', 'Alice'))
+
+    clock.now += 90
+    player_data, is_fresh = cache.get('alice')
+    assert not is_fresh
+    assert cache.stale_hits == 1
+
+    clock.now += 90
+    assert cache.get('alice') is None
+
+
+def test_age_backdates_entries(clock):
+    cache = PlayerCache(ttl=60, stale_ttl=60)
+    cache.put(player('a', 'Alice'), age=70)
+    assert cache.get('alice')[1] is False
+
+
+def test_least_recently_used_evicted_first(clock):
+    cache = PlayerCache(ttl=60, max_entries=2)
+    cache.put(player('a', 'Alice'))
+    cache.put(player('b', 'Bob'))
+    cache.get('alice')
+    cache.put(player('c', 'Carol'))
+
+    assert cache.get('bob') is None
+    assert cache.get('alice') is not None
+    assert cache.get('carol') is not None
+    assert cache.evictions == 1
+
+
+def test_max_bytes_bounds_the_cache(clock):
+    probe = PlayerCache()
+    probe.put(player('a', 'Alice'))
+    size = probe.stats()['bytes']
+
+    cache = PlayerCache(ttl=60, max_bytes=size * 2)
+    for char, name in (('a', 'Alice'), ('b', 'Bob'), ('c', 'Carol')):
+        cache.put(player(char, name))
+    assert len(cache) == 2
+    assert cache.stats()['bytes'] <= size * 2
+
+
+def test_rename_drops_old_name(clock):
+    cache = PlayerCache(ttl=60)
+    cache.put(player('a', 'OldName'))
+    cache.put(player('a', 'NewName', wins=2))
+
+    assert cache.get('oldname') is None
+    assert cache.get('newname')[0]['stats']['Bedwars']['wins_bedwars'] == 2
+    assert len(cache) == 1
+
+
+def test_name_taken_by_another_player_moves_to_them(clock):
+    cache = PlayerCache(ttl=60)
+    cache.put(player('a', 'Shared'))
+    # a renamed, then someone else took the name
+    cache.put(player('b', 'Shared'))
+    assert cache.get('shared')[0]['uuid'] == 'b' * 32
+
+    # Evicting or re-storing the previous owner must not take the name back
+    cache.put(player('a', 'Renamed'))
+    cache.invalidate('a' * 32)
+    assert cache.get('shared')[0]['uuid'] == 'b' * 32
+    assert cache.get('renamed') is None
+
+
+def test_invalidate_and_clear(clock):
+    cache = PlayerCache(ttl=60)
+    cache.put(player('a', 'Alice'))
+    cache.put(player('b', 'Bob'))
+    cache.invalidate('Alice')
+    assert cache.get('alice') is None
+    assert cache.get('a' * 32) is None
+
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.stats()['bytes'] == 0
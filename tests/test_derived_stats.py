@@ -0,0 +1,55 @@
+import numpy as np
+
+from config.game_modes import compute_stats, get_mode_stats
+from services.derived_stats import derived_stats, safe_divide
+
+
+MODE_IDS = ['bedwars_overall', 'bedwars_solo', 'skywars_overall', 'duels_overall']
+
+
+def player(wins, games, kills, deaths, beds_broken=0, beds_lost=0):
+    return {
+        'uuid': 'a' * 32,
+        'stats': {
+            'Bedwars': {
+                'wins_bedwars': wins,
+                'games_played_bedwars': games,
+                'kills_bedwars': kills,
+                'deaths_bedwars': deaths,
+                'beds_broken_bedwars': beds_broken,
+                'beds_lost_bedwars': beds_lost,
+                'eight_one_wins_bedwars': wins // 2,
+                'eight_one_games_played_bedwars': games // 2,
+            },
+            'SkyWars': {'wins': wins, 'games_played_skywars': games, 'kills': kills, 'deaths': 0},
+        },
+    }
+
+
+def test_matches_compute_stats():
+    players = [player(10, 30, 45, 20, 7, 3), player(0, 0, 0, 0), player(1, 3, 2, 3)]
+    derived = derived_stats(players, MODE_IDS)
+
+    for i, data in enumerate(players):
+        for j, mode_id in enumerate(MODE_IDS):
+            computed = compute_stats(get_mode_stats(data, mode_id), mode_id)
+            assert derived['kdr'][i, j] == computed['kdr']['value']
+            assert derived['win_rate'][i, j] == computed['win_rate']['value']
+
+    assert derived['bblr'][0, 0] == 2.33
+    assert derived['wlr'][0, 0] == 0.5
+    # Missing games give zeros
+    assert derived['kdr'][0, 3] == 0
+
+
+def test_safe_divide_rounds_like_python():
+    pairs = [(1, 3), (2, 3), (5, 0), (5, -1), (1, 8), (100001, 7)]
+    expected = [round(a / b, 2) if b > 0 else 0 for a, b in pairs]
+    numerators, divisors = zip(*pairs)
+    assert safe_divide(np.array(numerators), np.array(divisors)).tolist() == expected
+
+
+def test_beds_lost_is_not_a_shown_mode_stat():
+    data = player(10, 30, 45, 20, 7, 3)
+    assert 'beds_lost' not in get_mode_stats(data, 'bedwars_overall')
+    assert get_mode_stats(data, 'bedwars_overall')['beds_broken'] == 7
@@ -0,0 +1,93 @@
+import io
+
+import pytest
+
+pa = pytest.importorskip('pyarrow')
+import pyarrow.parquet as pq
+
+import api
+from services.export import COLUMNS, iter_record_batches, stream_export, validate_modes
+from services.history import HistoryStore
+
+
+UUID = 'a' * 32
+BEDWARS_MODES = [
+    'bedwars_overall', 'bedwars_solo', 'bedwars_doubles', 'bedwars_threes', 'bedwars_fours', 'bedwars_4v4',
+]
+
+
+def bedwars(wins, games, kills, deaths):
+    return {
+        'wins_bedwars': wins,
+        'games_played_bedwars': games,
+        'kills_bedwars': kills,
+        'deaths_bedwars': deaths,
+    }
+
+
+@pytest.fixture
+def history():
+    history = HistoryStore(':memory:', keyframe_interval=2)
+    for i, stats in enumerate([bedwars(1, 4, 10, 5), bedwars(2, 5, 12, 5), bedwars(4, 8, 20, 7)]):
+        history.append({'uuid': UUID, 'stats': {'Bedwars': stats}}, fetched_at=1000.0 + i)
+    yield history
+    history.close()
+
+
+def lookup_names(uuids):
+    return {uuid: 'Alice' for uuid in uuids}
+
+
+def read(chunks, fmt):
+    data = b''.join(chunks)
+    if fmt == 'parquet':
+        return pq.read_table(io.BytesIO(data))
+    return pa.ipc.open_stream(data).read_all()
+
+
+@pytest.mark.parametrize('fmt', ['parquet', 'arrow'])
+def test_round_trip(history, fmt):
+    batches = iter_record_batches(history.iter_snapshots(), lookup_names, batch_size=2)
+    table = read(stream_export(batches, fmt=fmt), fmt)
+
+    assert table.column_names == list(COLUMNS)
+    # One row per snapshot and Bedwars mode
+    assert table.num_rows == 3 * len(BEDWARS_MODES)
+
+    rows = [row for row in table.to_pylist() if row['mode'] == 'bedwars_overall']
+    assert [row['fetched_at'].timestamp() for row in rows] == [1000.0, 1001.0, 1002.0]
+    assert [row['wins'] for row in rows] == [1, 2, 4]
+    assert [row['kdr'] for row in rows] == [2.0, 2.4, 2.86]
+    assert [row['win_rate'] for row in rows] == [25.0, 40.0, 50.0]
+    assert {row['displayname'] for row in rows} == {'Alice'}
+
+
+def test_columns_and_modes_filter(history):
+    columns = ['mode', 'wins', 'fkdr']
+    batches = iter_record_batches(
+        history.iter_snapshots(start=1001), lookup_names, columns=columns, modes=['bedwars_solo'],
+    )
+    table = read(stream_export(batches, columns=columns, fmt='arrow'), 'arrow')
+
+    assert table.column_names == columns
+    assert table.column('mode').to_pylist() == ['bedwars_solo', 'bedwars_solo']
+
+
+def test_validate_modes():
+    assert validate_modes(None) is None
+    assert validate_modes(['bedwars_solo', 'bedwars_solo']) == {'bedwars_solo'}
+    # A single id is not matched by substring
+    assert validate_modes('bedwars_solo') == {'bedwars_solo'}
+    with pytest.raises(ValueError, match='bedwars_sol\\b'):
+        validate_modes(['bedwars_solo', 'bedwars_sol'])
+
+
+def test_export_stats_rejects_bad_arguments():
+    with pytest.raises(ValueError):
+        api.export_stats(modes=['unknown_mode'])
+    with pytest.raises(ValueError):
+        api.export_stats(columns=['unknown_column'])
+    with pytest.raises(ValueError):
+        api.export_stats(source='unknown')
+    with pytest.raises(ValueError):
+        api.export_stats(fmt='csv')
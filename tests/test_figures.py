@@ -0,0 +1,31 @@
+from config.game_modes import GAME_MODES
+from stats import build_figure_dict, create_figures
+
+
+PLAYERS = {
+    'Alice': {
+        'uuid': 'a' * 32,
+        'stats': {
+            'Bedwars': {'wins_bedwars': 12, 'games_played_bedwars': 30, 'kills_bedwars': 80, 'deaths_bedwars': 41},
+            'SkyWars': {'wins': 4, 'kills': 19, 'deaths': 0},
+        },
+    },
+    # No Duels and no SkyWars: zero bars
+    'Bob': {'uuid': 'b' * 32, 'stats': {'Bedwars': {'wins_bedwars': 1}}},
+}
+
+
+def test_matches_graph_objects_for_every_mode():
+    figures = create_figures(PLAYERS, {})
+    for mode_id in GAME_MODES:
+        assert build_figure_dict(PLAYERS, mode_id) == figures[mode_id].to_dict(), mode_id
+
+
+def test_matches_graph_objects_without_players():
+    figures = create_figures({}, {})
+    for mode_id in ('combined', 'bedwars_overall', 'duel_sumo'):
+        assert build_figure_dict({}, mode_id) == figures[mode_id].to_dict()
+
+
+def test_unknown_mode():
+    assert build_figure_dict(PLAYERS, 'unknown_mode') is None
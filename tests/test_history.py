@@ -0,0 +1,146 @@
+import json
+import sqlite3
+from types import SimpleNamespace
+
+import pytest
+
+from services import history as history_module
+from services.history import HistoryStore, _apply, _diff
+
+
+UUID = 'a' * 32
+
+
+@pytest.fixture
+def history():
+    history = HistoryStore(':memory:', keyframe_interval=4)
+    yield history
+    history.close()
+
+
+def snapshot(stats, uuid=UUID):
+    return {'uuid': uuid, 'displayname': 'Alice', 'stats': {'Bedwars': stats}}
+
+
+def rows(history):
+    return history._conn.execute(
+        'SELECT fetched_at, stats, is_keyframe FROM snapshots ORDER BY fetched_at'
+    ).fetchall()
+
+
+def test_one_row_per_game_and_fetch(history):
+    history.append({'uuid': UUID, 'stats': {'Bedwars': {'wins': 1}, 'Duels': {'wins': 10}}}, fetched_at=1.0)
+    history.append_many([snapshot({'wins': 2}), snapshot({'wins': 5}, uuid='b' * 32)], fetched_at=2.0)
+
+    assert history.count() == 4
+    assert history.query(UUID, 'Bedwars') == [(1.0, {'wins': 1}), (2.0, {'wins': 2})]
+    assert history.query(UUID, 'Duels') == [(1.0, {'wins': 10})]
+    assert history.query('B' * 32, 'Bedwars') == [(2.0, {'wins': 5})]
+    assert history.query(UUID, 'SkyWars') == []
+
+
+def test_diff_and_apply_round_trip():
+    previous = {'wins': 1, 'kills': 5, 'losses': 2, 'rank': None}
+    current = {'wins': 2, 'kills': 5, 'rank': None, 'prestige': None}
+    delta = _diff(previous, current)
+    assert delta == {'set': {'wins': 2, 'prestige': None}, 'del': ['losses']}
+
+    state = dict(previous)
+    _apply(state, delta)
+    assert state == current
+
+
+def test_keyframes_every_interval(history):
+    for i in range(9):
+        history.append(snapshot({'wins': i, 'kills': 100}), fetched_at=float(i))
+
+    assert [is_keyframe for _, _, is_keyframe in rows(history)] == [1, 0, 0, 0, 1, 0, 0, 0, 1]
+    # Deltas only hold what changed
+    assert json.loads(rows(history)[1][1]) == {'set': {'wins': 1}, 'del': []}
+    assert history.query(UUID, 'Bedwars') == [(float(i), {'wins': i, 'kills': 100}) for i in range(9)]
+
+
+def test_none_values_and_removed_keys_survive_replay(history):
+    states = [
+        {'wins': 1, 'kills': 5, 'rank': 'VIP'},
+        {'wins': 1, 'kills': None, 'rank': 'VIP'},
+        {'wins': 2, 'kills': None},
+        {'wins': 2, 'kills': 6, 'rank': None},
+    ]
+    for i, stats in enumerate(states):
+        history.append(snapshot(stats), fetched_at=float(i))
+
+    assert [stats for _, stats in history.query(UUID, 'Bedwars')] == states
+    assert [stats for _, _, _, stats in history.iter_snapshots(batch_size=1)] == states
+
+
+def test_state_at_and_time_ranges(history):
+    for i in range(6):
+        history.append(snapshot({'wins': i}), fetched_at=10.0 * i)
+
+    assert history.state_at(UUID, 'Bedwars', 35) == (30.0, {'wins': 3})
+    assert history.state_at(UUID, 'Bedwars', 5) == (0.0, {'wins': 0})
+    assert history.state_at(UUID, 'Bedwars', -1) is None
+
+    # Ranges starting after a keyframe replay from it but only return their own rows
+    assert history.query(UUID, 'Bedwars', start=25, end=45) == [(30.0, {'wins': 3}), (40.0, {'wins': 4})]
+    assert [fetched_at for _, _, fetched_at, _ in history.iter_snapshots(start=25, end=45)] == [30.0, 40.0]
+
+
+def test_latest_state_reloaded_from_disk(tmp_path):
+    path = str(tmp_path / 'history.db')
+    history = HistoryStore(path, keyframe_interval=4)
+    history.append(snapshot({'wins': 1, 'kills': None}), fetched_at=1.0)
+    history.close()
+
+    history = HistoryStore(path, keyframe_interval=4)
+    history.append(snapshot({'wins': 2, 'kills': None}), fetched_at=2.0)
+    assert rows(history)[1][2] == 0
+    assert history.query(UUID, 'Bedwars')[-1] == (2.0, {'wins': 2, 'kills': None})
+    history.close()
+
+
+def test_failed_write_does_not_corrupt_later_deltas(history):
+    history.append(snapshot({'wins': 1, 'kills': 5}), fetched_at=1.0)
+
+    history._conn.execute(
+        "CREATE TEMP TRIGGER fail BEFORE INSERT ON snapshots BEGIN SELECT RAISE(ABORT, 'disk full'); END"
+    )
+    with pytest.raises(sqlite3.DatabaseError):
+        history.append(snapshot({'wins': 2, 'kills': 6}), fetched_at=2.0)
+    history._conn.execute('DROP TRIGGER fail')
+
+    # The next delta must be taken against the last committed snapshot
+    history.append(snapshot({'wins': 2, 'kills': 5}), fetched_at=3.0)
+    assert history.query(UUID, 'Bedwars') == [(1.0, {'wins': 1, 'kills': 5}), (3.0, {'wins': 2, 'kills': 5})]
+
+
+def test_player_listed_twice_in_a_batch(history):
+    history.append(snapshot({'wins': 1, 'kills': 5}), fetched_at=1.0)
+    history.append_many([snapshot({'wins': 2, 'kills': 5}), snapshot({'wins': 2, 'kills': 7})], fetched_at=2.0)
+    history.append(snapshot({'wins': 3, 'kills': 7}), fetched_at=3.0)
+
+    assert history.query(UUID, 'Bedwars') == [
+        (1.0, {'wins': 1, 'kills': 5}),
+        (2.0, {'wins': 2, 'kills': 7}),
+        (3.0, {'wins': 3, 'kills': 7}),
+    ]
+
+
+def test_iter_snapshots_reads_each_series_from_its_keyframe(history, monkeypatch):
+    for i in range(12):
+        history.append_many([snapshot({'wins': i}), snapshot({'wins': 100 + i}, uuid='b' * 32)], fetched_at=float(i))
+
+    decoded = []
+    counting_json = SimpleNamespace(loads=lambda payload: decoded.append(payload) or json.loads(payload))
+    monkeypatch.setattr(history_module, 'json', counting_json)
+    snapshots = list(history.iter_snapshots(start=9, end=10, batch_size=2))
+
+    assert snapshots == [
+        (UUID, 'Bedwars', 9.0, {'wins': 9}),
+        (UUID, 'Bedwars', 10.0, {'wins': 10}),
+        ('b' * 32, 'Bedwars', 9.0, {'wins': 109}),
+        ('b' * 32, 'Bedwars', 10.0, {'wins': 110}),
+    ]
+    # Keyframes at 0, 4 and 8: each series is replayed from 8, not from 0
+    assert len(decoded) == 6
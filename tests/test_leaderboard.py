@@ -0,0 +1,136 @@
+import random
+
+import pytest
+
+import api
+from services.leaderboard import Leaderboard, OrderedIndex
+
+
+WINS = 'bedwars_overall.wins'
+FKDR = 'bedwars_overall.fkdr'
+
+
+def player(uuid_char, name, wins, final_kills=0, final_deaths=0):
+    return {
+        'uuid': uuid_char * 32,
+        'displayname': name,
+        'stats': {'Bedwars': {
+            'wins_bedwars': wins,
+            'final_kills_bedwars': final_kills,
+            'final_deaths_bedwars': final_deaths,
+        }},
+    }
+
+
+def check(index, expected):
+    assert len(index) == len(expected)
+    assert index.first(len(expected) + 1) == expected
+    for position, key in enumerate(expected):
+        assert index.select(position) == key
+        assert index.rank(key) == position
+
+
+def test_ordered_index_matches_a_sorted_list():
+    rng = random.Random(7)
+    index = OrderedIndex(seed=1)
+    expected = []
+    for _ in range(2000):
+        if expected and rng.random() < 0.4:
+            key = expected.pop(rng.randrange(len(expected)))
+            index.remove(key)
+        else:
+            key = (-rng.randrange(100), f'{rng.getrandbits(32):08x}')
+            if key in expected:
+                continue
+            index.insert(key)
+            expected.append(key)
+            expected.sort()
+    check(index, expected)
+    assert index.first(5) == expected[:5]
+
+
+def test_ordered_index_errors():
+    index = OrderedIndex(seed=1)
+    index.insert((1, 'a'))
+    with pytest.raises(KeyError):
+        index.rank((2, 'a'))
+    with pytest.raises(KeyError):
+        index.remove((2, 'a'))
+    with pytest.raises(IndexError):
+        index.select(1)
+    with pytest.raises(IndexError):
+        index.select(-1)
+
+    index.remove((1, 'a'))
+    check(index, [])
+
+
+def test_top_and_rank_highest_first_ties_by_uuid():
+    board = Leaderboard([WINS])
+    board.update_many([player('b', 'Bob', 10), player('a', 'Alice', 10), player('c', 'Carol', 30)])
+
+    assert board.top(WINS) == [
+        {'rank': 1, 'uuid': 'c' * 32, 'displayname': 'Carol', 'value': 30},
+        {'rank': 2, 'uuid': 'a' * 32, 'displayname': 'Alice', 'value': 10},
+        {'rank': 3, 'uuid': 'b' * 32, 'displayname': 'Bob', 'value': 10},
+    ]
+    assert [row['uuid'] for row in board.top(WINS, count=1)] == ['c' * 32]
+    assert board.rank(WINS, 'B' * 32) == 3
+    assert board.rank(WINS, 'd' * 32) is None
+
+
+def test_update_moves_a_player():
+    board = Leaderboard([WINS])
+    board.update_many([player('a', 'Alice', 5), player('b', 'Bob', 10)])
+    board.update(player('a', 'Alice', 20))
+
+    assert board.rank(WINS, 'a' * 32) == 1
+    assert board.rank(WINS, 'b' * 32) == 2
+    assert board.size(WINS) == 2
+
+    # Unchanged values do not touch the index
+    moves = board.stats()['moves']
+    board.update(player('a', 'Alice', 20))
+    assert board.stats()['moves'] == moves
+
+
+def test_players_without_the_game_are_not_ranked():
+    board = Leaderboard([WINS])
+    board.update(player('a', 'Alice', 5))
+    board.update({'uuid': 'a' * 32, 'displayname': 'Alice', 'stats': {'Duels': {}}})
+
+    assert board.rank(WINS, 'a' * 32) is None
+    assert board.size(WINS) == 0
+
+
+def test_add_metric_indexes_initial_players():
+    board = Leaderboard()
+    players = [player('a', 'Alice', 1, final_kills=10, final_deaths=2), player('b', 'Bob', 1, final_kills=9, final_deaths=1)]
+    board.add_metric(FKDR, players)
+
+    assert board.metrics() == [FKDR]
+    assert [row['value'] for row in board.top(FKDR)] == [9, 5]
+    with pytest.raises(KeyError):
+        board.add_metric('bedwars_overall.unknown')
+
+
+def test_remove_drops_a_player_everywhere():
+    board = Leaderboard([WINS, FKDR])
+    board.update_many([player('a', 'Alice', 5, final_kills=3), player('b', 'Bob', 10, final_kills=1)])
+    board.remove('a' * 32)
+
+    assert board.rank(WINS, 'a' * 32) is None
+    assert board.rank(FKDR, 'a' * 32) is None
+    assert board.rank(FKDR, 'b' * 32) == 1
+    assert board.stats()['players'] == 1
+
+
+def test_persist_does_not_wait_for_the_leaderboard():
+    # As while _load_leaderboard indexes the whole store
+    with api._leaderboard._lock:
+        done = api._io.submit(api._persist, [(player('e', 'Erin', 3), ())])
+        done.result(timeout=5)
+        assert api._store.get('e' * 32) is not None
+
+    api._leaderboard_io.submit(lambda: None).result(timeout=5)
+    assert api._leaderboard.stats()['updates'] >= 1
@@ -0,0 +1,136 @@
+import asyncio
+
+import pytest
+
+from services import HypixelService, MetricsRegistry
+from services.metrics import instrument
+
+
+class Skip(Exception):
+    pass
+
+
+def _instrumented(registry, ignore=()):
+    duration = registry.histogram('duration_seconds', 'Duration', ['name'], buckets=(0.5, 1))
+    in_flight = registry.gauge('in_flight', 'Running', ['name'])
+    errors = registry.counter('errors_total', 'Errors', ['name', 'type'])
+    return instrument('op', duration, in_flight, errors, ignore=ignore)
+
+
+def _samples(registry):
+    return [line for line in registry.render().splitlines() if not line.startswith('#')]
+
+
+def test_render_counters_gauges_and_histograms():
+    registry = MetricsRegistry()
+    requests = registry.counter('requests_total', 'Requests', ['status'])
+    requests.labels('200').inc(3)
+    requests.labels('a "quoted"\nvalue').inc()
+    registry.gauge('queue', 'Queued').set(2.5)
+    latency = registry.histogram('latency_seconds', 'Latency', buckets=(0.1, 1))
+    for value in (0.05, 0.1, 0.5, 3):
+        latency.observe(value)
+
+    text = registry.render()
+    assert '# HELP requests_total Requests\n# TYPE requests_total counter\n' in text
+    assert '# TYPE latency_seconds histogram\n' in text
+    assert text.endswith('\n')
+    assert _samples(registry) == [
+        'requests_total{status="200"} 3',
+        'requests_total{status="a \\"quoted\\"\\nvalue"} 1',
+        'queue 2.5',
+        'latency_seconds_bucket{le="0.1"} 2',
+        'latency_seconds_bucket{le="1"} 3',
+        'latency_seconds_bucket{le="+Inf"} 4',
+        'latency_seconds_sum 3.65',
+        'latency_seconds_count 4',
+    ]
+
+
+def test_labels_must_match_label_names():
+    registry = MetricsRegistry()
+    requests = registry.counter('requests_total', 'Requests', ['status'])
+    with pytest.raises(ValueError):
+        requests.labels('200', 'extra')
+    with pytest.raises(ValueError):
+        registry.counter('requests_total', 'Again')
+
+
+def test_add_stats_renders_numeric_entries_and_skips_broken_collectors():
+    registry = MetricsRegistry()
+    registry.add_stats('cache', 'Cache', lambda: {'hits': 4, 'size': 2, 'enabled': True, 'name': 'x'}, counters=('hits',))
+    registry.add_stats('limit', 'Limiter', lambda: {'key1': {'remaining': 10}, 'key2': {'remaining': 7}}, label='key')
+    registry.add_stats('broken', 'Broken', lambda: 1 / 0)
+    registry.add_stats('empty', 'Empty', lambda: None)
+
+    text = registry.render()
+    assert '# TYPE cache_hits_total counter\n' in text
+    assert '# TYPE cache_size gauge\n' in text
+    assert 'broken' not in text and 'empty' not in text
+    assert _samples(registry) == [
+        'cache_hits_total 4',
+        'cache_size 2',
+        'limit_remaining{key="key1"} 10',
+        'limit_remaining{key="key2"} 7',
+    ]
+
+
+def test_instrument_times_calls_and_counts_errors():
+    registry = MetricsRegistry()
+    decorate = _instrumented(registry, ignore=(Skip,))
+
+    @decorate
+    def op(value):
+        if value == 'fail':
+            raise KeyError(value)
+        if value == 'skip':
+            raise Skip()
+        return value
+
+    assert op('ok') == 'ok'
+    for value, exception in (('fail', KeyError), ('skip', Skip)):
+        with pytest.raises(exception):
+            op(value)
+
+    samples = _samples(registry)
+    assert 'duration_seconds_count{name="op"} 3' in samples
+    assert 'in_flight{name="op"} 0' in samples
+    assert 'errors_total{name="op",type="KeyError"} 1' in samples
+    assert not any('Skip' in line for line in samples)
+
+
+def test_instrument_times_a_returned_coroutine_until_it_completes():
+    registry = MetricsRegistry()
+    decorate = _instrumented(registry)
+    running = []
+
+    @decorate
+    def op(fail):
+        async def work():
+            running.append(registry.render())
+            if fail:
+                raise ValueError()
+            return 'done'
+        return work()
+
+    assert asyncio.run(op(False)) == 'done'
+    assert 'in_flight{name="op"} 1' in running[0]
+    with pytest.raises(ValueError):
+        asyncio.run(op(True))
+
+    samples = _samples(registry)
+    assert 'duration_seconds_count{name="op"} 2' in samples
+    assert 'in_flight{name="op"} 0' in samples
+    assert 'errors_total{name="op",type="ValueError"} 1' in samples
+
+
+def test_rate_limit_stats_never_expose_api_keys():
+    service = HypixelService()
+    first, second = 'f' * 36, '0' * 36
+    service.rate_limiter(first)
+    service.rate_limiter(second)
+    service.rate_limiter(first)
+
+    stats = service.rate_limit_stats()
+    assert list(stats) == ['key1', 'key2']
+    assert first[:8] not in repr(stats) and second[:8] not in repr(stats)
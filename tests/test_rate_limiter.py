@@ -0,0 +1,113 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from services import rate_limiter
+from services.rate_limiter import RateLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limiter, 'time', SimpleNamespace(monotonic=clock.monotonic))
+    return clock
+
+
+def headers(limit, remaining, reset, retry_after=None):
+    values = {
+        'RateLimit-Limit': str(limit),
+        'RateLimit-Remaining': str(remaining),
+        'RateLimit-Reset': str(reset),
+    }
+    if retry_after is not None:
+        values['Retry-After'] = str(retry_after)
+    return values
+
+
+def test_starts_with_full_budget(clock):
+    limiter = RateLimiter(limit=300, window=300)
+    assert limiter.remaining() == 300
+    assert limiter.wait_time() == 0
+
+
+def test_remaining_header_caps_bucket(clock):
+    limiter = RateLimiter(limit=300, window=300)
+    limiter.update(200, headers(300, 12, 200))
+    assert limiter.remaining() == 12
+
+
+def test_limit_header_replaces_configured_limit(clock):
+    limiter = RateLimiter(limit=300, window=300)
+    limiter.update(200, headers(15, 14, 5))
+    assert limiter.limit == 15
+    assert limiter.remaining() == 14
+
+
+def test_budget_is_full_again_when_window_resets(clock):
+    # A 15 requests / 5 s key while the configured window is 300 s
+    limiter = RateLimiter(limit=300, window=300)
+    for remaining in range(14, -1, -1):
+        limiter.update(200, headers(15, remaining, 5))
+    assert limiter.remaining() == 0
+    assert limiter.wait_time() == pytest.approx(5)
+
+    clock.now += 5
+    assert limiter.remaining() == 15
+    assert limiter.wait_time() == 0
+
+
+def test_exhausted_budget_waits_for_reset_not_refill_rate(clock):
+    limiter = RateLimiter(limit=15, window=300)
+    limiter.update(200, headers(15, 0, 3))
+    # Refilling one token at 15 / 300 per second would take 20 s
+    assert limiter.wait_time() == pytest.approx(3)
+
+
+def test_429_blocks_until_retry_after_then_refills(clock):
+    limiter = RateLimiter(limit=300, window=300)
+    limiter.update(429, headers(300, 0, 40, retry_after=10))
+    assert limiter.throttled == 1
+    assert limiter.remaining() == 0
+    assert limiter.wait_time() == pytest.approx(10)
+
+    clock.now += 10
+    assert limiter.remaining() == 300
+
+
+def test_429_without_headers_blocks_one_second(clock):
+    limiter = RateLimiter(limit=300, window=300)
+    limiter.update(429, {})
+    assert limiter.wait_time() == pytest.approx(1)
+
+
+def test_malformed_headers_are_ignored(clock):
+    limiter = RateLimiter(limit=300, window=300)
+    limiter.update(200, {'RateLimit-Limit': 'x', 'RateLimit-Remaining': '', 'RateLimit-Reset': 'soon'})
+    assert limiter.limit == 300
+    assert limiter.remaining() == 300
+
+
+def test_acquire_resumes_at_window_reset():
+    async def scenario():
+        limiter = RateLimiter(limit=2, window=300)
+        await limiter.acquire()
+        await limiter.acquire()
+        limiter.update(200, headers(2, 0, 0.2))
+
+        start = time.monotonic()
+        await asyncio.wait_for(limiter.acquire(), timeout=5)
+        return time.monotonic() - start, limiter
+
+    waited, limiter = asyncio.run(scenario())
+    assert 0.1 <= waited < 1
+    assert limiter.acquired == 3
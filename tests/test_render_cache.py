@@ -0,0 +1,75 @@
+import pytest
+
+import stats
+from services.render_cache import RenderCache, content_key
+
+
+PLAYERS = {
+    'Alice': {'uuid': 'a' * 32, 'stats': {'Bedwars': {'wins_bedwars': 3, 'kills_bedwars': 7}}},
+    'Bob': {'uuid': 'b' * 32, 'stats': {'Bedwars': {'wins_bedwars': 1, 'kills_bedwars': 2}}},
+}
+
+
+def test_content_key_follows_content():
+    assert content_key({'a': 1, 'b': [1, 2]}) == content_key({'a': 1, 'b': [1, 2]})
+    assert content_key({'a': 1}) != content_key({'a': 2})
+
+
+def test_builds_once_per_key_and_mode():
+    cache = RenderCache()
+    builds = []
+
+    def build(name):
+        return lambda: builds.append(name) or {'name': name}
+
+    assert cache.get('k1', 'bedwars_overall', build('a')) == {'name': 'a'}
+    assert cache.get('k1', 'bedwars_overall', build('b')) == {'name': 'a'}
+    assert cache.get('k1', 'skywars_overall', build('c')) == {'name': 'c'}
+    assert cache.get('k2', 'bedwars_overall', build('d')) == {'name': 'd'}
+
+    assert builds == ['a', 'c', 'd']
+    assert cache.stats() == {'hits': 1, 'misses': 3, 'evictions': 0, 'entries': 3}
+
+
+def test_evicts_least_recently_used():
+    cache = RenderCache(max_entries=2)
+    cache.get('k', 'a', lambda: 'A')
+    cache.get('k', 'b', lambda: 'B')
+    cache.get('k', 'a', lambda: 'A2')  # 'a' is now the most recent
+    cache.get('k', 'c', lambda: 'C')
+
+    assert cache.get('k', 'a', lambda: 'A3') == 'A'
+    assert cache.get('k', 'b', lambda: 'B2') == 'B2'
+    assert cache.stats()['evictions'] == 2
+
+
+@pytest.fixture
+def figures(monkeypatch):
+    cache = RenderCache()
+    monkeypatch.setattr(stats, '_figures', cache)
+    return cache
+
+
+def test_get_figure_matches_create_figures(figures):
+    figure = stats.get_figure(PLAYERS, 'bedwars_overall')
+    assert figure == stats.create_figures(PLAYERS, {})['bedwars_overall'].to_dict()
+    assert stats.get_figure(PLAYERS, 'unknown_mode') is None
+
+
+def test_get_figure_rebuilds_only_when_data_changes(figures, monkeypatch):
+    built = []
+    build_figure_dict = stats.build_figure_dict
+
+    def counting_build(players_data, mode_id):
+        built.append(mode_id)
+        return build_figure_dict(players_data, mode_id)
+
+    monkeypatch.setattr(stats, 'build_figure_dict', counting_build)
+
+    stats.get_figure(PLAYERS, 'bedwars_overall')
+    stats.get_figure(PLAYERS, 'bedwars_overall', data_key=content_key(PLAYERS))
+    assert built == ['bedwars_overall']
+
+    changed = {**PLAYERS, 'Bob': {'uuid': 'b' * 32, 'stats': {'Bedwars': {'wins_bedwars': 2}}}}
+    stats.get_figure(changed, 'bedwars_overall')
+    assert built == ['bedwars_overall', 'bedwars_overall']
@@ -0,0 +1,122 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from services import resolver as resolver_module
+from services.resolver import NOT_FOUND, NameResolver, is_uuid
+
+
+UUID = '0123456789abcdef0123456789abcdef'
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(resolver_module, 'time', SimpleNamespace(monotonic=clock.monotonic))
+    return clock
+
+
+class FakeMojang:
+    """fetch_uuids stand-in recording the names it was asked for."""
+
+    def __init__(self, players, failing=()):
+        self.players = players
+        self.failing = set(failing)
+        self.calls = []
+
+    async def __call__(self, names):
+        self.calls.append(list(names))
+        return {
+            name.lower(): self.players.get(name.lower())
+            for name in names
+            if name.lower() not in self.failing
+        }
+
+
+def test_is_uuid():
+    assert is_uuid(UUID)
+    assert is_uuid('01234567-89AB-CDEF-0123-456789ABCDEF')
+    assert not is_uuid('Alice')
+
+
+def test_uuids_resolve_to_themselves(clock):
+    resolver = NameResolver()
+    assert resolver.lookup('01234567-89ab-cdef-0123-456789abcdef') == UUID
+    assert resolver.stats()['misses'] == 0
+
+
+def test_positive_entries_expire_after_ttl(clock):
+    resolver = NameResolver(ttl=60, negative_ttl=10)
+    resolver.remember('Alice', UUID.upper())
+
+    assert resolver.lookup('alice') == UUID
+    clock.now += 60
+    assert resolver.lookup('alice') is None
+    assert resolver.stats() == {'hits': 1, 'negative_hits': 0, 'misses': 1, 'entries': 0}
+
+
+def test_negative_entries_expire_after_negative_ttl(clock):
+    resolver = NameResolver(ttl=60, negative_ttl=10)
+    resolver.remember_missing('Nobody')
+
+    assert resolver.lookup('NOBODY') is NOT_FOUND
+    clock.now += 10
+    assert resolver.lookup('nobody') is None
+    assert resolver.stats()['negative_hits'] == 1
+
+
+def test_least_recently_used_evicted_first(clock):
+    resolver = NameResolver(max_entries=2)
+    resolver.remember('a', 'a' * 32)
+    resolver.remember('b', 'b' * 32)
+    resolver.lookup('a')
+    resolver.remember('c', 'c' * 32)
+
+    assert resolver.lookup('b') is None
+    assert resolver.lookup('a') == 'a' * 32
+
+
+def test_resolve_many_fetches_unknown_names_once(clock):
+    resolver = NameResolver()
+    resolver.remember('Cached', 'c' * 32)
+    mojang = FakeMojang({'alice': 'a' * 32, 'bob': 'b' * 32})
+
+    names = ['Alice', 'alice', 'Bob', 'Cached', 'Nobody', UUID]
+    resolved = asyncio.run(resolver.resolve_many(names, mojang))
+
+    assert resolved == {
+        'Alice': 'a' * 32,
+        'alice': 'a' * 32,
+        'Bob': 'b' * 32,
+        'Cached': 'c' * 32,
+        'Nobody': NOT_FOUND,
+        UUID: UUID,
+    }
+    # One call, each distinct name once
+    assert len(mojang.calls) == 1
+    assert sorted(name.lower() for name in mojang.calls[0]) == ['alice', 'bob', 'nobody']
+
+    # Positive and negative answers are now cached
+    asyncio.run(resolver.resolve_many(['ALICE', 'nobody'], mojang))
+    assert len(mojang.calls) == 1
+
+
+def test_resolve_many_does_not_cache_failed_lookups(clock):
+    resolver = NameResolver()
+    mojang = FakeMojang({'alice': 'a' * 32}, failing={'alice'})
+
+    assert asyncio.run(resolver.resolve_many(['Alice'], mojang)) == {'Alice': None}
+    assert resolver.lookup('alice') is None
+
+    mojang.failing.clear()
+    assert asyncio.run(resolver.resolve_many(['Alice'], mojang)) == {'Alice': 'a' * 32}
+    assert len(mojang.calls) == 2
@@ -0,0 +1,61 @@
+from types import SimpleNamespace
+
+import pytest
+
+from services import result_store
+from services.result_store import ResultStore
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(result_store, 'time', SimpleNamespace(monotonic=clock.monotonic))
+    return clock
+
+
+def test_put_returns_distinct_ids(clock):
+    store = ResultStore()
+    first, second = store.put({'a': 1}), store.put({'a': 1})
+
+    assert first != second
+    assert store.get(first) == {'a': 1}
+    assert store.get('unknown') is None
+    assert store.stats() == {'hits': 1, 'misses': 1, 'evictions': 0, 'expirations': 0, 'entries': 2}
+
+
+def test_results_expire_after_ttl_without_reads(clock):
+    store = ResultStore(ttl=60)
+    result_id = store.put('data')
+
+    clock.now += 59
+    assert store.get(result_id) == 'data'
+
+    # The read above restarted the TTL
+    clock.now += 59
+    assert store.get(result_id) == 'data'
+
+    clock.now += 60
+    assert store.get(result_id) is None
+    assert len(store) == 0
+    assert store.stats()['expirations'] == 1
+
+
+def test_evicts_least_recently_used(clock):
+    store = ResultStore(max_entries=2)
+    first = store.put('first')
+    second = store.put('second')
+    store.get(first)
+    third = store.put('third')
+
+    assert store.get(second) is None
+    assert store.get(first) == 'first'
+    assert store.get(third) == 'third'
+    assert store.stats()['evictions'] == 1
@@ -0,0 +1,137 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from services import scheduler as scheduler_module
+from services.scheduler import RefreshScheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(scheduler_module, 'time', SimpleNamespace(time=clock.time, monotonic=clock.time))
+    return clock
+
+
+class FakeLimiter:
+    def __init__(self, limit, tokens, rate=1.0, wait=0.0):
+        self.limit = limit
+        self.tokens = tokens
+        self.rate = rate
+        self.wait = wait
+
+    def remaining(self):
+        return self.tokens
+
+    def wait_time(self):
+        return self.wait
+
+
+class Refresh:
+    """Refresh coroutine recording batches; players in failing get an error."""
+
+    def __init__(self, failing=()):
+        self.batches = []
+        self.failing = set(failing)
+
+    async def __call__(self, player_ids):
+        self.batches.append(list(player_ids))
+        return [
+            (None, 'error') if player_id in self.failing else ({'uuid': player_id}, None)
+            for player_id in player_ids
+        ]
+
+
+def run_cycle(scheduler, now):
+    asyncio.run(scheduler._run_cycle(now))
+
+
+def test_refreshes_stalest_first_in_batches(clock):
+    refresh = Refresh()
+    scheduler = RefreshScheduler(refresh, interval=100, batch_size=2)
+    scheduler.add(['fresh', 'old', 'older', 'new'], {'fresh': 990.0, 'old': 850.0, 'older': 800.0})
+
+    run_cycle(scheduler, clock.now)
+    run_cycle(scheduler, clock.now)
+
+    # Never fetched players are due now, after the ones overdue since earlier
+    assert refresh.batches == [['older', 'old'], ['new']]
+    assert scheduler.stats()['queue_depth'] == 0
+    assert scheduler.stats()['refreshed'] == 3
+
+
+def test_refreshed_players_are_due_again_after_interval(clock):
+    refresh = Refresh()
+    scheduler = RefreshScheduler(refresh, interval=100)
+    scheduler.add(['a'])
+    run_cycle(scheduler, clock.now)
+
+    clock.now += 99
+    run_cycle(scheduler, clock.now)
+    assert refresh.batches == [['a']]
+
+    clock.now += 1
+    run_cycle(scheduler, clock.now)
+    assert refresh.batches == [['a'], ['a']]
+
+
+def test_failures_retry_after_a_quarter_interval(clock):
+    refresh = Refresh(failing={'bad'})
+    scheduler = RefreshScheduler(refresh, interval=100)
+    scheduler.add(['good', 'bad'])
+    run_cycle(scheduler, clock.now)
+    assert scheduler.stats()['errors'] == 1
+
+    clock.now += 25
+    run_cycle(scheduler, clock.now)
+    assert refresh.batches[-1] == ['bad']
+
+
+def test_refresh_exception_counts_every_player_as_failed(clock):
+    async def refresh(player_ids):
+        raise RuntimeError('boom')
+
+    scheduler = RefreshScheduler(refresh, interval=100)
+    scheduler.add(['a', 'b'])
+    run_cycle(scheduler, clock.now)
+
+    assert scheduler.stats()['errors'] == 2
+    assert scheduler._next_due() == clock.now + 25
+
+
+def test_removed_players_are_dropped(clock):
+    refresh = Refresh()
+    scheduler = RefreshScheduler(refresh, interval=100)
+    scheduler.add(['a', 'b'])
+    scheduler.remove('a')
+    run_cycle(scheduler, clock.now)
+
+    assert refresh.batches == [['b']]
+    assert scheduler.watched() == ['b']
+
+
+def test_budget_keeps_a_reserve_for_interactive_lookups(clock):
+    limiter = FakeLimiter(limit=300, tokens=200, rate=1.0)
+    scheduler = RefreshScheduler(Refresh(), limiter=limiter, budget_share=0.25)
+
+    # 75% of the budget (225 requests) is reserved
+    assert scheduler._budget_wait() == 26.0
+    limiter.tokens = 226
+    assert scheduler._budget_wait() == 0.0
+
+    # A blocked limiter waits at least until it unblocks
+    limiter.tokens, limiter.wait = 0, 300.0
+    assert scheduler._budget_wait() == 300.0
+
+
+def test_no_limiter_never_waits(clock):
+    assert RefreshScheduler(Refresh())._budget_wait() == 0.0
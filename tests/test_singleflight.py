@@ -0,0 +1,145 @@
+import asyncio
+
+import pytest
+
+from services.singleflight import SingleFlight
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+class Call:
+    """Coroutine function counting its runs, blocked until release()."""
+
+    def __init__(self, result='value', error=None):
+        self.result = result
+        self.error = error
+        self.runs = 0
+        self.gate = None
+
+    def release(self):
+        self.gate.set()
+
+    async def __call__(self):
+        self.runs += 1
+        if self.gate is None:
+            self.gate = asyncio.Event()
+        await self.gate.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+async def settle():
+    # Let every started task reach its first await
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_concurrent_callers_share_one_call():
+    async def main():
+        flights = SingleFlight()
+        call = Call()
+        callers = [asyncio.ensure_future(flights.do('key', call)) for _ in range(5)]
+        await settle()
+        assert flights.stats() == {'calls': 1, 'coalesced': 4, 'in_flight': 1}
+
+        call.release()
+        assert await asyncio.gather(*callers) == ['value'] * 5
+        assert call.runs == 1
+        assert flights.stats()['in_flight'] == 0
+
+    run(main())
+
+
+def test_distinct_keys_and_later_calls_run_again():
+    async def main():
+        flights = SingleFlight()
+        first, second = Call('a'), Call('b')
+        callers = [
+            asyncio.ensure_future(flights.do('a', first)),
+            asyncio.ensure_future(flights.do('b', second)),
+        ]
+        await settle()
+        first.release()
+        second.release()
+        assert await asyncio.gather(*callers) == ['a', 'b']
+
+        # Results are not cached once the call is over
+        assert await flights.do('a', first) == 'a'
+        assert first.runs == 2
+
+    run(main())
+
+
+def test_exception_shared_by_every_caller():
+    async def main():
+        flights = SingleFlight()
+        call = Call(error=ValueError('boom'))
+        callers = [asyncio.ensure_future(flights.do('key', call)) for _ in range(3)]
+        await settle()
+        call.release()
+        results = await asyncio.gather(*callers, return_exceptions=True)
+        assert all(isinstance(result, ValueError) for result in results)
+        assert call.runs == 1
+
+    run(main())
+
+
+def test_cancelled_joiner_does_not_cancel_the_call():
+    async def main():
+        flights = SingleFlight()
+        call = Call()
+        leader = asyncio.ensure_future(flights.do('key', call))
+        joiner = asyncio.ensure_future(flights.do('key', call))
+        await settle()
+
+        joiner.cancel()
+        await settle()
+        call.release()
+        assert await leader == 'value'
+        with pytest.raises(asyncio.CancelledError):
+            await joiner
+
+    run(main())
+
+
+def test_cancelled_first_caller_does_not_cancel_the_call():
+    async def main():
+        flights = SingleFlight()
+        call = Call()
+        first = asyncio.ensure_future(flights.do('key', call))
+        joiner = asyncio.ensure_future(flights.do('key', call))
+        await settle()
+
+        first.cancel()
+        await settle()
+        assert flights.stats()['in_flight'] == 1
+
+        call.release()
+        assert await joiner == 'value'
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        assert flights.stats()['in_flight'] == 0
+
+    run(main())
+
+
+def test_call_finishes_when_every_caller_is_cancelled():
+    async def main():
+        flights = SingleFlight()
+        call = Call()
+        caller = asyncio.ensure_future(flights.do('key', call))
+        await settle()
+        caller.cancel()
+        await settle()
+
+        # A later caller joins the call still in flight
+        later = asyncio.ensure_future(flights.do('key', call))
+        await settle()
+        call.release()
+        assert await later == 'value'
+        assert call.runs == 1
+
+    run(main())
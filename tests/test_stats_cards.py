@@ -0,0 +1,57 @@
+import copy
+import json
+
+from api import _build_player_data
+from benchmarks.fixtures import make_players
+from components.stats_cards import _cards, create_stats_cards
+from services.render_cache import content_key
+
+
+def _store(seed):
+    player_data = _build_player_data(make_players(1, seed=seed)[0])
+    return {
+        'Alice': {
+            'displayname': 'Alice',
+            'uuid': 'a' * 32,
+            'stats': player_data['stats'],
+        },
+    }
+
+
+def _render(players):
+    return json.dumps(create_stats_cards(players, 'bedwars_overall').to_plotly_json(), default=str)
+
+
+def test_cards_are_reused_for_the_same_stats():
+    _cards.clear()
+    players = _store(1)
+    first = _render(players)
+    hits = _cards.hits
+    assert _render(players) == first
+    assert _cards.hits == hits + 1
+
+
+def test_client_supplied_version_does_not_select_cached_cards():
+    _cards.clear()
+    genuine = _store(1)
+    genuine_cards = _render(genuine)
+
+    # Same player, altered stats, claiming the version of the genuine ones
+    forged = copy.deepcopy(genuine)
+    forged['Alice']['version'] = content_key(genuine['Alice']['stats'])
+    forged['Alice']['stats']['Bedwars']['wins_bedwars'] += 123456
+    assert _render(forged) != genuine_cards
+
+    # Other sessions still get the cards of the genuine stats
+    assert _render(genuine) == genuine_cards
+
+
+def test_pending_players_get_placeholder_cards_after_fetched_ones():
+    players = _store(1)
+    rendered = create_stats_cards(players, 'bedwars_overall', ['Bob', 'Carol'])
+    classes = [card.className for card in rendered.children]
+    assert classes[0] != 'stat-card placeholder-card'
+    assert classes[1:] == ['stat-card placeholder-card'] * 2
+
+    only_pending = create_stats_cards({}, 'combined', ['Bob'])
+    assert [card.className for card in only_pending.children] == ['stat-card placeholder-card']
@@ -0,0 +1,65 @@
+import pytest
+
+from services.store import SnapshotStore
+
+
+@pytest.fixture
+def store():
+    store = SnapshotStore(':memory:')
+    yield store
+    store.close()
+
+
+def player(uuid_char, name, wins=1):
+    return {
+        'uuid': uuid_char * 32,
+        'displayname': name,
+        'stats': {'Bedwars': {'wins_bedwars': wins}},
+    }
+
+
+def test_round_trip_by_uuid_name_and_alias(store):
+    store.put(player('a', 'Alice'), 'alice_requested', fetched_at=100.0)
+
+    for key in ('a' * 32, 'ALICE', 'Alice_Requested'):
+        player_data, fetched_at = store.get(key)
+        assert player_data == player('a', 'Alice')
+        assert fetched_at == 100.0
+    assert store.get('bob') is None
+
+
+def test_get_many_leaves_missing_keys_out(store):
+    store.put_many([(player('a', 'Alice'), ()), (player('b', 'Bob'), ())])
+    found = store.get_many(['Alice', 'bob', 'carol'])
+    assert set(found) == {'Alice', 'bob'}
+    assert found['bob'][0]['uuid'] == 'b' * 32
+
+
+def test_rename_drops_old_name(store):
+    store.put(player('a', 'OldName'))
+    store.put(player('a', 'NewName', wins=2))
+
+    assert store.get('oldname') is None
+    assert store.get('newname')[0]['stats']['Bedwars']['wins_bedwars'] == 2
+    assert store.count() == 1
+
+
+def test_name_taken_by_another_player(store):
+    store.put(player('a', 'Shared'))
+    store.put(player('b', 'Shared'))
+    assert store.get('shared')[0]['uuid'] == 'b' * 32
+
+    # Re-storing the previous owner under its new name does not take it back
+    store.put(player('a', 'Renamed'))
+    assert store.get('shared')[0]['uuid'] == 'b' * 32
+    assert store.get('renamed')[0]['uuid'] == 'a' * 32
+
+
+def test_iter_rows_filters_by_fetch_time(store):
+    store.put(player('a', 'Alice'), fetched_at=100.0)
+    store.put(player('b', 'Bob'), fetched_at=200.0)
+    store.put(player('c', 'Carol'), fetched_at=300.0)
+
+    rows = list(store.iter_rows(start=150, end=300, batch_size=1))
+    assert [player_data['displayname'] for player_data, _ in rows] == ['Bob', 'Carol']
+    assert len(list(store.iter_players())) == 3